@@ -0,0 +1,185 @@
+"""Parser of BCP47 language tags.
+
+The module decomposes a language tag in its subtags following the grammar of
+`RFC 5646`_ and checks the language subtags against the IANA registry used by
+:class:`IIIFpres.BCP47_tags.BCP47lang`.
+
+Example:
+    >>> from IIIFpres import BCP47_parser
+    >>> BCP47_parser.parse_tag("zh-Hant-TW")
+    LanguageTag(language='zh', extlang=(), script='hant', region='tw', variants=(), extensions=(), privateuse=())
+    >>> BCP47_parser.is_valid_tag("sr-Latn")
+    True
+
+Note:
+    Only the language and extended language subtags are checked against the
+    registry. Script, region, variant and extension subtags are checked
+    against the grammar since their registries are not shipped with
+    pyIIIFpres.
+
+.. _RFC 5646:
+    https://www.rfc-editor.org/rfc/rfc5646#section-2.1
+"""
+from collections import namedtuple
+import functools
+import re
+
+LanguageTag = namedtuple(
+    "LanguageTag",
+    ["language", "extlang", "script", "region", "variants", "extensions",
+     "privateuse"])
+
+# https://www.rfc-editor.org/rfc/rfc5646#section-2.2.8
+GRANDFATHERED = frozenset([
+    "en-gb-oed", "i-ami", "i-bnn", "i-default", "i-enochian", "i-hak",
+    "i-klingon", "i-lux", "i-mingo", "i-navajo", "i-pwn", "i-tao", "i-tay",
+    "i-tsu", "sgn-be-fr", "sgn-be-nl", "sgn-ch-de", "art-lojban",
+    "cel-gaulish", "no-bok", "no-nyn", "zh-guoyu", "zh-hakka", "zh-min",
+    "zh-min-nan", "zh-xiang"])
+
+_SUBTAGS = re.compile(r"[a-z0-9]{1,8}(-[a-z0-9]{1,8})*")
+
+
+@functools.lru_cache(maxsize=None)
+def language_subtags():
+    """Return the set of the language subtags of the IANA registry.
+
+    The ranges reserved for private use (e.g. qaa..qtz) are expanded.
+
+    Returns:
+        frozenset: The language subtags.
+    """
+    from .BCP47_tags import BCP47lang
+    subtags = set()
+    for name, value in vars(BCP47lang).items():
+        if name.startswith("__"):
+            continue
+        if ".." in value:
+            subtags.update(_expand_range(*value.split("..")))
+        else:
+            subtags.add(value)
+    return frozenset(subtags)
+
+
+def _expand_range(first, last):
+    """Expand a range of alphabetic subtags e.g. qaa..qtz"""
+    subtags = [""]
+    for start, end in zip(first, last):
+        letters = [chr(c) for c in range(ord(start), ord(end) + 1)]
+        subtags = [s + c for s in subtags for c in letters]
+    return subtags
+
+
+def _in_range(subtag, languages):
+    """Check if subtag falls in a range e.g. qaa..qtz listed in languages."""
+    return (len(subtag) == 3 and "qaa" <= subtag <= "qtz"
+            and "qaa..qtz" in languages)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_tag(tag):
+    """Decompose a BCP47 language tag in its subtags.
+
+    The subtags are returned lowercase since tags are case insensitive.
+    The result is cached, hence parsing the same tag again is a dictionary
+    lookup.
+
+    Args:
+        tag (str): A language tag e.g. sr-Latn or de-DE-u-co-phonebk.
+
+    Raises:
+        ValueError: If the tag does not follow the BCP47 grammar.
+
+    Returns:
+        LanguageTag: A named tuple with the language, extlang, script,
+        region, variants, extensions and privateuse subtags. The extensions
+        are a tuple of (singleton, subtags) pairs.
+    """
+    if not isinstance(tag, str):
+        raise ValueError("A language tag must be a string.")
+    lowertag = tag.lower()
+    if lowertag in GRANDFATHERED:
+        return LanguageTag(lowertag, (), None, None, (), (), ())
+    if not _SUBTAGS.fullmatch(lowertag):
+        raise ValueError(
+            "%s is not a sequence of 1 to 8 alphanumeric subtags." % tag)
+    subtags = lowertag.split("-")
+    n = len(subtags)
+    i = 0
+    language = None
+    extlang = []
+    script = None
+    region = None
+    if subtags[0] != "x":
+        language = subtags[0]
+        if not language.isalpha() or len(language) < 2:
+            raise ValueError("%s is not a valid language subtag." % language)
+        i = 1
+        if len(language) <= 3:
+            while (i < n and len(extlang) < 3 and len(subtags[i]) == 3
+                   and subtags[i].isalpha()):
+                extlang.append(subtags[i])
+                i += 1
+        if i < n and len(subtags[i]) == 4 and subtags[i].isalpha():
+            script = subtags[i]
+            i += 1
+        if i < n and ((len(subtags[i]) == 2 and subtags[i].isalpha()) or
+                      (len(subtags[i]) == 3 and subtags[i].isdigit())):
+            region = subtags[i]
+            i += 1
+    variants = []
+    while i < n and (len(subtags[i]) >= 5 or
+                     (len(subtags[i]) == 4 and subtags[i][0].isdigit())):
+        if subtags[i] in variants:
+            raise ValueError("Variant %s is repeated." % subtags[i])
+        variants.append(subtags[i])
+        i += 1
+    extensions = []
+    singletons = set()
+    while i < n and len(subtags[i]) == 1 and subtags[i] != "x":
+        singleton = subtags[i]
+        if singleton in singletons:
+            raise ValueError("Extension %s is repeated." % singleton)
+        singletons.add(singleton)
+        i += 1
+        start = i
+        while i < n and len(subtags[i]) >= 2:
+            i += 1
+        if i == start:
+            raise ValueError("Extension %s has no subtags." % singleton)
+        extensions.append((singleton, tuple(subtags[start:i])))
+    privateuse = ()
+    if i < n and subtags[i] == "x":
+        privateuse = tuple(subtags[i + 1:])
+        if not privateuse:
+            raise ValueError("Private use subtag x has no subtags.")
+        i = n
+    if i != n:
+        raise ValueError("Unexpected subtag %s in %s." % (subtags[i], tag))
+    return LanguageTag(language, tuple(extlang), script, region,
+                       tuple(variants), tuple(extensions), privateuse)
+
+
+def is_valid_tag(tag, languages=None):
+    """Check if a tag is a valid BCP47 language tag.
+
+    Args:
+        tag (str): A language tag e.g. zh-Hant-TW.
+        languages (container, optional): The accepted language subtags.
+            Defaults to the language subtags of the IANA registry.
+
+    Returns:
+        bool: True if the tag is valid.
+    """
+    try:
+        parsed = parse_tag(tag)
+    except ValueError:
+        return False
+    if parsed.language is None or parsed.language in GRANDFATHERED:
+        return True
+    if languages is None:
+        languages = language_subtags()
+    for subtag in (parsed.language,) + parsed.extlang:
+        if subtag not in languages and not _in_range(subtag, languages):
+            return False
+    return True
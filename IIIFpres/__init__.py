@@ -19,4 +19,11 @@ manifest.json_save("manifest.json")
 
 """
 __version__ = "4.0.1"
-from .BCP47_tags import BCP47lang
\ No newline at end of file
+
+
+def __getattr__(name):
+    # BCP47lang has thousands of attributes, it is imported on first access
+    if name == "BCP47lang":
+        from .BCP47_tags import BCP47lang
+        return BCP47lang
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,280 @@
+"""JSON encoders used for serializing the IIIF objects.
+
+A backend wraps a JSON library (the standard ``json`` module, ``orjson``,
+``ujson`` or ``msgspec``) behind the same ``encode`` method. The IIIF objects
+are converted to dicts by the function passed as ``default``, hence all the
+backends share the same conversion and produce the same JSON (the format of
+some floats can differ).
+
+The optional libraries are imported the first time a backend is used and the
+module is kept by the backend.
+
+Example:
+    >>> from IIIFpres import backends
+    >>> backends.get_backend("auto").name
+    'orjson'
+    >>> manifest.dumps(backend="json", compact=True)
+"""
+import importlib
+
+
+class Backend(object):
+    """Base class of the backends.
+
+    Subclasses set `name`, `module_name`, the options they support and
+    implement `_encode`.
+
+    Attributes:
+        name (str): The name used for selecting the backend.
+        module_name (str): The module to be imported.
+        binary (bool): True if the library produces UTF-8 bytes.
+        supports_ensure_ascii (bool): True if ensure_ascii is supported.
+        supports_sort_keys (bool): True if sort_keys is supported.
+    """
+    name = None
+    module_name = None
+    binary = False
+    supports_ensure_ascii = False
+    supports_sort_keys = True
+
+    def __init__(self):
+        self._module = None
+        self._available = None
+
+    @property
+    def module(self):
+        """The imported module, imported only the first time."""
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    def available(self):
+        """Check if the library of the backend is installed.
+
+        Returns:
+            bool: True if the module can be imported.
+        """
+        if self._available is None:
+            try:
+                self.module
+                self._available = True
+            except ImportError:
+                self._available = False
+        return self._available
+
+    def supports(self, ensure_ascii=False, sort_keys=False):
+        """Check if the backend supports the options.
+
+        Returns:
+            bool: True if the options are supported.
+        """
+        if ensure_ascii and not self.supports_ensure_ascii:
+            return False
+        if sort_keys and not self.supports_sort_keys:
+            return False
+        return True
+
+    def encode(self, document, default, compact=False, sort_keys=False,
+               ensure_ascii=False, as_bytes=False):
+        """Encode the document.
+
+        Args:
+            document (dict): The document, nested objects are converted by
+                default.
+            default (function): The function converting the objects that
+                are not JSON types to dict.
+            compact (bool, optional): No indentation and spaces. Defaults to
+                False (indentation of 2 spaces).
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            ensure_ascii (bool, optional): Escape the non ASCII characters.
+                Defaults to False.
+            as_bytes (bool, optional): Return UTF-8 bytes instead of str.
+                Defaults to False.
+
+        Raises:
+            ValueError: If the backend does not support the options.
+
+        Returns:
+            str: The JSON (bytes if as_bytes is True).
+        """
+        if not self.supports(ensure_ascii, sort_keys):
+            raise ValueError("The %s backend does not support %s." % (
+                self.name, "ensure_ascii" if ensure_ascii else "sort_keys"))
+        res = self._encode(document, default, compact, sort_keys,
+                           ensure_ascii)
+        return self._convert(res, as_bytes)
+
+    def join(self, pieces, as_bytes=False):
+        """Join pieces of JSON produced by encode with as_bytes=binary.
+
+        Args:
+            pieces (list): The pieces, str or bytes as produced by the
+                library.
+            as_bytes (bool, optional): Return UTF-8 bytes instead of str.
+                Defaults to False.
+
+        Returns:
+            str: The JSON (bytes if as_bytes is True).
+        """
+        res = (b"" if self.binary else "").join(pieces)
+        return self._convert(res, as_bytes)
+
+    def _convert(self, res, as_bytes):
+        if as_bytes != self.binary:
+            if as_bytes:
+                return res.encode("utf-8")
+            return res.decode("utf-8")
+        return res
+
+    def _encode(self, document, default, compact, sort_keys, ensure_ascii):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return "<%s backend>" % self.name
+
+
+class JSONBackend(Backend):
+    """The json module of the standard library."""
+    name = "json"
+    module_name = "json"
+    supports_ensure_ascii = True
+
+    def _encode(self, document, default, compact, sort_keys, ensure_ascii):
+        if compact:
+            indent, separators = None, (",", ":")
+        else:
+            indent, separators = 2, None
+        return self.module.dumps(
+            document,
+            default=default,
+            indent=indent,
+            separators=separators,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys)
+
+
+class OrjsonBackend(Backend):
+    """https://github.com/ijl/orjson"""
+    name = "orjson"
+    module_name = "orjson"
+    binary = True
+
+    def _encode(self, document, default, compact, sort_keys, ensure_ascii):
+        orjson = self.module
+        option = 0 if compact else orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        # orjson replaces the errors raised by default with a TypeError, the
+        # original error (e.g. a missing required property) is raised again
+        errors = []
+
+        def convert(obj):
+            try:
+                return default(obj)
+            except Exception as e:
+                errors.append(e)
+                raise
+
+        try:
+            return orjson.dumps(document, default=convert, option=option)
+        except orjson.JSONEncodeError:
+            if errors:
+                raise errors[0] from None
+            raise
+
+
+class UjsonBackend(Backend):
+    """https://github.com/ultrajson/ultrajson"""
+    name = "ujson"
+    module_name = "ujson"
+    supports_ensure_ascii = True
+    # with sort_keys ujson writes {} without calling default
+    supports_sort_keys = False
+
+    def _encode(self, document, default, compact, sort_keys, ensure_ascii):
+        return self.module.dumps(
+            document,
+            default=default,
+            indent=0 if compact else 2,
+            ensure_ascii=ensure_ascii,
+            escape_forward_slashes=False)
+
+
+class MsgspecBackend(Backend):
+    """https://github.com/jcrist/msgspec"""
+    name = "msgspec"
+    module_name = "msgspec"
+    binary = True
+
+    def __init__(self):
+        super(MsgspecBackend, self).__init__()
+        self._encoders = {}
+
+    def _encode(self, document, default, compact, sort_keys, ensure_ascii):
+        key = (default, sort_keys)
+        try:
+            encoder = self._encoders[key]
+        except KeyError:
+            if len(self._encoders) >= 8:
+                # e.g. the bound methods used by dumps(cache=True)
+                self._encoders.clear()
+            encoder = self._encoders[key] = self.module.json.Encoder(
+                enc_hook=default, order="sorted" if sort_keys else None)
+        res = encoder.encode(document)
+        if not compact:
+            res = self.module.json.format(res, indent=2)
+        return res
+
+
+BACKENDS = {}
+# the order used by get_backend("auto")
+AUTO = ["orjson", "msgspec", "ujson", "json"]
+
+
+def register_backend(backend):
+    """Register a backend, replacing the one with the same name.
+
+    Args:
+        backend (Backend): An instance of a Backend subclass.
+    """
+    BACKENDS[backend.name] = backend
+
+
+def get_backend(name="auto", ensure_ascii=False, sort_keys=False):
+    """Return a backend.
+
+    Args:
+        name (str, optional): The name of the backend or "auto" for the
+            fastest installed backend supporting the options. Defaults to
+            "auto".
+        ensure_ascii (bool, optional): The option is needed. Defaults to
+            False.
+        sort_keys (bool, optional): The option is needed. Defaults to False.
+
+    Raises:
+        ValueError: If the backend is not registered.
+        ImportError: If the library of the backend is not installed.
+
+    Returns:
+        Backend: The backend.
+    """
+    if name == "auto":
+        for candidate in AUTO:
+            backend = BACKENDS.get(candidate)
+            if (backend is not None and backend.available() and
+                    backend.supports(ensure_ascii, sort_keys)):
+                return backend
+        name = "json"
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError("%s is not a registered backend, use one of: %s." % (
+            name, ", ".join(BACKENDS)))
+    if not backend.available():
+        raise ImportError("The %s backend needs the %s package." % (
+            name, backend.module_name))
+    return backend
+
+
+for _backend in (JSONBackend, OrjsonBackend, UjsonBackend, MsgspecBackend):
+    register_backend(_backend())
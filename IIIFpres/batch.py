@@ -0,0 +1,248 @@
+"""Build and save many IIIF objects in a pool of processes.
+
+`build_all` calls a builder function for each record of a catalogue, e.g.
+one manifest per record as in ``examples/Example_Capitolare_add.py``. The
+records are sent to the worker processes in chunks, each worker builds the
+objects, serializes them and writes the files itself, and only a short
+`Report` per record is sent back. Hence the objects are never pickled.
+
+The builder and the filename functions must be defined at the top level of
+a module (not lambdas), so that the worker processes can import them. With
+the spawn start method (the default on Windows and macOS) the module level
+variables set in the parent (e.g. iiifpapi3.BASE_URL) are not seen by the
+workers, pass them with `settings` (see iiifpapi3.config) or set them in the
+builder.
+
+Example:
+    >>> from IIIFpres import batch, iiifpapi3
+    >>> def build(record):
+    ...     manifest = iiifpapi3.Manifest()
+    ...     manifest.set_id(extendbase_url="%s/manifest" % record["id"])
+    ...     ...
+    ...     return manifest
+    >>> reports = batch.build_all(records, build, "manifests",
+    ...                           filename="{index}.json", workers=8)
+    >>> [r for r in reports if r.error]
+
+`asave_many` saves objects already built, e.g. by an asyncio web service,
+in threads without blocking the event loop.
+"""
+from collections import namedtuple
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import time
+import traceback
+
+from . import iiifpapi3
+
+Report = namedtuple(
+    "Report", ["index", "filename", "build_seconds", "save_seconds", "error"])
+Report.__doc__ = """The result of a record of build_all.
+
+Attributes:
+    index (int): The position of the record.
+    filename (str): The file written, None if the record failed.
+    build_seconds (float): The time spent by the builder.
+    save_seconds (float): The time spent serializing and writing the file.
+    error (str): The traceback if the builder or the save failed, else None.
+"""
+
+
+def _filename(filename, record, index):
+    if callable(filename):
+        return filename(record)
+    return filename.format(index=index)
+
+
+def _build_chunk(builder, filename, out_dir, save_options, settings, start,
+                 records):
+    """Build and save the records of a chunk, run by the workers.
+
+    Returns:
+        list: The Report of each record.
+    """
+    reports = []
+    with iiifpapi3.config(**settings):
+        for index, record in enumerate(records, start):
+            t0 = time.perf_counter()
+            t1 = None
+            path = None
+            try:
+                obj = builder(record)
+                t1 = time.perf_counter()
+                name = os.path.join(out_dir,
+                                    _filename(filename, record, index))
+                directory = os.path.dirname(name)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                path = name
+                obj.save(path, **save_options)
+            except Exception:
+                t2 = time.perf_counter()
+                if t1 is None:
+                    # the builder failed
+                    t1 = t2
+                if path is not None:
+                    # the save failed, no partial file is left behind
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                reports.append(Report(index, None, t1 - t0, t2 - t1,
+                                      traceback.format_exc()))
+                continue
+            t2 = time.perf_counter()
+            reports.append(Report(index, path, t1 - t0, t2 - t1, None))
+    return reports
+
+
+def _failed_chunk(start, size):
+    """Return the Report of each record of a chunk whose worker failed (e.g.
+    with a BrokenProcessPool), with the traceback being handled."""
+    error = traceback.format_exc()
+    return [Report(index, None, 0.0, 0.0, error)
+            for index in range(start, start + size)]
+
+
+def _chunks(records, chunk_size):
+    records = iter(records)
+    start = 0
+    chunk = list(itertools.islice(records, chunk_size))
+    while chunk:
+        yield start, chunk
+        start += len(chunk)
+        chunk = list(itertools.islice(records, chunk_size))
+
+
+def build_all(records, builder, out_dir, filename="{index}.json",
+              workers=None, chunk_size=64, save_options=None, settings=None,
+              mp_context=None):
+    """Build and save an IIIF object for each record in worker processes.
+
+    Args:
+        records (iterable): The records, they must be picklable. They are
+            read while the chunks are sent to the workers.
+        builder (function): A function taking a record and returning the
+            IIIF object (e.g. a Manifest) to be saved.
+        out_dir (str): The folder where the files are written, it is
+            created if needed.
+        filename (str,function, optional): A function taking a record and
+            returning its file name, or a str formatted with the index of
+            the record. The name can contain subfolders. Defaults to
+            "{index}.json".
+        workers (int, optional): The number of processes. 0 builds the
+            records in this process, e.g. for debugging. Defaults to None,
+            i.e. the number of CPUs.
+        chunk_size (int, optional): The number of records sent to a worker
+            at once. Defaults to 64.
+        save_options (dict, optional): The arguments of the save method,
+            e.g. {"compact": True, "compression": "gzip"}. Defaults to None.
+        settings (dict, optional): The arguments of iiifpapi3.config used
+            by the workers, e.g. {"base_url": "https://example.org/"}.
+            Defaults to None.
+        mp_context (multiprocessing.context, optional): The context used
+            for starting the processes, see ProcessPoolExecutor. Defaults to
+            None.
+
+    Returns:
+        list: The Report of each record, in the order of the records. If a
+        worker process dies (e.g. killed by the OS), the records of the
+        chunks that were not done are reported with the error of the pool.
+    """
+    assert chunk_size > 0, "chunk_size must be a positive integer."
+    os.makedirs(out_dir, exist_ok=True)
+    arguments = (builder, filename, out_dir, save_options or {},
+                 settings or {})
+    chunks = _chunks(records, chunk_size)
+    reports = []
+    if workers == 0:
+        for start, chunk in chunks:
+            reports.extend(_build_chunk(*arguments, start, chunk))
+        return reports
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=mp_context) as executor:
+        # a few chunks per worker are queued, the records are not read all
+        # at once
+        pending = {}
+
+        def collect(futures):
+            for future in futures:
+                start, size = pending.pop(future)
+                try:
+                    reports.extend(future.result())
+                except Exception:
+                    reports.extend(_failed_chunk(start, size))
+
+        for start, chunk in chunks:
+            if len(pending) >= 2 * workers:
+                collect(concurrent.futures.wait(
+                    pending,
+                    return_when=concurrent.futures.FIRST_COMPLETED).done)
+            try:
+                future = executor.submit(_build_chunk, *arguments, start,
+                                         chunk)
+            except Exception:
+                # the pool is broken, the records are not built
+                reports.extend(_failed_chunk(start, len(chunk)))
+                continue
+            pending[future] = (start, len(chunk))
+        collect(concurrent.futures.as_completed(list(pending)))
+    reports.sort(key=lambda report: report.index)
+    return reports
+
+
+async def asave_many(items, concurrency=4, executor=None,
+                     return_exceptions=False, **save_options):
+    """Save many IIIF objects with asave, at most concurrency at a time.
+
+    Args:
+        items (iterable): The (object, filename) pairs. They are read while
+            the objects are saved.
+        concurrency (int, optional): The number of objects saved at the
+            same time. Defaults to 4.
+        executor (concurrent.futures.Executor, optional): The executor of
+            asave, running threads (use build_all for processes). Defaults
+            to None, i.e. the default executor of the loop.
+        return_exceptions (bool, optional): If True the exception raised
+            saving an object is returned in place of its filename, else it
+            is raised and the objects not yet saved are skipped. Defaults to
+            False.
+        **save_options: The arguments of the save method, e.g.
+            compact=True.
+
+    Returns:
+        list: The filenames (or the exceptions), in the order of the items.
+
+    Example:
+        >>> await batch.asave_many(
+        ...     ((m, "%s.json" % m.id.rsplit("/", 2)[-2]) for m in manifests),
+        ...     concurrency=8, compact=True)
+    """
+    assert concurrency > 0, "concurrency must be a positive integer."
+    items = enumerate(items)
+    results = {}
+
+    async def save():
+        # the tasks share the iterator, next is called between the awaits
+        for index, (obj, filename) in items:
+            try:
+                await obj.asave(filename, executor=executor, **save_options)
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results[index] = error
+            else:
+                results[index] = filename
+
+    tasks = [asyncio.ensure_future(save()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return [results[index] for index in range(len(results))]
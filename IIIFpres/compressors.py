@@ -0,0 +1,286 @@
+"""Compressors used for saving the IIIF objects precompressed.
+
+A compressor wraps a compression library (``zlib`` for gzip, ``zstandard``
+for zstd and ``brotli`` for br) behind the same ``compressobj`` method, which
+returns an object with the ``compress`` and ``flush`` methods of
+``zlib.compressobj``. Hence the JSON can be compressed while it is written,
+chunk by chunk, and the same chunks can be written to several files in one
+pass (see :class:`Writer`).
+
+The optional libraries are imported the first time a compressor is used and
+the module is kept by the compressor. The default levels favour the speed of
+the publishing pipelines, a different level can be set registering a new
+instance e.g. ``register_compressor(BrotliCompressor(level=11))``.
+
+Example:
+    >>> manifest.save("manifest.json.gz", compression="gzip")
+    >>> # manifest.json, manifest.json.gz and manifest.json.br
+    >>> manifest.save("manifest.json", compression=["gzip", "br"],
+    ...               sidecars=True)
+"""
+import importlib
+import os
+
+
+class Compressor(object):
+    """Base class of the compressors.
+
+    Subclasses set `name`, `module_name`, `suffix`, `level` and implement
+    `compressobj`.
+
+    Attributes:
+        name (str): The name used for selecting the compressor, it is also
+            the value of the Content-Encoding header.
+        module_name (str): The module to be imported.
+        suffix (str): The suffix appended to the filename of the sidecars.
+        level (int): The compression level.
+    """
+    name = None
+    module_name = None
+    suffix = None
+    level = None
+
+    def __init__(self, level=None):
+        self._module = None
+        self._available = None
+        if level is not None:
+            self.level = level
+
+    @property
+    def module(self):
+        """The imported module, imported only the first time."""
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    def available(self):
+        """Check if the library of the compressor is installed.
+
+        Returns:
+            bool: True if the module can be imported.
+        """
+        if self._available is None:
+            try:
+                self.module
+                self._available = True
+            except ImportError:
+                self._available = False
+        return self._available
+
+    def compressobj(self):
+        """Return a new compression object.
+
+        Returns:
+            object: An object with the compress(bytes) and flush() methods
+            returning bytes.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return "<%s compressor>" % self.name
+
+
+class GzipCompressor(Compressor):
+    """gzip using the zlib module of the standard library.
+
+    The header has no file name and no modification time, hence the same
+    JSON always gives the same bytes.
+    """
+    name = "gzip"
+    module_name = "zlib"
+    suffix = ".gz"
+    # the default of zlib, 9 is four times slower for 5% less
+    level = 6
+
+    def compressobj(self):
+        zlib = self.module
+        # wbits 16 + 15 writes the gzip header and trailer
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+
+class ZstdCompressor(Compressor):
+    """https://github.com/indygreg/python-zstandard"""
+    name = "zstd"
+    module_name = "zstandard"
+    suffix = ".zst"
+    # 19 and above are two orders of magnitude slower for a few % less
+    level = 12
+
+    def compressobj(self):
+        return self.module.ZstdCompressor(level=self.level).compressobj()
+
+
+class _BrotliObj(object):
+    """HELPER CLASS giving the zlib interface to brotli.Compressor."""
+    __slots__ = ("_compressor",)
+
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class BrotliCompressor(Compressor):
+    """https://github.com/google/brotli"""
+    name = "br"
+    module_name = "brotli"
+    suffix = ".br"
+    # 11 (the default of brotli) takes seconds per MB of JSON
+    level = 9
+
+    def compressobj(self):
+        return _BrotliObj(self.module.Compressor(quality=self.level))
+
+
+class Writer(object):
+    """Write the same bytes to a file and its compressed copies.
+
+    Args:
+        filename (str): The filename.
+        compression (str, list, optional): The name of a compressor or a
+            list of names. Defaults to None (no compression).
+        sidecars (bool, optional): If True filename is written uncompressed
+            and each compressor writes filename plus its suffix, e.g.
+            manifest.json and manifest.json.gz. If False filename is written
+            compressed, hence only one compressor can be used. Defaults to
+            False.
+
+    If the with block raises, the compressors are not finalized and the
+    files are removed, hence no truncated file is left looking complete.
+
+    Raises:
+        ValueError: If the compressor is not registered or more than one
+            compressor is used without sidecars.
+        ImportError: If the library of the compressor is not installed.
+
+    Example:
+        >>> with Writer("manifest.json", "gzip", sidecars=True) as f:
+        ...     f.write(b'{"type": "Manifest"}')
+    """
+
+    def __init__(self, filename, compression=None, sidecars=False):
+        if compression is None:
+            names = []
+        elif isinstance(compression, str):
+            names = [compression]
+        else:
+            names = list(compression)
+        if not sidecars and len(names) > 1:
+            raise ValueError(
+                "Use sidecars=True for saving more than one compression.")
+        compressors = [get_compressor(name) for name in names]
+        self._files = []
+        self._paths = []
+        self._raw = []
+        self._compressed = []
+        try:
+            if sidecars or not compressors:
+                self._raw.append(self._open(filename))
+            for compressor in compressors:
+                path = filename + compressor.suffix if sidecars else filename
+                self._compressed.append(
+                    (compressor.compressobj(), self._open(path)))
+        except BaseException:
+            self.abort()
+            raise
+
+    def _open(self, filename):
+        f = open(filename, 'wb')
+        self._files.append(f)
+        self._paths.append(filename)
+        return f
+
+    def write(self, data):
+        """Write the bytes to all the files.
+
+        Args:
+            data (bytes): The data.
+        """
+        for f in self._raw:
+            f.write(data)
+        for compressobj, f in self._compressed:
+            f.write(compressobj.compress(data))
+
+    def close(self):
+        """Flush the compressors and close the files."""
+        try:
+            for compressobj, f in self._compressed:
+                f.write(compressobj.flush())
+        finally:
+            self._compressed = []
+            self._close_files()
+
+    def abort(self):
+        """Close the files without flushing the compressors and remove
+        them."""
+        self._compressed = []
+        self._close_files()
+        paths, self._paths = self._paths, []
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _close_files(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self.abort()
+            raise
+
+
+COMPRESSORS = {}
+
+
+def register_compressor(compressor):
+    """Register a compressor, replacing the one with the same name.
+
+    Args:
+        compressor (Compressor): An instance of a Compressor subclass.
+    """
+    COMPRESSORS[compressor.name] = compressor
+
+
+def get_compressor(name):
+    """Return a compressor.
+
+    Args:
+        name (str): The name of the compressor: gzip, zstd or br.
+
+    Raises:
+        ValueError: If the compressor is not registered.
+        ImportError: If the library of the compressor is not installed.
+
+    Returns:
+        Compressor: The compressor.
+    """
+    try:
+        compressor = COMPRESSORS[name]
+    except KeyError:
+        raise ValueError(
+            "%s is not a registered compression, use one of: %s." % (
+                name, ", ".join(COMPRESSORS)))
+    if not compressor.available():
+        raise ImportError("The %s compression needs the %s package." % (
+            name, compressor.module_name))
+    return compressor
+
+
+for _compressor in (GzipCompressor, ZstdCompressor, BrotliCompressor):
+    register_compressor(_compressor())
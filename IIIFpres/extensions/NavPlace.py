@@ -1,15 +1,18 @@
-from ..iiifpapi3 import _ImmutableType
+from ..iiifpapi3 import _ImmutableType, _Cacheable
 from ..iiifpapi3 import Recommended, Required
-from ..iiifpapi3 import LANGUAGES
+from ..iiifpapi3 import valid_language
 from ..iiifpapi3 import check_ID, unused
 
 
-class Feature(_ImmutableType):
+class Feature(_ImmutableType, _Cacheable):
+    __slots__ = ("id", "type", "geometry", "properties")
+
     def __init__(self):
         self.id = Required()
         self.type = "Feature"
         self.geometry = Recommended()
         self.properties = Recommended()
+        self._fragments = None
 
     def set_id(self, objid=None, extendbase_url=None):
         """Set the ID of the object
@@ -42,7 +45,7 @@ class Feature(_ImmutableType):
             self.properties = {}
         if language is None:
             language = "none"
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.properties['label'] = {language: [text]}
@@ -59,7 +62,7 @@ class Feature(_ImmutableType):
         """
         if unused(self.properties):
             self.properties = {}
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.properties['summary'] = {language: [text]}
@@ -80,10 +83,13 @@ class Feature(_ImmutableType):
             }
 
 
-class navPlace(object):
+class navPlace(_Cacheable):
+    __slots__ = ("type", "features")
+
     def __init__(self):
         self.type = "FeatureCollection"
         self.features = Required("A NavPlace must have a list one feature")
+        self._fragments = None
 
     def add_feature(self, feature=None):
         if unused(self.features):
@@ -30,21 +30,33 @@ Attributes:
     BASE_URL (str): Module level variable containing the URL to be preappend
         to iiifpapi3._CoreAttributes.set_id extend_baseurl
 
-    LANGUAGES (list[str]): Module level variable containing a list of accepted
-        languages. This variable is used for checking accepted languages, using
-        the `IANA sub tag registry`_
+    LANGUAGES (LanguageRegistry): Module level variable containing a list of
+        accepted languages. This variable is used for checking accepted
+        languages, using the `IANA sub tag registry`_. It behaves like a list
+        but membership is tested with a hash index.
+
+    MEDIATYPES (MediaTypeRegistry): Module level variable containing the IANA
+        media types grouped by top-level type (e.g. MEDIATYPES['image']). It
+        can be reassigned to a plain dict of lists.
+        This variable is used for checking the format of the resources.
 
     CONTEXT (str,list): Module level variable containing the context of the
         JSONLD file. Can be set to a list in case of multiple contexts.
 
+    COMPACT (bool): Module level variable, if True the JSON is written
+        without indentation and spaces unless the `compact` argument of the
+        dumps and save methods is given. Defaults to False.
+
     INVALID_URI_CHARACTERS (str): A list of charachters that are not accepted
         in the URL.
 
     BEHAVIOURS (list[str]): A list of accepted behaviours.
 
 Warning:
-    only language subtags are checked not variants or composite strings.
-    You can manually add a language if you need to use subtags:
+    composite tags (e.g. sr-Latn, zh-Hant-TW) are parsed with
+    IIIFpres.BCP47_parser and only their language and extlang subtags are
+    checked against LANGUAGES. Script, region and variant subtags are checked
+    against the BCP47 grammar only. You can still manually add a tag:
 
 Example:
     >>> from IIIFpres import iiifpapi3,BCP47lang
@@ -60,21 +72,40 @@ Todo:
 .. _IANA sub tag registry:
     https://www.iana.org/assignments/language-subtag-registry/language-subtag-registry
 """
-from . import visualization_html
-from .BCP47_tags_list import lang_tags
-from .dictmediatype import mediatypedict
+from .registries import LanguageRegistry, MediaTypeRegistry
+from .registries import load_language_tags, load_media_types
+from .registries import check_mediatype
+from . import backends
+from . import compressors
+from . import BCP47_parser
+import bisect
+import codecs
+import collections.abc
+import contextlib
+import contextvars
 import json
 import warnings
 import copy
+import functools
+import hashlib
+import itertools
+import operator
+import os
 import re
+import sys
 global BASE_URL
 BASE_URL = "https://"
 global LANGUAGES
-LANGUAGES = lang_tags
+# the IANA tables are loaded the first time a language or a format is checked
+LANGUAGES = LanguageRegistry(loader=load_language_tags)
 global MEDIATYPES
-MEDIATYPES = mediatypedict
+MEDIATYPES = MediaTypeRegistry(loader=load_media_types)
 global CONTEXT
 CONTEXT = "http://iiif.io/api/presentation/3/context.json"
+global COMPACT
+COMPACT = False
+global CACHE
+CACHE = False
 global INVALID_URI_CHARACTERS
 # removed comma which is used by IIIF Image API and #
 INVALID_URI_CHARACTERS = r"""!"$&'()*+ :;<=>?@[\]^`{|}~ """
@@ -96,6 +127,90 @@ BEHAVIOURS = ["auto-advance",
               "no-nav",
               "hidden"]
 
+# the settings of config() for the current thread or task, None if config is
+# not used
+_CONFIG = contextvars.ContextVar("IIIFpres.iiifpapi3.config", default=None)
+_SETTINGS = ("BASE_URL", "LANGUAGES", "MEDIATYPES", "CONTEXT", "COMPACT",
+             "CACHE", "INVALID_URI_CHARACTERS", "BEHAVIOURS")
+
+
+def _setting(name):
+    """Return a module level variable, or its value set by config in the
+    current thread or asyncio task.
+    """
+    settings = _CONFIG.get()
+    if settings is not None and name in settings:
+        return settings[name]
+    return globals()[name]
+
+
+@contextlib.contextmanager
+def config(**settings):
+    """Replace the module level variables in a with statement.
+
+    The values are kept in a context variable, hence they are seen only by
+    the thread or the asyncio task running the with statement (and by the
+    tasks it creates), while the module level variables are used by the
+    others. Manifests of different institutions can be built concurrently
+    in one process. The with statements can be nested.
+
+    Args:
+        base_url (str, optional): Replaces BASE_URL.
+        languages (list, optional): Replaces LANGUAGES.
+        mediatypes (MediaTypeRegistry, optional): Replaces MEDIATYPES.
+        context (str,list, optional): Replaces CONTEXT.
+        compact (bool, optional): Replaces COMPACT.
+        cache (bool, optional): Replaces CACHE.
+        invalid_uri_characters (str, optional): Replaces
+            INVALID_URI_CHARACTERS.
+        behaviours (list, optional): Replaces BEHAVIOURS.
+
+    Raises:
+        TypeError: If a setting is not one of the above.
+
+    Example:
+        >>> with iiifpapi3.config(base_url="https://example.org/iiif/"):
+        ...     manifest.set_id(extendbase_url="book1/manifest")
+    """
+    values = dict(_CONFIG.get() or ())
+    for name, value in settings.items():
+        if name.upper() not in _SETTINGS:
+            raise TypeError(
+                "config() got an unexpected keyword argument %r" % name)
+        values[name.upper()] = value
+    token = _CONFIG.set(values)
+    try:
+        yield
+    finally:
+        _CONFIG.reset(token)
+
+
+def _library_caller():
+    """Return True if the caller of a constructor is a module of IIIFpres."""
+    module = sys._getframe(2).f_globals.get("__name__", "")
+    return module.startswith(__package__ + ".")
+
+
+async def _run_in_executor(executor, function, *args, **kwargs):
+    """Await function called in executor with the config of the caller.
+
+    The object and the context of the caller are used in place, hence only
+    the executors running threads are supported.
+    """
+    # asyncio is imported only by the coroutines, see import_time.py
+    import asyncio
+    import concurrent.futures
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        raise ValueError(
+            "A ProcessPoolExecutor cannot be used, the object and the config "
+            "of the task are shared with the executor: use a "
+            "ThreadPoolExecutor, or IIIFpres.batch.build_all for building "
+            "in processes.")
+    loop = asyncio.get_running_loop()
+    call = functools.partial(
+        contextvars.copy_context().run, function, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
 
 class Required(object):
     """HELPER CLASS
@@ -104,10 +219,41 @@ class Required(object):
         This is not an IIIF object but a class used by this software to
         identify required fields. This is equivalent to MUST statement in the
         guideline with the meaning of https://tools.ietf.org/html/rfc2119 .
+
+        The instances are immutable and the ones created by this package
+        are shared: `Required("msg")` returns always the same object for the
+        same description, hence the constructors of the IIIF classes do not
+        allocate a placeholder for every object. The descriptions passed by
+        other modules and the subclasses are not shared, so that the cache
+        does not grow with them.
     """
+    __slots__ = ("Required",)
+    _instances = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super(Required, cls).__init_subclass__(**kwargs)
+        # the subclasses do not share the instances of the base class
+        cls._instances = {}
+
+    def __new__(cls, description=None):
+        try:
+            return cls._instances[description]
+        except KeyError:
+            pass
+        self = super(Required, cls).__new__(cls)
+        object.__setattr__(self, "Required", description)
+        if cls is Required and _library_caller():
+            Required._instances[description] = self
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Required objects are immutable.")
 
-    def __init__(self, description=None):
-        self.Required = description
+    def __delattr__(self, name):
+        raise AttributeError("Required objects are immutable.")
+
+    def __reduce__(self):
+        return (self.__class__, (self.Required,))
 
     def __eq__(self, o):
         return True if isinstance(o, self.__class__) else False
@@ -123,10 +269,37 @@ class Recommended(object):
         This is not an IIIF object but a class used by this software to
         identify recommended fields. This is equivalent to SHOULD statement in
         the guideline with the meaning of https://tools.ietf.org/html/rfc2119.
+
+        As for Required, the instances are immutable and the ones created by
+        this package are shared.
     """
+    __slots__ = ("Recommended",)
+    _instances = {}
 
-    def __init__(self, description=None):
-        self.Recommended = description
+    def __init_subclass__(cls, **kwargs):
+        super(Recommended, cls).__init_subclass__(**kwargs)
+        # the subclasses do not share the instances of the base class
+        cls._instances = {}
+
+    def __new__(cls, description=None):
+        try:
+            return cls._instances[description]
+        except KeyError:
+            pass
+        self = super(Recommended, cls).__new__(cls)
+        object.__setattr__(self, "Recommended", description)
+        if cls is Recommended and _library_caller():
+            Recommended._instances[description] = self
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Recommended objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Recommended objects are immutable.")
+
+    def __reduce__(self):
+        return (self.__class__, (self.Recommended,))
 
     def __eq__(self, o):
         return True if isinstance(o, self.__class__) else False
@@ -161,6 +334,149 @@ if not __debug__:
         return True if attr is None else False
 
 
+def valid_language(language):
+    """Check if the language is in LANGUAGES, is "none" or is a composite tag.
+
+    All the methods setting a language map go through this function, hence
+    reassigning `iiifpapi3.LANGUAGES` to a plain list is still honoured.
+    Composite tags such as sr-Latn are accepted if their language subtag is
+    in LANGUAGES (see IIIFpres.BCP47_parser).
+
+    Args:
+        language (str): A BCP47 language tag or "none".
+
+    Returns:
+        Bool: True if the language is accepted.
+    """
+    if language == "none":
+        return True
+    languages = _setting("LANGUAGES")
+    return (language in languages or
+            BCP47_parser.is_valid_tag(language, languages))
+
+
+_SLOTNAMES = {}
+_SLOTGETTERS = {}
+_PROPERTYNAMES = {}
+
+
+def slotnames(cls):
+    """Return the names of the slots of a class.
+
+    The slots are listed from the base classes to the subclass, hence in the
+    order the properties are set by the constructors. Private slots (e.g.
+    `_optionalvalues`) are not listed. The result is cached.
+
+    Args:
+        cls (type): A class e.g. Canvas.
+
+    Returns:
+        tuple: The names of the slots e.g. ('id', 'type', 'label', ...).
+    """
+    try:
+        return _SLOTNAMES[cls]
+    except KeyError:
+        pass
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in names and not name.startswith("_"):
+                names.append(name)
+    _SLOTNAMES[cls] = names = tuple(names)
+    return names
+
+
+def propertynames(cls):
+    """Return the names of the properties of a class.
+
+    As slotnames, but the optional properties (see `_Optional`) are listed
+    too, after the slots of the class declaring them. This is the order of
+    the properties in the JSON.
+
+    Args:
+        cls (type): A class e.g. Canvas.
+
+    Returns:
+        tuple: The names of the properties.
+    """
+    try:
+        return _PROPERTYNAMES[cls]
+    except KeyError:
+        pass
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in tuple(slots) + klass.__dict__.get("_optional", ()):
+            if name not in names and not name.startswith("_"):
+                names.append(name)
+    _PROPERTYNAMES[cls] = names = tuple(names)
+    return names
+
+
+def _slotgetter(cls):
+    """Return a function returning the values of all the slots as a tuple."""
+    try:
+        return _SLOTGETTERS[cls]
+    except KeyError:
+        pass
+    names = slotnames(cls)
+    if len(names) > 1:
+        getter = operator.attrgetter(*names)
+    elif names:
+        single = operator.attrgetter(*names)
+
+        def getter(obj):
+            return (single(obj),)
+    else:
+        def getter(obj):
+            return ()
+    _SLOTGETTERS[cls] = getter
+    return getter
+
+
+def attributes(obj):
+    """Return the properties set on a IIIF object as a dict.
+
+    The IIIF classes store their properties in `__slots__` and in the dict of
+    the optional properties, this function replaces `obj.__dict__`: the
+    properties are listed in the order given by `propertynames` and are
+    followed by the content of the `__dict__` (the properties that are not
+    declared, e.g. of an extension). Optional properties that are not set are
+    not listed.
+
+    Args:
+        obj (object): A IIIF object.
+
+    Returns:
+        dict: The name and the value of the properties.
+    """
+    cls = obj.__class__
+    try:
+        attrs = dict(zip(slotnames(cls), _slotgetter(cls)(obj)))
+    except AttributeError:
+        # some slots were never set (or were deleted), we skip them one by one
+        attrs = {}
+        for name in slotnames(cls):
+            try:
+                attrs[name] = getattr(obj, name)
+            except AttributeError:
+                pass
+    if isinstance(obj, _CoreAttributes):
+        optional = getattr(obj, "_optionalvalues", None)
+        if optional:
+            attrs.update(optional)
+            attrs = {name: attrs[name] for name in propertynames(cls)
+                     if name in attrs}
+    if cls.__dictoffset__:
+        attrs.update(obj.__dict__)
+    return attrs
+
+
 def serializable(attr):
     """Check if attribute is Required and if so rise Value error.
 
@@ -175,6 +491,157 @@ def serializable(attr):
         return True
 
 
+_TODICT = {}
+_TODICT_ERRORS = {}
+
+
+def _todict_generic(obj, dumps_errors=False):
+    """Convert an object to dict using `attributes`.
+
+    This is used when the compiled function can not be used, e.g. when a
+    slot has been deleted.
+    """
+    if dumps_errors:
+        return {k: v for k, v in attributes(obj).items() if v is not None}
+    return {k: v for k, v in attributes(obj).items() if serializable(v)}
+
+
+def _compile_todict(cls, dumps_errors=False):
+    """Generate the function converting the objects of a class to dict.
+
+    The function reads the properties in the order of the class, without
+    building the intermediate dict of `attributes`, and applies inline the
+    checks of `serializable` (or only skips None if dumps_errors is True).
+    When no optional property is set only the slots are read.
+
+    Args:
+        cls (type): A class e.g. Canvas.
+        dumps_errors (bool, optional): Keep the Required and Recommended
+            placeholders. Defaults to False.
+
+    Returns:
+        function: A function taking an object of cls and returning a dict.
+    """
+    if dumps_errors:
+        check = ["if v is not None:",
+                 "    d[%r] = v"]
+    else:
+        check = ["if v is not None and v.__class__ is not Recommended:",
+                 "    if v.__class__ is Required:",
+                 "        raise ValueError(v)",
+                 "    d[%r] = v"]
+
+    def read(lines, indent, name, expr):
+        lines.append(indent + "v = " + expr)
+        lines.extend(indent + line.replace("%r", repr(name)) for line in check)
+
+    if hasattr(cls, "_todict"):
+        # e.g. CanvasColumns, converted to a list
+        return functools.partial(cls._todict, dumps_errors=dumps_errors)
+    slots = slotnames(cls)
+    lines = ["def todict(obj):",
+             "    d = {}",
+             "    try:"]
+    if issubclass(cls, _CoreAttributes):
+        lines.append("        optional = obj._optionalvalues")
+        lines.append("        if optional:")
+        lines.append("            get = optional.get")
+        for name in propertynames(cls):
+            if name in slots:
+                read(lines, " " * 12, name, "obj.%s" % name)
+            else:
+                read(lines, " " * 12, name, "get(%r)" % name)
+        lines.append("        else:")
+        indent = " " * 12
+    else:
+        indent = " " * 8
+    for name in slots:
+        read(lines, indent, name, "obj.%s" % name)
+    lines.append(indent + "pass")
+    lines.append("    except AttributeError:")
+    lines.append("        return _todict_generic(obj, %r)" % dumps_errors)
+    if cls.__dictoffset__:
+        lines.append("    for k, v in obj.__dict__.items():")
+        lines.extend("        " + line.replace("%r", "k") for line in check)
+    lines.append("    return d")
+    namespace = {"Required": Required,
+                 "Recommended": Recommended,
+                 "_todict_generic": _todict_generic}
+    exec("\n".join(lines), namespace)
+    return namespace["todict"]
+
+
+def _serializer(obj):
+    """The default function of json.dumps and orjson.dumps."""
+    try:
+        todict = _TODICT[obj.__class__]
+    except KeyError:
+        todict = _TODICT[obj.__class__] = _compile_todict(obj.__class__)
+    return todict(obj)
+
+
+def _serializer_with_errors(obj):
+    """As _serializer, keeping Required and Recommended placeholders."""
+    try:
+        todict = _TODICT_ERRORS[obj.__class__]
+    except KeyError:
+        todict = _TODICT_ERRORS[obj.__class__] = _compile_todict(
+            obj.__class__, dumps_errors=True)
+    return todict(obj)
+
+
+def _jsonkey(key):
+    """Convert a dict key as json.dumps does."""
+    if isinstance(key, str):
+        return str(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return json.dumps(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError("keys must be str, int, float, bool or None, "
+                    "not %s" % key.__class__.__name__)
+
+
+def _to_plain(obj, serializer, sort_keys=False):
+    """Convert obj to dicts, lists and scalars as json.loads(json.dumps(obj)).
+
+    Args:
+        obj (object): A IIIF object or a value of one of its properties.
+        serializer (function): Used for the objects that are not JSON types,
+            e.g. _serializer or _serializer_with_errors.
+        sort_keys (bool, optional): Sort the keys. Defaults to False.
+
+    Returns:
+        object: The plain Python object.
+    """
+    cls = obj.__class__
+    if cls is str or cls is int or cls is float or obj is None or \
+            obj is True or obj is False:
+        return obj
+    if isinstance(obj, dict):
+        res = {k if k.__class__ is str else _jsonkey(k):
+               _to_plain(v, serializer, sort_keys) for k, v in obj.items()}
+        if sort_keys:
+            res = dict(sorted(res.items()))
+        return res
+    if isinstance(obj, (list, tuple)):
+        return [_to_plain(v, serializer, sort_keys) for v in obj]
+    # subclasses of the JSON types e.g. an IntEnum
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    return _to_plain(serializer(obj), serializer, sort_keys)
+
+
 def add_to(selfx, destination, classx, obj, acceptedclasses=None, target=None):
     """Helper function used for adding IIIF object to to IIIF lists.
 
@@ -194,24 +661,24 @@ def add_to(selfx, destination, classx, obj, acceptedclasses=None, target=None):
         IIIF object: A reference to an instance of the IIIF object.
     """
     # if the argument is none we create a list.
-    if unused(selfx.__dict__[destination]):
-        selfx.__dict__[destination] = []
+    if unused(getattr(selfx, destination)):
+        setattr(selfx, destination, [])
     # if we are not providing a IIIF Object we create one.
     if obj is None and target is None:
         obj = classx()
-        selfx.__dict__[destination].append(obj)
+        getattr(selfx, destination).append(obj)
         return obj
     elif obj is None:
         # used for annotation.
         obj = classx(target=target)
-        selfx.__dict__[destination].append(obj)
+        getattr(selfx, destination).append(obj)
         return obj
     # otherwise we check that the object that we provide has the right type.
     else:
         if acceptedclasses is None:
             acceptedclasses = classx
         if isinstance(obj, acceptedclasses):
-            selfx.__dict__[destination].append(obj)
+            getattr(selfx, destination).append(obj)
         else:
             obj_name = obj.__class__.__name__
             class_name = selfx.__class__.__name__
@@ -219,26 +686,65 @@ def add_to(selfx, destination, classx, obj, acceptedclasses=None, target=None):
                              (obj_name, class_name))
 
 
+def _invalid_characters():
+    """Return the regular expression matching the INVALID_URI_CHARACTERS.
+
+    It is compiled once for each value of INVALID_URI_CHARACTERS.
+    """
+    return _compile_characters(_setting("INVALID_URI_CHARACTERS"))
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_characters(characters):
+    if not characters:
+        # an empty class is not valid, this never matches
+        return re.compile("(?!)")
+    return re.compile("[%s]" % re.escape(characters))
+
+
+def _URI_error(URI):
+    """Return the description of the invalid characters of a URI, or None.
+
+    The URI is searched once by a regular expression, the description
+    pointing to the characters is built only if some are found.
+
+    Args:
+        URI (str): The URI to check.
+
+    Returns:
+        str: The characters and their position, None if the URI is valid.
+    """
+    URI = URI.replace("https:/", "", 1)
+    URI = URI.replace("http:/", "", 1)
+    pattern = _invalid_characters()
+    if pattern.search(URI) is None:
+        return None
+    found = []
+    arrow = [" "] * len(URI)
+    for match in pattern.finditer(URI):
+        carat = match.group()
+        found.append("a space" if carat == " " else carat)
+        arrow[match.start()] = "^"
+    arrow = "".join(arrow).rstrip()
+    return "I found: %s here.\n%s\n%s" % (", ".join(found), URI, arrow)
+
+
 def check_valid_URI(URI):
     """Check if it is a valid URI.
 
+    The invalid characters found are reported with a warning.
+
     Args:
         URI (str): The URI to check.
 
     Returns:
         Bool: True if it is valid.
     """
-    isvalid = True
-    URI = URI.replace("https:/", "", 1)
-    URI = URI.replace("http:/", "", 1)
-    for indx, carat in enumerate(URI):
-        if carat in INVALID_URI_CHARACTERS:
-            if carat == " ":
-                carat = "a space"
-            arrow = " "*(indx) + "^"
-            isvalid = False
-            print("I found: %s here. \n%s\n%s" % (carat, URI, arrow))
-    return isvalid
+    error = _URI_error(URI)
+    if error is None:
+        return True
+    warnings.warn(error, stacklevel=2)
+    return False
 
 
 def check_ID(self, extendbase_url, objid):
@@ -255,24 +761,516 @@ def check_ID(self, extendbase_url, objid):
         if objid:
             raise ValueError(
                 "Set id using extendbase_url or objid not both.")
-        # this prevents the case the user forget the slash; in case the user
-        # really wants to join the string: objid = iiifpapi3.BASE_URL + myid
-        assert BASE_URL.endswith("/") or extendbase_url.startswith("/"), \
-            "Add / to extandbase_url or BASE_URL"
-        joined = "".join((BASE_URL, extendbase_url))
-        assert joined.startswith("http"), "ID must start with http or https"
-        assert check_valid_URI(joined), "Special characters must be encoded"
-        return joined
+        # BASE_URL is checked once, then only extendbase_url is checked
+        return _base_ids()(extendbase_url)
     else:
         assert objid.startswith("http"), "ID must start with http or https"
         if self.type == 'Canvas':
             assert "#" not in (objid), "URI of the canvas must not contain a fragment: #"
-        assert check_valid_URI(objid), "Special characters must be encoded"
+        # the message is computed again only if the check fails
+        assert _URI_error(objid) is None, \
+            "Special characters must be encoded. %s" % _URI_error(objid)
         return objid
 
 
+class IdFactory(object):
+    """Build IDs joining a base URL and a path.
+
+    The base URL is checked when the factory is created, then only the
+    paths are checked, hence building many IDs with the same base URL is a
+    cheap string operation. set_id(extendbase_url=...) uses a factory of
+    BASE_URL.
+
+    Args:
+        base_url (str, optional): The base URL. Defaults to None, i.e.
+            iiifpapi3.BASE_URL.
+
+    Example:
+        >>> ids = iiifpapi3.IdFactory("https://example.org/iiif/book1/")
+        >>> canvas.set_id(ids("canvas/p1"))
+        >>> pages = ids.sequence("page/p{n}/1", range(1, 40001))
+        >>> pages[0]
+        'https://example.org/iiif/book1/page/p1/1'
+    """
+    __slots__ = ("base_url", "_slash")
+
+    def __init__(self, base_url=None):
+        if base_url is None:
+            base_url = _setting("BASE_URL")
+        assert base_url.startswith("http"), "ID must start with http or https"
+        assert _URI_error(base_url) is None, \
+            "Special characters must be encoded. %s" % _URI_error(base_url)
+        self.base_url = base_url
+        self._slash = base_url.endswith("/")
+
+    def __call__(self, path):
+        """Return the ID base_url + path.
+
+        Args:
+            path (str): The path, e.g. "canvas/p1".
+
+        Returns:
+            str: The ID.
+        """
+        # this prevents the case the user forget the slash; in case the user
+        # really wants to join the string: objid = iiifpapi3.BASE_URL + myid
+        assert self._slash or path.startswith("/"), \
+            "Add / to extandbase_url or BASE_URL"
+        # the path has no scheme to be removed, as _URI_error does
+        assert _invalid_characters().search(path) is None, \
+            "Special characters must be encoded. %s" % _URI_error(
+                self.base_url + path)
+        return self.base_url + path
+
+    def sequence(self, pattern, numbers):
+        """Return the IDs formatting a path with a sequence of numbers.
+
+        The pattern is checked formatting the first number, the values
+        formatted for all the numbers are checked by a single search, the
+        IDs are checked one by one only if it finds an invalid character.
+
+        Args:
+            pattern (str): The path with the {n} field, e.g. "canvas/p{n}"
+                or "annotation/p{n:04d}-image".
+            numbers (iterable): The numbers, e.g. range(1, 4001). Any value
+                accepted by the field can be used, e.g. strings.
+
+        Returns:
+            list: The IDs.
+        """
+        numbers = list(numbers)
+        if not numbers:
+            return []
+        head, field, tail = pattern.partition("{n}")
+        if field and not set("{}").intersection(head + tail):
+            # without a format spec {n} is str(n)
+            values = list(map(str, numbers))
+            paths = [head + values[0] + tail]
+        else:
+            head = tail = ""
+            paths = values = [pattern.format(n=n) for n in numbers]
+        self(paths[0])
+        # the characters are invalid one by one, hence the values can be
+        # searched joined; without the slash each path must start with /
+        if _invalid_characters().search("".join(values)) is not None or \
+                not self._slash:
+            for value in values:
+                self(head + value + tail)
+        base = self.base_url + head
+        return [base + value + tail for value in values]
+
+
+def _base_ids():
+    """Return the IdFactory of BASE_URL, created once for each value of
+    BASE_URL and INVALID_URI_CHARACTERS.
+    """
+    return _base_factory(_setting("BASE_URL"),
+                         _setting("INVALID_URI_CHARACTERS"))
+
+
+@functools.lru_cache(maxsize=16)
+def _base_factory(base_url, characters):
+    # characters is part of the key, the factory reads the current value
+    return IdFactory(base_url)
+
+
+def _column(values):
+    """Convert a column (list, tuple, NumPy array, pandas Series or Arrow
+    array) to a list of Python objects, or return None.
+    """
+    if values is None:
+        return None
+    # Arrow, then NumPy and pandas which return Python scalars
+    tolist = getattr(values, "to_pylist", None) or \
+        getattr(values, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    return list(values)
+
+
+def _table_column(table, name):
+    """Return the column name of a dict of columns, a pandas DataFrame or
+    an Arrow table as a list, or None if the table has no such column.
+    """
+    if table is None:
+        return None
+    names = getattr(table, "column_names", None)
+    if names is None:
+        names = table.keys()
+    if name not in names:
+        return None
+    return _column(table[name])
+
+
+def _invalid_URI(column, fragment=True):
+    """Return the index of the first invalid URI of a column, or None.
+
+    The checks of check_ID are applied to the whole column at once, on the
+    URIs joined by newlines; the URIs are checked one by one only for
+    reporting the invalid one.
+
+    Args:
+        column (list): The URIs.
+        fragment (bool, optional): Accept URIs with a fragment (#), e.g.
+            False for canvases. Defaults to True.
+
+    Returns:
+        int: The index of the first invalid URI, None if they are valid.
+    """
+    invalid = _invalid_characters()
+
+    def check(uris):
+        joined = "\n" + "\n".join(uris)
+        # each line is a URI starting with http
+        if joined.count("\n") != len(uris) or \
+                joined.count("\nhttp") != len(uris):
+            return False
+        joined = joined.replace("\nhttps:/", "\n").replace("\nhttp:/", "\n")
+        return not invalid.search(joined) and (fragment or "#" not in joined)
+
+    if set(map(type, column)) <= {str} and check(column):
+        return None
+    for index, uri in enumerate(column):
+        if not isinstance(uri, str) or not check([uri]):
+            return index
+    return None
+
+
+def _positive_integers(column, name):
+    """Check that the values of a column are positive integers (as the
+    _HeightWidth setters) and return them as int.
+    """
+    strings = list(map(str, column))
+    assert all(map(str.isdigit, strings)), \
+        "%s must be positive integers." % name
+    integers = list(map(int, strings))
+    assert not integers or min(integers) > 0, \
+        "%s must be positive integers." % name
+    return integers
+
+
+class _Optional(object):
+    """HELPER CLASS
+
+    Descriptor of an optional property. The classes list their optional
+    properties in `_optional` and the value is kept in the
+    `_optionalvalues` dict of the object, which is created when the first
+    optional property is set. Hence, the properties that are not used do
+    not take memory in every object and are skipped by the serializers
+    without being read.
+
+    An optional property that is not set is None and setting it to None
+    removes it.
+    """
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        values = getattr(obj, "_optionalvalues", None)
+        if values is None:
+            return None
+        return values.get(self.name)
+
+    def __set__(self, obj, value):
+        values = getattr(obj, "_optionalvalues", None)
+        if value is None:
+            if values:
+                values.pop(self.name, None)
+        elif values is None:
+            obj._optionalvalues = {self.name: value}
+        else:
+            values[self.name] = value
+
+    def __delete__(self, obj):
+        self.__set__(obj, None)
+
+
+class _Fragments(object):
+    """HELPER CLASS
+
+    The JSON of an object cached by dumps(cache=True): a list of pieces for
+    each format (backend, options and indentation) and the fragments of the
+    objects containing it, which are invalidated with it.
+    """
+    __slots__ = ("values", "parents")
+
+    def __init__(self):
+        self.values = {}
+        self.parents = []
+
+    def invalidate(self):
+        stack = [self]
+        while stack:
+            fragments = stack.pop()
+            # the objects containing an object without cache have no cache
+            if fragments.values:
+                fragments.values.clear()
+                stack.extend(fragments.parents)
+
+
+def _invalidating(method):
+    """Wrap a set_ or add_ method for invalidating the cached JSON."""
+    @functools.wraps(method)
+    def mutator(self, *args, **kwargs):
+        if self._fragments is not None:
+            self._fragments.invalidate()
+        return method(self, *args, **kwargs)
+    mutator._invalidating = True
+    return mutator
+
+
+def _track_mutators(cls):
+    """Wrap the set_ and add_ methods of cls and of its subclasses."""
+    for name in dir(cls):
+        if name.startswith(("set_", "add_")):
+            method = getattr(cls, name)
+            if callable(method) and \
+                    not getattr(method, "_invalidating", False):
+                setattr(cls, name, _invalidating(method))
+    for subclass in cls.__subclasses__():
+        _track_mutators(subclass)
+
+
+class _Cacheable(object):
+    """HELPER CLASS
+
+    The objects whose JSON can be cached by dumps(cache=True). The methods
+    starting with set_ and add_ invalidate the JSON of the object and of the
+    objects containing it. The properties assigned directly are not tracked,
+    call `invalidate` after changing them.
+
+    The methods are wrapped the first time the cache is used, hence they are
+    not slowed down in the programs not using it.
+
+    The properties are stored in `__slots__`, the `__dict__` slot keeps only
+    the properties that are not declared (e.g. ``canvas.myproperty = 1``).
+    """
+    __slots__ = ("_fragments", "__dict__")
+    _tracking = False
+
+    def __init_subclass__(cls, **kwargs):
+        super(_Cacheable, cls).__init_subclass__(**kwargs)
+        if _Cacheable._tracking:
+            _track_mutators(cls)
+
+    @staticmethod
+    def _track():
+        if not _Cacheable._tracking:
+            _Cacheable._tracking = True
+            _track_mutators(_Cacheable)
+
+    def invalidate(self):
+        """Discard the cached JSON of the object and of the objects
+        containing it.
+
+        The set_ and add_ methods call it, it is needed only after assigning
+        a property directly e.g. `canvas.height = 600`.
+        """
+        if self._fragments is not None:
+            self._fragments.invalidate()
+
+    def __getstate__(self):
+        # copies do not share the cached JSON nor the objects containing it
+        state = {"_fragments": None}
+        state.update(attributes(self))
+        return (None, state)
+
+
+_PLACEHOLDER = "\x00IIIFpres fragment\x00"
+
+
+class _FragmentEncoder(object):
+    """HELPER CLASS
+
+    Encode a document with a backend splicing the cached JSON of the
+    objects it contains. Each object is encoded once, the backend writes a
+    placeholder in place of the cacheable objects it contains (see default)
+    and the result is cached as a list of pieces at the indentation where
+    it is used.
+    """
+    __slots__ = ("backend", "serializer", "options", "key", "keys", "token",
+                 "newline", "space", "children")
+
+    def __init__(self, backend, serializer, compact, sort_keys,
+                 ensure_ascii):
+        self.backend = backend
+        self.serializer = serializer
+        self.options = (compact, sort_keys, ensure_ascii)
+        self.key = (backend, serializer, compact, sort_keys, ensure_ascii)
+        self.keys = {}
+        self.children = []
+        _Cacheable._track()
+        # checks the options, then the library is called directly
+        self.token = backend.encode(
+            _PLACEHOLDER, None, compact=compact, sort_keys=sort_keys,
+            ensure_ascii=ensure_ascii, as_bytes=backend.binary)
+        self.newline = b"\n" if backend.binary else "\n"
+        self.space = b" " if backend.binary else " "
+
+    def encode(self, document):
+        return self.backend._encode(document, self.default, *self.options)
+
+    def default(self, obj):
+        """The default function of the backend: the cacheable objects are
+        collected in the order of the JSON and replaced by the placeholder.
+        """
+        if isinstance(obj, _Cacheable):
+            self.children.append(obj)
+            return _PLACEHOLDER
+        return self.serializer(obj)
+
+    def pieces(self, document, indent=0, parent=None):
+        """Return the JSON of document as a list of pieces.
+
+        Args:
+            document (dict): The dict of an object.
+            indent (int, optional): The indentation of the line where the
+                document is written. Defaults to 0.
+            parent (_Fragments, optional): The fragments of the object of
+                the document. Defaults to None (the document is not cached).
+
+        Returns:
+            list: str or bytes, depending on the backend (a tuple if the
+            document contains no cacheable object).
+        """
+        children = self.children = []
+        res = self.encode(document)
+        newline = self.newline
+        if indent:
+            pad = newline + self.space * indent
+            res = res.replace(newline, pad)
+        if not children:
+            return (res,)
+        parts = res.split(self.token)
+        pieces = []
+        for child, part in zip(children, parts):
+            pieces.append(part)
+            # the objects are indented as the line of the placeholder
+            line = part[part.rfind(newline) + 1:]
+            depth = len(line) - len(line.lstrip(self.space))
+            pieces.extend(self.fragment(child, depth, parent))
+        pieces.append(parts[-1])
+        return pieces
+
+    def fragment(self, obj, indent, parent):
+        """Return the cached pieces of obj, encoding them if needed."""
+        fragments = obj._fragments
+        if fragments is None:
+            fragments = obj._fragments = _Fragments()
+        if parent is not None and parent not in fragments.parents:
+            fragments.parents.append(parent)
+        try:
+            key = self.keys[indent]
+        except KeyError:
+            key = self.keys[indent] = (self.key, indent)
+        try:
+            return fragments.values[key]
+        except KeyError:
+            pass
+        pieces = self.pieces(self.serializer(obj), indent, fragments)
+        fragments.values[key] = pieces
+        return pieces
+
+
+class _Hasher(object):
+    """HELPER CLASS
+
+    Compute the SHA-256 digest of the content of the cacheable objects.
+
+    The digest of an object is computed over its canonical JSON (sorted
+    keys, no spaces, UTF-8), where each contained object is replaced by a
+    placeholder, followed by the digests of the contained objects in order.
+    The digests are cached with the JSON of dumps(cache=True), hence only
+    the objects changed since the last call are hashed again.
+
+    A CanvasColumns is hashed as the list of its canvases, the rows that
+    have not been accessed as the Canvas built from them, hence accessing
+    a row does not change the digest.
+    """
+    __slots__ = ("serializer", "key", "encoder", "children")
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.key = ("sha256", serializer)
+        self.encoder = json.JSONEncoder(
+            default=self.default, sort_keys=True, separators=(",", ":"),
+            ensure_ascii=False)
+        self.children = []
+        _Cacheable._track()
+
+    def default(self, obj):
+        if obj.__class__ is CanvasColumns:
+            # the rows are (columns, row) and are hashed by row_digest
+            self.children.extend(
+                (obj, row) if row.__class__ is int else row
+                for row in obj._rows)
+            return [_PLACEHOLDER] * len(obj._rows)
+        if isinstance(obj, _Cacheable):
+            self.children.append(obj)
+            return _PLACEHOLDER
+        return self.serializer(obj)
+
+    def digest(self, obj, parent=None):
+        """Return the digest of obj, hashing it if needed.
+
+        Args:
+            obj (_Cacheable): The object.
+            parent (_Fragments, optional): The fragments of the object
+                containing obj. Defaults to None.
+
+        Returns:
+            bytes: The digest.
+        """
+        fragments = obj._fragments
+        if fragments is None:
+            fragments = obj._fragments = _Fragments()
+        if parent is not None and parent not in fragments.parents:
+            fragments.parents.append(parent)
+        try:
+            return fragments.values[self.key]
+        except KeyError:
+            pass
+        children = self.children = []
+        canonical = self.encoder.encode(self.serializer(obj))
+        digest = hashlib.sha256(canonical.encode("utf-8"))
+        for child in children:
+            if child.__class__ is tuple:
+                digest.update(self.row_digest(child[0], child[1], fragments))
+            else:
+                digest.update(self.digest(child, fragments))
+        digest = fragments.values[self.key] = digest.digest()
+        return digest
+
+    def row_digest(self, columns, row, parent):
+        """Return the digest of a row of a CanvasColumns that has not been
+        accessed, the digest of the Canvas built from it.
+
+        The digests of the rows are cached by the CanvasColumns, which is
+        invalidated when it changes.
+        """
+        fragments = columns._fragments
+        if fragments is None:
+            fragments = columns._fragments = _Fragments()
+        if parent not in fragments.parents:
+            fragments.parents.append(parent)
+        digests = fragments.values.setdefault(self.key, {})
+        try:
+            return digests[row]
+        except KeyError:
+            pass
+        block, i = columns._locate(row)
+        block_columns, options = columns._blocks[block]
+        canvas = _bulk_canvas(options, *_bulk_row(block_columns, i))
+        digest = digests[row] = self.digest(canvas)
+        return digest
+
+
 # Let's group all the common arguments across the different types of collection
-class _CoreAttributes(object):
+class _CoreAttributes(_Cacheable):
     """HELPER CLASS
 
     Core attributes are the attributes in all the major classes/containers of
@@ -285,13 +1283,31 @@ class _CoreAttributes(object):
     ID an type attributes are required. The other might vary.
     """
 
+    __slots__ = ("id", "type", "label", "_optionalvalues")
+    _required_id = Required("A _CoreAttributes must have the ID property.")
+
+    def __init_subclass__(cls, **kwargs):
+        super(_CoreAttributes, cls).__init_subclass__(**kwargs)
+        # the placeholder of the ID is formatted once per class
+        cls._required_id = Required(
+            "A %s must have the ID property." % cls.__name__)
+        for name in cls.__dict__.get("_optional", ()):
+            setattr(cls, name, _Optional(name))
+
     def __init__(self):
-        self.id = Required(
-            "A %s must have the ID property." %
-            self.__class__.__name__)
+        self.id = self._required_id
         self.type = self.__class__.__name__
         # These might be suggested or may be used if needed.
         self.label = None
+        self._optionalvalues = None
+        self._fragments = None
+
+    def __getstate__(self):
+        # the optional properties are restored one by one, so that copies do
+        # not share the dict storing them
+        state = {"_optionalvalues": None}
+        state.update(super(_CoreAttributes, self).__getstate__()[1])
+        return (None, state)
 
     def set_id(self, objid=None, extendbase_url=None):
         """Set the ID of the object
@@ -337,7 +1353,7 @@ class _CoreAttributes(object):
             self.label = {}
         if language is None:
             language = "none"
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             """Language must be a valid BCP47 language tag or none.
             Please read https://git.io/JoQty. Please read https://git.io/JoQty."""
         assert isinstance(text, (str, list)), "text can be a string or a list of strings"
@@ -352,12 +1368,105 @@ class _CoreAttributes(object):
             # faster way to join lists
             self.label[language][0:0] = text
 
+    def _document(self, dumps_errors, context):
+        """Return the top level dict of the JSON, with the @context as first
+        key, and the serializer to be used for the nested objects.
+        """
+        if context is None:
+            context = _setting("CONTEXT")
+        if dumps_errors:
+            serializer = _serializer_with_errors
+        else:
+            serializer = _serializer
+        document = {"@context": context}
+        document.update(serializer(self))
+        return document, serializer
+
+    @staticmethod
+    def _json_format(compact):
+        """Return indent and separators of json for the compact argument."""
+        if compact is None:
+            compact = _setting("COMPACT")
+        if compact:
+            return None, (",", ":")
+        return 2, None
+
+    def dumps(
+            self,
+            backend="auto",
+            dumps_errors=False,
+            ensure_ascii=False,
+            sort_keys=False,
+            context=None,
+            compact=None,
+            as_bytes=False,
+            cache=None):
+        """Dumps the content of the object in JSON format using a backend.
+
+        The backends are the JSON libraries listed in IIIFpres.backends:
+        json, orjson, ujson and msgspec. All of them produce the same
+        document, with the keys in the same order and the same indentation,
+        but the text of some floats can differ (e.g. json writes 1e-07 and
+        orjson 1e-7).
+
+        With cache the JSON of each object contained in this one is kept and
+        reused by the next calls, until one of its set_ or add_ methods is
+        called. Hence, after editing a canvas of a large manifest only the
+        canvas is encoded again. The cache takes about as much memory as the
+        JSON, see invalidate for the changes which are not tracked.
+
+        Args:
+            backend (str, optional): The name of the backend. "auto" uses the
+                fastest installed backend supporting the options (orjson,
+                msgspec, ujson and finally json). Defaults to "auto".
+            dumps_errors (bool, optional): If set true it shows any problem
+                found directly on the JSON file with a Required or Recommended
+                tag.Defaults to False.
+            ensure_ascii (bool, optional): Ensure ASCI are used.
+                Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to
+                None.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
+            as_bytes (bool, optional): Return UTF-8 encoded bytes. Defaults
+                to False.
+            cache (bool, optional): Reuse the JSON of the objects that have
+                not changed since the last call. Defaults to None, i.e.
+                iiifpapi3.CACHE.
+
+        Returns:
+            str: The JSON object as a string (bytes if as_bytes is True).
+        """
+        if not __debug__:
+            # in debug Required and Recommend are None
+            dumps_errors = True
+        if compact is None:
+            compact = _setting("COMPACT")
+        if cache is None:
+            cache = _setting("CACHE")
+        encoder = backends.get_backend(
+            backend, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
+        document, serializer = self._document(dumps_errors, context)
+        if cache:
+            fragments = _FragmentEncoder(
+                encoder, serializer, compact, sort_keys, ensure_ascii)
+            return encoder.join(fragments.pieces(document), as_bytes)
+        return encoder.encode(
+            document,
+            serializer,
+            compact=compact,
+            sort_keys=sort_keys,
+            ensure_ascii=ensure_ascii,
+            as_bytes=as_bytes)
+
     def json_dumps(
             self,
             dumps_errors=False,
             ensure_ascii=False,
             sort_keys=False,
-            context=None):
+            context=None,
+            compact=None):
         """Dumps the content of the object in JSON format.
 
         Args:
@@ -369,90 +1478,182 @@ class _CoreAttributes(object):
             sort_keys (bool, optional): Sort the keys. Defaults to False.
             context (str,list, optional): Add additional context. Defaults to
                 None.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
 
         Returns:
             str: The JSON object as a string.
         """
-        if context is None:
-            context = CONTEXT
-
         if not __debug__:
             # in debug Required and Recommend are None hence we use a faster
             # serializer
             print("Debug False")
             dumps_errors = True
 
-        def serializerwitherrors(obj):
-            return {k: v for k, v in obj.__dict__.items() if v is not None}
+        return self.dumps(
+            backend="json",
+            dumps_errors=dumps_errors,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            context=context,
+            compact=compact)
 
-        def serializer(obj):
-            return {k: v for k, v in obj.__dict__.items() if serializable(v)}
-        if dumps_errors:
-            res = json.dumps(
-                self,
-                default=serializerwitherrors,
-                indent=2,
-                ensure_ascii=ensure_ascii,
-                sort_keys=sort_keys)
-        else:
-            res = json.dumps(
-                self,
-                default=serializer,
-                indent=2,
-                ensure_ascii=ensure_ascii,
-                sort_keys=sort_keys)
-        # little hack for fixing context first 3 chrs "{\n"
-        res = "".join(('{\n  "@context": %s,\n ' % json.dumps(context), res[3:]))
-        return res
+    def json_stream(
+            self,
+            fp,
+            dumps_errors=False,
+            ensure_ascii=False,
+            sort_keys=False,
+            context=None,
+            chunk_size=4096,
+            compact=None):
+        """Write the object in JSON format to a file-like object.
+
+        The output is the same of json_dumps but it is written in chunks while
+        the objects are walked, hence the whole document is never kept in
+        memory. Use it for very large manifests and collections.
+
+        Args:
+            fp (file-like): An object with a write method accepting str e.g.
+                a file opened in text mode.
+            dumps_errors (bool, optional): If set true it shows any problem
+                found directly on the JSON file with a Required or Recommended
+                tag.Defaults to False.
+            ensure_ascii (bool, optional): Ensure ASCI are used.
+                Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to
+                None.
+            chunk_size (int, optional): The number of pieces produced by the
+                encoder (keys, values, punctuation) joined for each call of
+                fp.write. Defaults to 4096.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
+        """
+        if not __debug__:
+            # in debug Required and Recommend are None
+            dumps_errors = True
+
+        document, serializer = self._document(dumps_errors, context)
+        indent, separators = self._json_format(compact)
+        encoder = json.JSONEncoder(
+            default=serializer,
+            indent=indent,
+            separators=separators,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys)
+        chunks = encoder.iterencode(document)
+        pieces = list(itertools.islice(chunks, chunk_size))
+        while pieces:
+            fp.write("".join(pieces))
+            pieces = list(itertools.islice(chunks, chunk_size))
 
     def orjson_dumps(
             self,
             dumps_errors=False,
-            context=None):
+            context=None,
+            as_bytes=False,
+            compact=None):
         """Dumps the content of the object in JSON format using orJSON library.
 
         Args:
             dumps_errors (bool, optional): If set true it shows any problem
                 found, directly on the JSON file with a Required or Recommended
                 tag.Defaults to False.
-            ensure_ascii (bool, optional): Ensure ASCI are used.
-                Defaults to False.
-            sort_keys (bool, optional): Sort the keys. Defaults to False.
             context (str,list, optional): Add additional context. Defaults to None.
+            as_bytes (bool, optional): Return the UTF-8 bytes produced by
+                orjson without decoding them, e.g. for writing them to a file
+                opened in binary mode or to a HTTP response. Defaults to False.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
 
         Returns:
-            str: The JSON object as a string.
+            str: The JSON object as a string (bytes if as_bytes is True).
         """
-        import orjson
-        if context is None:
-            context = CONTEXT
-
         if not __debug__:
             # in debug Required and Recommend are None hence we use a faster
             # serializer
             print("Debug False")
             dumps_errors = True
 
-        def serializerwitherrors(obj):
-            return {k: v for k, v in obj.__dict__.items() if v is not None}
+        return self.dumps(
+            backend="orjson",
+            dumps_errors=dumps_errors,
+            context=context,
+            compact=compact,
+            as_bytes=as_bytes)
+
+    def content_hash(self, dumps_errors=False):
+        """Return a hash of the content of the object.
+
+        The hash is the SHA-256 of the canonical JSON of the object, computed
+        per object as a Merkle tree: the hashes of the contained objects are
+        kept and reused until their set_ or add_ methods are called, hence
+        hashing again a large manifest after editing a canvas only hashes the
+        canvas and the objects containing it. Two objects with the same
+        content have the same hash, whatever the format used for dumping
+        them. Properties assigned directly are not tracked, see invalidate.
 
-        def serializer(obj):
-            return {k: v for k, v in obj.__dict__.items() if serializable(v)}
+        Args:
+            dumps_errors (bool, optional): Hash the Required and Recommended
+                placeholders too. Defaults to False.
 
+        Returns:
+            str: The hexadecimal digest.
+        """
+        if not __debug__:
+            # in debug Required and Recommend are None
+            dumps_errors = True
         if dumps_errors:
-            res = orjson.dumps(
-                self,
-                default=serializerwitherrors,
-                option=orjson.OPT_INDENT_2)
+            serializer = _serializer_with_errors
         else:
-            res = orjson.dumps(
-                self,
-                default=serializer,
-                option=orjson.OPT_INDENT_2)
-        # little hack for fixing context first 3 chrs "{\n"
-        res = "".join(('{\n  "@context": %s,\n ' % json.dumps(context),
-                      res[3:].decode("utf-8")))
-        return res
+            serializer = _serializer
+        return _Hasher(serializer).digest(self).hex()
+
+    def etag(self, dumps_errors=False):
+        """Return an ETag for the HTTP responses serving the object.
+
+        The ETag is weak since it identifies the content and not the bytes
+        of a response: the same tag is returned for the indented, compact or
+        compressed JSON. It changes when the content changes, see
+        content_hash.
+
+        Args:
+            dumps_errors (bool, optional): See content_hash. Defaults to
+                False.
+
+        Returns:
+            str: The ETag e.g. W/"9f86d081884c7d65...".
+
+        Example:
+            >>> if request.headers.get("If-None-Match") == manifest.etag():
+            ...     return Response(status=304)
+        """
+        return 'W/"%s"' % self.content_hash(dumps_errors=dumps_errors)
+
+    def to_dict(self, dumps_errors=False, sort_keys=False, context=None):
+        """Return the object as a dict, ready to be passed to a JSON encoder.
+
+        The result is the same of `json.loads(self.json_dumps())` but it is
+        obtained walking the objects, without writing and parsing the JSON.
+
+        Args:
+            dumps_errors (bool, optional): If set true the Required and
+                Recommended fields are included. Defaults to False.
+            sort_keys (bool, optional): Sort the keys, @context is kept
+                first. Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to
+                None.
+
+        Returns:
+            dict: The object as dict.
+        """
+        if not __debug__:
+            # in debug Required and Recommend are None
+            dumps_errors = True
+
+        document, serializer = self._document(dumps_errors, context)
+        return _to_plain(document, serializer, sort_keys)
 
     def to_json(
             self,
@@ -463,40 +1664,97 @@ class _CoreAttributes(object):
         """Return the object with the JSON syntax.
 
         Args:
-            filename (str): The filename.
-            save_errors (bool, optional): If True also the errors will be
+            dumps_errors (bool, optional): If True also the errors will be
                 dumped. Defaults to False.
-            ensure_ascii (bool, optional): If True only ASCI character will be
-                used. Defaults to False.
+            ensure_ascii (bool, optional): Not used, kept for compatibility.
+                Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
             context (str,list, optional): Add additional contexts to the JSON.
                 Defaults to None.
         Return:
             dict: a JSON dump of the object as dict.
         """
-        res = json.loads(self.json_dumps(
+        return self.to_dict(
             dumps_errors=dumps_errors,
-            ensure_ascii=ensure_ascii,
             sort_keys=sort_keys,
-            context=context))
-        return res
+            context=context)
 
-    def json_save(self, filename, save_errors=False, ensure_ascii=False, context=None):
-        """Save the JSON object to file.
+    def save(self, filename, backend="auto", save_errors=False,
+             ensure_ascii=False, context=None, compact=None,
+             compression=None, sidecars=False, cache=None):
+        """Save the JSON object to file using a backend.
+
+        With the json backend the file is written while the objects are
+        walked (see json_stream), the other backends and the cache write the
+        UTF-8 bytes they produce.
+
+        The JSON can be compressed while it is written. With sidecars the
+        uncompressed file and the compressed copies (e.g. manifest.json and
+        manifest.json.gz) are written in the same pass, ready to be served
+        by a web server supporting precompressed files.
 
         Args:
             filename (str): The filename.
+            backend (str, optional): The name of the backend, see dumps.
+                Defaults to "auto".
             save_errors (bool, optional): If True also the errors will be
                 dumped. Defaults to False.
             ensure_ascii (bool, optional): If True only ASCI character will be
                 used. Defaults to False.
             context (str,list, optional): Add additional contexts to the JSON.
                 Defaults to None.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
+            compression (str,list, optional): gzip, zstd, br (see
+                IIIFpres.compressors) or a list of them if sidecars is True.
+                Defaults to None.
+            sidecars (bool, optional): If True filename is written
+                uncompressed and each compression is written to filename
+                plus its suffix (.gz, .zst, .br). If False filename is
+                compressed. Defaults to False.
+            cache (bool, optional): Reuse the JSON of the objects that have
+                not changed, see dumps. Defaults to None, i.e.
+                iiifpapi3.CACHE.
         """
-        with open(filename, 'w') as f:
-            f.write(self.json_dumps(
-                dumps_errors=save_errors, ensure_ascii=ensure_ascii, context=context))
+        encoder = backends.get_backend(backend, ensure_ascii=ensure_ascii)
+        if cache is None:
+            cache = _setting("CACHE")
+        stream = encoder.name == "json" and not cache
+        if compression is None and not sidecars:
+            if stream:
+                with open(filename, 'w', encoding="utf-8") as f:
+                    try:
+                        self.json_stream(
+                            f, dumps_errors=save_errors,
+                            ensure_ascii=ensure_ascii, context=context,
+                            compact=compact)
+                    except BaseException:
+                        # no truncated file is left looking complete
+                        f.close()
+                        os.remove(filename)
+                        raise
+            else:
+                res = self.dumps(
+                    backend=encoder.name, dumps_errors=save_errors,
+                    ensure_ascii=ensure_ascii, context=context,
+                    compact=compact, as_bytes=True, cache=cache)
+                with open(filename, 'wb') as f:
+                    f.write(res)
+            return
+        with compressors.Writer(filename, compression, sidecars) as f:
+            if stream:
+                self.json_stream(
+                    codecs.getwriter("utf-8")(f), dumps_errors=save_errors,
+                    ensure_ascii=ensure_ascii, context=context,
+                    compact=compact)
+            else:
+                f.write(self.dumps(
+                    backend=encoder.name, dumps_errors=save_errors,
+                    ensure_ascii=ensure_ascii, context=context,
+                    compact=compact, as_bytes=True, cache=cache))
 
-    def orjson_save(self, filename, save_errors=False, context=None):
+    def json_save(self, filename, save_errors=False, ensure_ascii=False,
+                  context=None, compact=None):
         """Save the JSON object to file.
 
         Args:
@@ -507,10 +1765,92 @@ class _CoreAttributes(object):
                 used. Defaults to False.
             context (str,list, optional): Add additional contexts to the JSON.
                 Defaults to None.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
+        """
+        self.save(filename, backend="json", save_errors=save_errors,
+                  ensure_ascii=ensure_ascii, context=context, compact=compact)
+
+    def orjson_save(self, filename, save_errors=False, context=None,
+                    compact=None):
+        """Save the JSON object to file.
+
+        Args:
+            filename (str): The filename.
+            save_errors (bool, optional): If True also the errors will be
+                dumped. Defaults to False.
+            context (str,list, optional): Add additional contexts to the JSON.
+                Defaults to None.
+            compact (bool, optional): Write the JSON without indentation and
+                spaces. Defaults to None, i.e. iiifpapi3.COMPACT.
+        """
+        self.save(filename, backend="orjson", save_errors=save_errors,
+                  context=context, compact=compact)
+
+    async def adumps(
+            self,
+            backend="auto",
+            dumps_errors=False,
+            ensure_ascii=False,
+            sort_keys=False,
+            context=None,
+            compact=None,
+            as_bytes=False,
+            cache=None,
+            executor=None):
+        """Dumps the object like dumps without blocking the asyncio loop.
+
+        The JSON is encoded in a thread of executor, with the settings of
+        config used by the calling task. The object must not be modified
+        until the coroutine returns.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): An executor
+                running threads, e.g. a ThreadPoolExecutor. Defaults to
+                None, i.e. the default executor of the loop.
+                The other arguments are the ones of dumps.
+
+        Raises:
+            ValueError: If executor is a ProcessPoolExecutor.
+
+        Returns:
+            str: The JSON object as a string (bytes if as_bytes is True).
+
+        Example:
+            >>> async def handler(request):
+            ...     body = await manifest.adumps(as_bytes=True)
         """
-        with open(filename, 'w') as f:
-            f.write(self.orjson_dumps(
-                dumps_errors=save_errors, context=context))
+        return await _run_in_executor(
+            executor, self.dumps, backend=backend, dumps_errors=dumps_errors,
+            ensure_ascii=ensure_ascii, sort_keys=sort_keys, context=context,
+            compact=compact, as_bytes=as_bytes, cache=cache)
+
+    async def asave(self, filename, backend="auto", save_errors=False,
+                    ensure_ascii=False, context=None, compact=None,
+                    compression=None, sidecars=False, cache=None,
+                    executor=None):
+        """Save the JSON object to file like save without blocking the
+        asyncio loop.
+
+        Both the encoding and the writing of the file run in a thread of
+        executor, with the settings of config used by the calling task. The
+        object must not be modified until the coroutine returns. See
+        IIIFpres.batch.asave_many for saving many objects.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): An executor
+                running threads, e.g. a ThreadPoolExecutor. Defaults to
+                None, i.e. the default executor of the loop.
+                The other arguments are the ones of save.
+
+        Raises:
+            ValueError: If executor is a ProcessPoolExecutor.
+        """
+        await _run_in_executor(
+            executor, self.save, filename, backend=backend,
+            save_errors=save_errors, ensure_ascii=ensure_ascii,
+            context=context, compact=compact, compression=compression,
+            sidecars=sidecars, cache=cache)
 
     def inspect(self):
         """Print the object in the derminal and show the missing required
@@ -536,6 +1876,8 @@ class _CoreAttributes(object):
         Returns:
             str: If getHTML is set to true returns the HTML as str.
         """
+        # webbrowser and tempfile are imported only when needed
+        from . import visualization_html
         jsonf = self.json_dumps(dumps_errors=True)
         HTML = visualization_html.show_error_in_browser(jsonf, getHTML=getHTML)
         return HTML
@@ -556,6 +1898,9 @@ class _CoreAttributes(object):
 class _Format(object):
     """HELPER CLASS for setting the Format.
     """
+
+    __slots__ = ()
+
     def set_format(self, format):
         """Set the format of the resource.
 
@@ -570,11 +1915,9 @@ class _Format(object):
             format (str): Usually  is the MIME e.g. image/jpeg.
         """
 
-        assert "/" in format, "Format should be in the form type/format e.g. image/jpeg"
-        assert format.split("/")[0].isalpha(), "Format should be in the form type/format e.g. image/jpeg"
-        assert not format == 'image/jpg', "Correct media type for jpeg should be image/jpeg not image/jpg"
-        assert not format == 'image/tif', "Correct media type  for tiff should be image/tiff"
-        assert any(format in sl for sl in MEDIATYPES.values()), "Not a IANA valid media type."
+        # the message is computed again only if the check fails
+        assert check_mediatype(format, _setting("MEDIATYPES")) is None, \
+            check_mediatype(format, _setting("MEDIATYPES"))
         self.format = format
 
 
@@ -582,6 +1925,8 @@ class _HeightWidth(object):
     """HELPER CLASS for setting Height and Width.
     """
 
+    __slots__ = ()
+
     def _checkpositiveinteger(self, value):
         """Return the value if positive integer.
 
@@ -640,6 +1985,9 @@ class _HeightWidth(object):
 class _Duration(object):
     """HELPER CLASS for setting Duration.
     """
+
+    __slots__ = ()
+
     def set_duration(self, duration):
         """Set the duration of the resource.
 
@@ -658,6 +2006,9 @@ class _Duration(object):
 class _ViewingDirection(object):
     """HELPER CLASS for adding ViewingDirection obejcts.
     """
+
+    __slots__ = ()
+
     def set_viewingDirection(self, viewingDirection):
         """Set the viewing direction of the object.
 
@@ -685,6 +2036,9 @@ class _ViewingDirection(object):
 class _MutableType(object):
     """HELPER CLASS In some IIIF objects the type can be changed.
     """
+
+    __slots__ = ()
+
     def set_type(self, mtype):
         """Set the type or class of the resource.
 
@@ -703,6 +2057,9 @@ class _MutableType(object):
 class _ImmutableType(object):
     """HELPER CLASS In some IIIF objects the type cannot be changed.
     """
+
+    __slots__ = ()
+
     def set_type(self, mtype=None):
         """In case of IIIF objects with predefined type this function won't
         change the type but will rise an error if you try to change it.
@@ -732,6 +2089,9 @@ class _ImmutableType(object):
 class _SeeAlso(object):
     """HELPER CLASS for adding SeeAlso objects.
     """
+
+    __slots__ = ()
+
     def add_seeAlso(self, seeAlsoobj=None):
         """Add a seeAlso object to the resource.
 
@@ -769,6 +2129,8 @@ class seeAlso(_MutableType, _CoreAttributes, _Format):
     representation, with distinct id and format properties.
     """
 
+    __slots__ = ("format", "profile")
+
     def __init__(self):
         super(seeAlso, self).__init__()
         self.type = Required("SeeAlso type is required, e.g. dataset, Image")
@@ -798,6 +2160,8 @@ class partOf(_MutableType, _CoreAttributes):
     Collection using partOf to aid in navigation.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(partOf, self).__init__()
         self.type = Required("Each partOf item must have a type")
@@ -823,6 +2187,8 @@ class supplementary(_ImmutableType, _CoreAttributes):
     the Annotations that transcribe or translate, respectively.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super(supplementary, self).__init__()
         self.type = "AnnotationCollection"
@@ -833,6 +2199,9 @@ class supplementary(_ImmutableType, _CoreAttributes):
 class _Service(object):
     """HELPER CLASS for adding services.
     """
+
+    __slots__ = ()
+
     def add_service(self, serviceobj=None):
         """Add a service to the resource.
 
@@ -877,6 +2246,9 @@ class service(_CoreAttributes, _HeightWidth, _Service):
     IIIF Image API service.
     """
 
+    __slots__ = ("profile",)
+    _optional = ("width", "height", "service", "sizes")
+
     def __init__(self):
         super(service, self).__init__()
         self.type = Required(
@@ -885,11 +2257,6 @@ class service(_CoreAttributes, _HeightWidth, _Service):
         self.profile = Recommended(
             "Each object should have a profile property.")
 
-        self.width = None
-        self.height = None
-        self.service = None
-        self.sizes = None
-
     def set_type(self, mytype):
         """Set the type of the service.
 
@@ -968,6 +2335,10 @@ class thumbnail(_MutableType, _CoreAttributes, _Format, _HeightWidth,
         >>> tmb.set_format("image/jpeg")
         >>> tmb.set_heightWidth(1234,1234)
     """
+
+    __slots__ = ("service", "format", "height", "width")
+    _optional = ("duration",)
+
     def __init__(self):
         super(thumbnail, self).__init__()
         self.service = None
@@ -975,12 +2346,14 @@ class thumbnail(_MutableType, _CoreAttributes, _Format, _HeightWidth,
         self.format = Recommended("A thumbnail should have a format.")
         self.height = Recommended("Should have an height or a duration.")
         self.width = Recommended("Should have an width or a duration.")
-        self.duration = None
 
 
 class _Thumbnail(object):
     """HELPER CLASS for adding thumbnail.
     """
+
+    __slots__ = ()
+
     def add_thumbnail(self, thumbnailobj=None):
         """Add a thumbnail object to the resource.
 
@@ -1005,6 +2378,9 @@ class _Thumbnail(object):
 class _AddLanguage(object):
     """HELPER CLASS for adding languages.
     """
+
+    __slots__ = ()
+
     def add_language(self, language):
         """add a language to the language list of the resource.
 
@@ -1014,8 +2390,9 @@ class _AddLanguage(object):
             >>> manifest.add_language('en')
 
         Note:
-            pyIIIFpres accept only single tag, in case you need subtags you
-            need to add them to iiifpapi3.LANGUAGES::
+            Composite tags e.g. sr-Latn are parsed and only their language
+            subtag is checked, in case you need a tag that does not follow
+            the BCP47 grammar you need to add it to iiifpapi3.LANGUAGES::
 
             >>> from IIIFpres import iiifpapi3,BCP47lang
             >>> iiifpapi3.LANGUAGES.append("de-DE-u-co-phonebk")
@@ -1027,7 +2404,7 @@ class _AddLanguage(object):
         """
         if unused(self.language):
             self.language = []
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.language.append(language)
@@ -1056,6 +2433,8 @@ class homepage(_MutableType, _CoreAttributes, _Format, _AddLanguage):
         >>> homp.add_language("en")
     """
 
+    __slots__ = ("language", "format")
+
     def __init__(self):
         super(homepage, self).__init__()
         self.language = None
@@ -1074,6 +2453,8 @@ class _Hompage(object):
     """HELPER CLASS for adding homepages.
     """
 
+    __slots__ = ()
+
     def add_homepage(self, homepageobj=None):
         """add an homepage object to the resource.
 
@@ -1129,6 +2510,9 @@ class provider(_ImmutableType, _CoreAttributes, _Hompage, _SeeAlso):
         >>> homp.set_id("https://digital.library.ucla.edu/")
     """
 
+    __slots__ = ("context", "homepage", "logo")
+    _optional = ("seeAlso",)
+
     def __init__(self):
         super(provider, self).__init__()
         self.context = None
@@ -1142,7 +2526,6 @@ class provider(_ImmutableType, _CoreAttributes, _Hompage, _SeeAlso):
         self.logo = Recommended(
             "Agents should have the logo property, and its value must be an"
             "array of JSON objects as described in the logo section.")
-        self.seeAlso = None
 
     def add_logo(self, logoobj=None):
         """add a logo object to the resource
@@ -1191,6 +2574,8 @@ class logo(_ImmutableType, _CoreAttributes, _HeightWidth, _Format, _Service):
         >>> serv.set_id("https://UCLA-Library-Logo")
     """
 
+    __slots__ = ("format", "service", "height", "width")
+
     def __init__(self):
         super(logo, self).__init__()
         self.type = "Image"
@@ -1231,6 +2616,8 @@ class rendering(_MutableType, _CoreAttributes, _Format):
         >>> rendering.set_format("application/pdf")
     """
 
+    __slots__ = ("format",)
+
     def __init__(self):
         super(rendering, self).__init__()
         self.format = Recommended(
@@ -1246,6 +2633,9 @@ class _ServicesList(object):
     Collection.
 
     """
+
+    __slots__ = ()
+
     def add_service_to_services(self, serviceobj=None):
         """Add a service to the services list of the resource.
 
@@ -1270,7 +2660,7 @@ class _ServicesList(object):
         return add_to(self, 'services', service, serviceobj, (service, dict))
 
 
-class languagemap(object):
+class languagemap(_Cacheable):
     """HELPER CLASS
     This is not a IIIF type but is used for easing the construction of
     multilingual metadata and requiredstatements.
@@ -1280,11 +2670,14 @@ class languagemap(object):
         >>> languagemap.add_value('hosted by imagineRio','en')
     """
 
+    __slots__ = ("label", "value")
+
     def __init__(self):
         self.label = Required(
             "The metadata/requiredstatements must have at least a label")
         self.value = Required(
             "The metadata/requiredstatements must have at least a value")
+        self._fragments = None
 
     def add_value(self, value, language="none"):
         """Add the value of the language map.
@@ -1305,7 +2698,7 @@ class languagemap(object):
         # if any(['</' in i for i in value]):
         #    assert any([i.startswith('<') and i.endswith('>') for i in value]),\
         #        'if html must begin with < and end with >'
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.value[language] = value
@@ -1329,7 +2722,7 @@ class languagemap(object):
             label = [label]
         # TODO: check that is not html
         # https://iiif.io/api/presentation/3.0/#45-html-markup-in-property-values
-        assert language in LANGUAGES or language == "none", \
+        assert valid_language(language), \
             "Language must be a valid BCP47 language tag or none." \
             "Please read https://git.io/JoQty."
         self.label[language] = label
@@ -1349,21 +2742,10 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
     ID an type attributes are required. The other might vary.
     """
 
-    def __init__(self):
-        super(_CommonAttributes, self).__init__()
-        self.metadata = None
-        self.summary = None
-        self.requiredStatement = None
-        self.rights = None
-        # https://iiif.io/api/presentation/3.0/#thumbnail
-        self.thumbnail = None
-        self.behavior = None
-        self.seeAlso = None
-        self.service = None
-        self.homepage = None
-        self.rendering = None
-        self.partOf = None
-        self.provider = None
+    __slots__ = ()
+    _optional = ("metadata", "summary", "requiredStatement", "rights",
+                 "thumbnail", "behavior", "seeAlso", "service", "homepage",
+                 "rendering", "partOf", "provider")
 
     def add_metadata(self, label=None, value=None, language_l="none",
                      language_v="none", entry=None):
@@ -1417,7 +2799,7 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
 
         if not isinstance(value, list):
             value = [value]
-        assert language_l in LANGUAGES or language_l == "none", \
+        assert valid_language(language_l), \
             "Language must be a valid BCP47 language tag or none." \
             "Please read https://git.io/JoQty."
 
@@ -1444,7 +2826,7 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
         """
         if unused(self.summary):
             self.summary = {}
-        assert language in LANGUAGES or language == "none",\
+        assert valid_language(language),\
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.summary[language] = [text]
@@ -1501,10 +2883,10 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
                 language_l = "none"
             if language_v is None:
                 language_v = "none"
-            assert language_l in LANGUAGES or language_l == "none",\
+            assert valid_language(language_l),\
                 "Language must be a valid BCP47 language tag or none. "\
                 "Please read https://git.io/JoQty."
-            assert language_v in LANGUAGES or language_v == "none",\
+            assert valid_language(language_v),\
                 "Language must be a valid BCP47 language tag or none. "\
                 "Please read https://git.io/JoQty."
             entry = {"label": {language_l: [label]},
@@ -1564,7 +2946,7 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
             behavior (str): the behaviour to be added.
         """
         # TODO: should we assert if behaviour disjoint with others?
-        assert behavior in BEHAVIOURS, f"{behavior} is not valid. See https://git.io/Jo7r9."
+        assert behavior in _setting("BEHAVIOURS"), f"{behavior} is not valid. See https://git.io/Jo7r9."
         # this might leave an empty list if user fail the assertion
         if unused(self.behavior):
             self.behavior = []
@@ -1764,12 +3146,13 @@ class Annotation(_CommonAttributes):
     assume that it is always content to be rendered.
     """
 
+    __slots__ = ("motivation", "body", "target")
+
     def __init__(self, target=Required()):
         super(Annotation, self).__init__()
         self.motivation = None  # TODO: Check if this is required
         self.body = None  # TODO: Check if this is required
         self.target = target
-        self.metadata = None
 
     def set_motivation(self, motivation):
         """set the motivation of the annotation.
@@ -1906,6 +3289,9 @@ class AnnotationPage(_CommonAttributes):
 
     """
     # TODO: AnnotationPage type MUST be AnnotationPage?
+
+    __slots__ = ("items",)
+
     def __init__(self):
         super(AnnotationPage, self).__init__()
         self.items = Recommended(
@@ -1942,6 +3328,9 @@ class AnnotationCollection(_CommonAttributes):
     to the user’s preference.
 
     """
+
+    __slots__ = ()
+
     def __init__(self):
         super(AnnotationCollection, self).__init__()
         self.label = Recommended("An Annotation Collection should have the"
@@ -1978,6 +3367,9 @@ class _AnnotationsList(object):
     Some IIIF obejcts have a list of annotations. This list can contain
     only AnnotationPages.
     """
+
+    __slots__ = ()
+
     def add_annotationpage_to_annotations(self, annopageobj=None):
         """Add an AnnotationPage to the annotations list.
 
@@ -2009,6 +3401,8 @@ class _AddAnnoP2Items(object):
     """HELPER CLASS for adding annotationpage to items.
     """
 
+    __slots__ = ()
+
     def add_annotationpage_to_items(self, annotationpageobj=None, target=None):
         """Add an annotation page to the items list of the object.
 
@@ -2038,6 +3432,10 @@ class contentresources(_MutableType, _CommonAttributes, _HeightWidth,
     from within the Manifest or Collection.
     This includes images, video, audio, data, web pages or any other format.
     """
+
+    __slots__ = ("annotations", "format", "profile")
+    _optional = ("height", "width", "duration", "items")
+
     def __init__(self):
         super(_CommonAttributes, self).__init__()
         self.annotations = None
@@ -2058,11 +3456,14 @@ class contentresources(_MutableType, _CommonAttributes, _HeightWidth,
         return add_to(self, 'annotations', Annotation, annotation, target=self.id)
 
 
-class bodycommenting(_ImmutableType):
+class bodycommenting(_ImmutableType, _Cacheable):
+    __slots__ = ("type", "value", "language", "format")
+
     def __init__(self):
         self.type = "TextualBody"
         self.value = None
         self.language = None
+        self._fragments = None
 
     def set_format(self, format):
         """Set the format of the resource.
@@ -2084,7 +3485,8 @@ class bodycommenting(_ImmutableType):
         Args:
             format (str): Usually  is the MIME e.g. text/plain.
         """
-        assert format in MEDIATYPES['text'], "Not a valid MEDIATYPE for text"
+        assert format in _setting("MEDIATYPES")['text'], \
+            "Not a valid MEDIATYPE for text"
         self.format = format
 
     def set_value(self, value):
@@ -2101,7 +3503,7 @@ class bodycommenting(_ImmutableType):
         Args:
             language (str): The language of the TextualBody value e.g. "en"
         """
-        assert language in LANGUAGES or language == "none",\
+        assert valid_language(language),\
             "Language must be a valid BCP47 language tag or none."\
             "Please read https://git.io/JoQty."
         self.language = language
@@ -2114,14 +3516,9 @@ class bodypainting(contentresources, _Service, _AddLanguage):
     Manifest) is provided by the body property of Annotations with the painting
     motivation.
     """
-    def __init__(self):
-        super(bodypainting, self).__init__()
-        self.height = None
-        self.width = None
-        self.duration = None
-        self.service = None
-        self.language = None
-        self.items = None
+
+    __slots__ = ()
+    _optional = ("language",)
 
     def add_choice(self, choiceobj=None):
         """Add a Choice to the body of the annotation.
@@ -2171,11 +3568,14 @@ class _CMRCattributes(_CommonAttributes, _AnnotationsList, _ImmutableType):
 
     All these values are optional.
     """
+
+    __slots__ = ("placeholderCanvas", "accompanyingCanvas")
+    _optional = ("navDate", "navPlace")
+
     def __init__(self):
         super(_CMRCattributes, self).__init__()
         self.placeholderCanvas = None
         self.accompanyingCanvas = None
-        self.navDate = None
 
     def _apcanvas(self, canvastype, canvas):
         """An helper method for setting placeholder and accompany Canvas.
@@ -2286,6 +3686,9 @@ class Canvas(_CMRCattributes, _HeightWidth, _Duration, _AddAnnoP2Items):
     URI.
     """
 
+    __slots__ = ("height", "width", "duration", "items")
+    _optional = ("annotations",)
+
     def __init__(self):
         super(Canvas, self).__init__()
         self.label = Recommended("A Canvas should have the label property with at least one entry.")
@@ -2294,7 +3697,6 @@ class Canvas(_CMRCattributes, _HeightWidth, _Duration, _AddAnnoP2Items):
         self.duration = None
         self.items = Recommended(
             "The canvas should contain at least one item.")
-        self.annotations = None
         self.placeholderCanvas = None
         self.accompanyingCanvas = None
 
@@ -2320,6 +3722,293 @@ class Canvas(_CMRCattributes, _HeightWidth, _Duration, _AddAnnoP2Items):
         return add_to(self, 'annotations', Annotation, annotation, target=self.id)
 
 
+def _compile_template(prototype, substitutions, arguments):
+    """Generate the function building a copy of prototype.
+
+    The function creates the objects with __new__ and assigns their slots,
+    the lists and the dicts are copied and the other values are shared with
+    the prototype. The dicts that are items of a list (e.g. a service added
+    as dict) are shared too. The values at the paths of substitutions are
+    replaced by the expressions given.
+
+    Args:
+        prototype (_Cacheable): The object to be copied.
+        substitutions (dict): The paths, e.g. ("items", 0, "id"), and the
+            expressions replacing their value. PROTOTYPE in an expression is
+            replaced by the copy of the value of the prototype.
+        arguments (list): The names of the arguments of the function.
+
+    Returns:
+        function: The function.
+    """
+    namespace = {}
+    lines = []
+
+    def constant(value):
+        name = "k%s" % len(namespace)
+        namespace[name] = value
+        return name
+
+    def value(v, path, shared=False):
+        if path in substitutions:
+            expression = substitutions[path]
+            if "PROTOTYPE" in expression:
+                expression = expression.replace(
+                    "PROTOTYPE", copied(v, path, shared))
+            return expression
+        return copied(v, path, shared)
+
+    def copied(v, path, shared):
+        if isinstance(v, _Cacheable):
+            return build(v, path)
+        if v.__class__ is list:
+            return "[%s]" % ", ".join(
+                value(item, path + (i,), True) for i, item in enumerate(v))
+        if v.__class__ is dict and not shared:
+            return "{%s}" % ", ".join(
+                "%s: %s" % (repr(k) if k.__class__ is str else constant(k),
+                            value(item, path + (k,)))
+                for k, item in v.items())
+        if v is None or v.__class__ in (str, int, float, bool):
+            return repr(v)
+        return constant(v)
+
+    def build(obj, path):
+        var = "o%s" % len(lines)
+        cls = obj.__class__
+        lines.append("%s = %s.__new__(%s)" % (var, constant(cls),
+                                               constant(cls)))
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                if name == "__dict__":
+                    continue
+                if name == "_fragments":
+                    lines.append("%s._fragments = None" % var)
+                    continue
+                try:
+                    v = getattr(obj, name)
+                except AttributeError:
+                    continue
+                if name == "_optionalvalues" and v:
+                    # the optional properties are at the path of their name
+                    v = "{%s}" % ", ".join(
+                        "%r: %s" % (k, value(item, path + (k,)))
+                        for k, item in v.items())
+                else:
+                    v = value(v, path + (name,))
+                lines.append("%s.%s = %s" % (var, name, v))
+        if cls.__dictoffset__ and obj.__dict__:
+            lines.append("%s.__dict__.update(%s)" % (
+                var, copied(obj.__dict__, path, False)))
+        return var
+
+    result = build(prototype, ())
+    code = "def template(%s):\n    %s\n    return %s\n" % (
+        ", ".join(arguments), "\n    ".join(lines), result)
+    exec(code, namespace)
+    return namespace["template"]
+
+
+class CanvasTemplate(object):
+    """Build canvases with the structure of a prototype canvas.
+
+    The prototype is a canvas built and checked with the setters, e.g. the
+    first canvas of a book with its annotation page, painting annotation,
+    image and image service. The template copies it once per canvas
+    replacing the IDs, the sizes and the label, hence the properties that
+    are the same for all the canvases (types, formats, profiles, services
+    given as dict...) are not checked and allocated again. Only the values
+    given to `new` are checked, as the setters do.
+
+    The label and the IDs of the image and of its service must be given if
+    the prototype has them, so that the canvases do not share them. The IDs
+    of the annotation page and of the annotation are derived from the ID of
+    the canvas as in Manifest.add_canvases_bulk, the other values that are
+    not given are the ones of the prototype. The target
+    of the annotation is the ID of the canvas if it is so in the prototype.
+    The dicts added to a list (e.g. `service.add_service(dict)`) are shared
+    by the canvases, do not modify them in place.
+
+    The prototype can have at most one annotation page with one annotation
+    in items and no annotations property: their IDs would be copied
+    unchanged, hence shared by all the canvases. Add them to each canvas
+    returned by `new`.
+
+    Args:
+        canvas (Canvas): The prototype, later changes are not followed.
+
+    Example:
+        >>> template = iiifpapi3.CanvasTemplate(canvas)
+        >>> for idx in range(2, 4001):
+        ...     manifest.add_canvas_to_items(template.new(
+        ...         "https://example.org/iiif/book1/canvas/p%s" % idx,
+        ...         label="p. %s" % idx,
+        ...         image_id="https://example.org/p%s/full/max/0/default.jpg"
+        ...         % idx,
+        ...         service_id="https://example.org/p%s" % idx))
+    """
+    __slots__ = ("prototype", "_objects", "_label_language", "_required",
+                 "_template")
+
+    _arguments = ("id", "height", "width", "label", "annotationpage_id",
+                  "annotation_id", "image_id", "image_height", "image_width",
+                  "service_id")
+
+    def __init__(self, canvas):
+        assert isinstance(canvas, Canvas), "The prototype must be a Canvas."
+        assert not unused(canvas.id), "The prototype must have an ID."
+        assert unused(canvas.annotations) or not canvas.annotations, \
+            "The annotations of the prototype would be shared by all the " \
+            "canvases with the same IDs, add them to each new canvas."
+        self.prototype = canvas
+        substitutions = {
+            ("id",): "id",
+            ("height",): "(PROTOTYPE if height is None else height)",
+            ("width",): "(PROTOTYPE if width is None else width)",
+        }
+        # the object of each argument, used for checking the values
+        objects = {"id": canvas, "height": canvas, "width": canvas}
+        # the arguments that new must not take from the prototype
+        required = []
+        if unused(canvas.label):
+            self._label_language = "none"
+            substitutions[("label",)] = \
+                "(PROTOTYPE if label is None else {'none': [label]})"
+            objects["label"] = canvas
+        elif len(canvas.label) == 1:
+            self._label_language = next(iter(canvas.label))
+            substitutions[("label",)] = \
+                "{%r: [label]}" % self._label_language
+            objects["label"] = canvas
+            required.append("label")
+        else:
+            self._label_language = None
+
+        def first(obj, name, cls):
+            items = getattr(obj, name, None)
+            if isinstance(items, list) and items and \
+                    isinstance(items[0], cls):
+                return items[0]
+            return None
+
+        def single(obj, name):
+            items = getattr(obj, name, None)
+            assert not isinstance(items, list) or len(items) <= 1, \
+                "The prototype must have at most one %s in %s.items, the " \
+                "others would be shared by all the canvases with the same " \
+                "IDs." % ("annotation page" if obj is canvas else
+                          "annotation", obj.__class__.__name__)
+
+        single(canvas, "items")
+        page = first(canvas, "items", AnnotationPage)
+        if page is not None:
+            single(page, "items")
+        annotation = first(page, "items", Annotation)
+        body = getattr(annotation, "body", None)
+        imageservice = first(body, "service", service)
+        if page is not None:
+            substitutions[("items", 0, "id")] = \
+                "(id + '/page' if annotationpage_id is None " \
+                "else annotationpage_id)"
+            objects["annotationpage_id"] = page
+        if annotation is not None:
+            path = ("items", 0, "items", 0)
+            substitutions[path + ("id",)] = \
+                "(id + '/page/annotation' if annotation_id is None " \
+                "else annotation_id)"
+            if annotation.target == canvas.id:
+                substitutions[path + ("target",)] = "id"
+            objects["annotation_id"] = annotation
+        if isinstance(body, contentresources):
+            path = ("items", 0, "items", 0, "body")
+            substitutions[path + ("id",)] = "image_id"
+            for name in ("height", "width"):
+                substitutions[path + (name,)] = \
+                    "(PROTOTYPE if image_%s is None else image_%s)" % (
+                        name, name)
+                objects["image_" + name] = body
+            objects["image_id"] = body
+            required.append("image_id")
+        if imageservice is not None:
+            path = ("items", 0, "items", 0, "body", "service", 0, "id")
+            substitutions[path] = "service_id"
+            objects["service_id"] = imageservice
+            required.append("service_id")
+        self._objects = objects
+        self._required = tuple(
+            (self._arguments.index(name), name) for name in required)
+        self._template = _compile_template(
+            canvas, substitutions, self._arguments)
+
+    def new(self, id, height=None, width=None, label=None,
+            annotationpage_id=None, annotation_id=None, image_id=None,
+            image_height=None, image_width=None, service_id=None):
+        """Return a new canvas with the structure of the prototype.
+
+        Args:
+            id (str): The ID of the canvas.
+            height (int, optional): The height of the canvas.
+            width (int, optional): The width of the canvas.
+            label (str, optional): The label of the canvas, in the language
+                of the label of the prototype (none if it has no label).
+                Required if the prototype has a label.
+            annotationpage_id (str, optional): The ID of the annotation
+                page. Defaults to id + "/page".
+            annotation_id (str, optional): The ID of the painting
+                annotation. Defaults to id + "/page/annotation".
+            image_id (str, optional): The ID of the image. Required if the
+                prototype has an image.
+            image_height (int, optional): The height of the image.
+            image_width (int, optional): The width of the image.
+            service_id (str, optional): The ID of the image service.
+                Required if the image of the prototype has a service.
+
+        Raises:
+            ValueError: If a required value is not given.
+
+        Returns:
+            iiifpapi3.Canvas: The canvas.
+        """
+        values = (id, height, width, label, annotationpage_id,
+                  annotation_id, image_id, image_height, image_width,
+                  service_id)
+        if __debug__:
+            objects = self._objects
+            for name, value in zip(self._arguments, values):
+                if value is None:
+                    continue
+                assert name in objects, \
+                    "The prototype has no object for %s." % name
+                if name.endswith("id"):
+                    check_ID(objects[name], None, value)
+                elif name == "label":
+                    assert isinstance(label, str), "label must be a string."
+                else:
+                    objects[name]._checkpositiveinteger(value)
+        for index, name in self._required:
+            if values[index] is None:
+                raise ValueError(
+                    "The prototype has a %s, pass %s to new so that the "
+                    "canvases do not share it." % (
+                        "label" if name == "label" else
+                        "image" if name == "image_id" else "image service",
+                        name))
+        if height is not None:
+            height = int(height)
+        if width is not None:
+            width = int(width)
+        if image_height is not None:
+            image_height = int(image_height)
+        if image_width is not None:
+            image_width = int(image_width)
+        return self._template(id, height, width, label, annotationpage_id,
+                              annotation_id, image_id, image_height,
+                              image_width, service_id)
+
+
 class start(_CoreAttributes):
     """IIIF resource
 
@@ -2337,12 +4026,14 @@ class start(_CoreAttributes):
         >>> manifest.start.set_type("Canvas")
         >>> manifest.start.set_id("0202-start-canvas/canvas/p2")
     """
+
+    __slots__ = ("profile",)
+    _optional = ("source", "selector")
+
     def __init__(self):
         super(start, self).__init__()
         self.type = Required("Start object must have a type.")
         self.profile = Recommended("Start object should have a profile.")
-        self.source = None
-        self.selector = None
 
     def set_type(self, mtype):
         """Set the type of the resource: Canvas or SpecificResource.
@@ -2367,6 +4058,8 @@ class start(_CoreAttributes):
 
 
 class _Start(object):
+    __slots__ = ()
+
     def set_start(self, startobj=None):
         """This method set a start obejct at self.start.
         IIIF: A Canvas, or part of a Canvas, which the client should show on
@@ -2395,6 +4088,249 @@ class _Start(object):
         return self.start
 
 
+def _bulk_row(columns, i):
+    """Return the arguments of _bulk_canvas for the row i of the columns
+    of add_canvases_bulk, filling the optional columns with their defaults.
+    """
+    canvasid = columns["ids"][i]
+    height = columns["heights"][i]
+    width = columns["widths"][i]
+
+    def get(name, default=None):
+        values = columns[name]
+        return default if values is None else values[i]
+
+    return (canvasid, height, width, get("labels"),
+            get("annotationpage_ids", canvasid + "/page"),
+            get("annotation_ids", canvasid + "/page/annotation"),
+            columns["images"][i], get("image_heights", height),
+            get("image_widths", width), get("services"))
+
+
+def _bulk_canvas(options, canvasid, height, width, label, pageid,
+                 annotationid, imageid, imageheight, imagewidth, serviceid):
+    """Build a canvas of add_canvases_bulk assigning the validated values
+    without calling the setters.
+    """
+    (label_language, image_format, image_type, service_type,
+     service_profile) = options
+    body = bodypainting()
+    body.id = imageid
+    body.type = image_type
+    body.format = image_format
+    body.height = imageheight
+    body.width = imagewidth
+    if serviceid is not None:
+        imageservice = service()
+        imageservice.id = serviceid
+        imageservice.type = service_type
+        imageservice.profile = service_profile
+        body.service = [imageservice]
+    annotation = Annotation(target=canvasid)
+    annotation.id = annotationid
+    annotation.motivation = "painting"
+    annotation.body = body
+    page = AnnotationPage()
+    page.id = pageid
+    page.items = [annotation]
+    canvas = Canvas()
+    canvas.id = canvasid
+    canvas.height = height
+    canvas.width = width
+    if label is not None:
+        canvas.label = {label_language: [label]}
+    canvas.items = [page]
+    return canvas
+
+
+_ROW_NAMES = ("ids", "heights", "widths", "labels", "annotationpage_ids",
+              "annotation_ids", "images", "image_heights", "image_widths",
+              "services")
+# the expressions of the optional columns that are not given
+_ROW_DEFAULTS = {"annotationpage_ids": "ids[i] + '/page'",
+                 "annotation_ids": "ids[i] + '/page/annotation'",
+                 "image_heights": "heights[i]",
+                 "image_widths": "widths[i]"}
+
+
+def _compile_row(columns, options, label, imageservice, serializer):
+    """Generate the function converting a row of the columns of
+    add_canvases_bulk to the dict of its canvas.
+
+    The canvas is built once by _bulk_canvas with a marker in place of each
+    value and converted to dict by serializer, then the dict is written as
+    the source of a Python expression reading the columns. Hence the result
+    is the same of `_to_plain(canvas, serializer)` without building the
+    objects.
+
+    Args:
+        columns (dict): The columns of add_canvases_bulk.
+        options (tuple): The options of add_canvases_bulk.
+        label (bool): The rows have a label.
+        imageservice (bool): The rows have an image service.
+        serializer (function): _serializer or _serializer_with_errors.
+
+    Returns:
+        function: A function taking the index of a row and returning a dict.
+    """
+    expressions = {}
+    markers = []
+    for name in _ROW_NAMES:
+        marker = "\x00IIIFpres column %s\x00" % name
+        markers.append(marker)
+        if columns[name] is None and name in _ROW_DEFAULTS:
+            expressions[marker] = _ROW_DEFAULTS[name]
+        else:
+            expressions[marker] = "%s[i]" % name
+    if not label:
+        markers[_ROW_NAMES.index("labels")] = None
+    if not imageservice:
+        markers[_ROW_NAMES.index("services")] = None
+    canvas = _bulk_canvas(options, *markers)
+
+    def source(value):
+        if value.__class__ is dict:
+            return "{%s}" % ", ".join(
+                "%r: %s" % (k, source(v)) for k, v in value.items())
+        if value.__class__ is list:
+            return "[%s]" % ", ".join(map(source, value))
+        if value.__class__ is str and value in expressions:
+            return expressions[value]
+        return repr(value)
+
+    code = "def row(i):\n    return %s\n" % source(
+        _to_plain(canvas, serializer))
+    namespace = {name: values for name, values in columns.items()
+                 if values is not None}
+    exec(code, namespace)
+    return namespace["row"]
+
+
+class CanvasColumns(_Cacheable, collections.abc.MutableSequence):
+    """The items of a Manifest built by add_canvases_bulk with columnar.
+
+    The canvases are kept as the columns given to add_canvases_bulk and are
+    serialized reading the columns. The Canvas object of a row, with its
+    annotation page, annotation, body and service, is built only when it is
+    accessed (e.g. `manifest.items[10]`), then it is kept and serialized as
+    the other canvases. Hence a manifest with thousands of similar canvases
+    takes about the memory of its columns.
+
+    It behaves as a list of canvases: canvases can be appended, inserted
+    and deleted. Iterating over it builds all the canvases, use
+    `manifest.items = list(manifest.items)` for going back to a list.
+
+    Args:
+        items (list, optional): The canvases preceding the columns.
+            Defaults to ().
+    """
+    __slots__ = ("_blocks", "_starts", "_rows", "_templates")
+
+    def __init__(self, items=()):
+        # the columns and options of each add_canvases_bulk call
+        self._blocks = []
+        self._starts = []
+        # the objects or the number of their row in the blocks
+        self._rows = list(items)
+        self._templates = {}
+        self._fragments = None
+
+    def __getstate__(self):
+        # the templates read the columns, they are compiled again
+        return (None, {"_blocks": self._blocks, "_starts": self._starts,
+                       "_rows": self._rows, "_templates": {},
+                       "_fragments": None})
+
+    def _add_columns(self, columns, options):
+        start = 0
+        if self._blocks:
+            start = self._starts[-1] + len(self._blocks[-1][0]["ids"])
+        self._blocks.append((columns, options))
+        self._starts.append(start)
+        self._rows.extend(range(start, start + len(columns["ids"])))
+        self.invalidate()
+
+    def _locate(self, row):
+        """Return the number of the block of a row and its index in it."""
+        block = bisect.bisect_right(self._starts, row) - 1
+        return block, row - self._starts[block]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._rows)))]
+        item = self._rows[index]
+        if item.__class__ is int:
+            block, i = self._locate(item)
+            columns, options = self._blocks[block]
+            item = self._rows[index] = _bulk_canvas(
+                options, *_bulk_row(columns, i))
+            # the cached JSON of the row does not follow the new object
+            self.invalidate()
+        return item
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+        self._rows[index] = value
+        self.invalidate()
+
+    def __delitem__(self, index):
+        del self._rows[index]
+        self.invalidate()
+
+    def insert(self, index, value):
+        self._rows.insert(index, value)
+        self.invalidate()
+
+    def _with_id(self, id):
+        """Return the (index, canvas) pairs of the canvases already built
+        and of the rows containing id (e.g. as ID of the canvas or of its
+        image), which are built. Used by the utilities looking for an ID.
+        """
+        res = []
+        for index, item in enumerate(self._rows):
+            if item.__class__ is int:
+                block, i = self._locate(item)
+                if id not in _bulk_row(self._blocks[block][0], i):
+                    continue
+                item = self[index]
+            res.append((index, item))
+        return res
+
+    def _todict(self, dumps_errors=False):
+        """Return the list of the canvases, the rows that have not been
+        accessed are converted to dict reading the columns.
+        """
+        serializer = _serializer_with_errors if dumps_errors else _serializer
+        templates = self._templates
+        res = []
+        for item in self._rows:
+            if item.__class__ is not int:
+                res.append(item)
+                continue
+            block, i = self._locate(item)
+            columns, options = self._blocks[block]
+            labels = columns["labels"]
+            services = columns["services"]
+            key = (block,
+                   labels is not None and labels[i] is not None,
+                   services is not None and services[i] is not None,
+                   serializer)
+            try:
+                template = templates[key]
+            except KeyError:
+                template = templates[key] = _compile_row(
+                    columns, options, key[1], key[2], serializer)
+            res.append(template(i))
+        return res
+
+    def __repr__(self):
+        return "CanvasColumns(%s canvases)" % len(self._rows)
+
+
 class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
     """IIIF resource
 
@@ -2427,21 +4363,20 @@ class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
         >>> canvas = manifest.add_canvas_to_items()
     """
 
+    __slots__ = ("start", "viewingDirection", "services", "items")
+    _optional = ("annotations", "structures")
+
     def __init__(self):
         super(Manifest, self).__init__()
         self.start = None
         self.label = Required("A Manifest must have the label property with at least one entry.")
         self.viewingDirection = None
         self.services = None
-        self.service = None
         self.thumbnail = Recommended("A Manifest should have the thumbnail property with at least one item.")
         self.summary = Recommended("A Manifest should have the summary property with at least one entry.")
         self.metadata = Recommended("A Manifest should have the metadata property with at least one item.")
         self.items = Required("The Manifest must have an items property with at least one item")
-        self.annotations = None
         self.provider = Recommended("A Manifest should have the provider property with at least one item.")
-        self.structures = None
-        self.placeholderCanvas = None
 
     def add_item(self, item):
         """Add an item (Canvas) to the Manifest.
@@ -2535,6 +4470,154 @@ class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
         """
         return add_to(self, 'structures', Range, rangeobj)
 
+    def add_canvases_bulk(
+            self,
+            ids=None,
+            heights=None,
+            widths=None,
+            labels=None,
+            images=None,
+            services=None,
+            annotationpage_ids=None,
+            annotation_ids=None,
+            image_heights=None,
+            image_widths=None,
+            table=None,
+            label_language="none",
+            image_format="image/jpeg",
+            image_type="Image",
+            service_type="ImageService3",
+            service_profile="level2",
+            columnar=False):
+        """Add many canvases, each painted by an image, from columns.
+
+        Each canvas gets an annotation page with a painting annotation whose
+        body is the image, optionally with an image service, as built by
+        add_canvas_to_items, add_annotationpage_to_items,
+        add_annotation_to_items and the setters. The columns are validated
+        once each and the objects are built without calling the setters,
+        hence it is several times faster for large manifests.
+
+        The columns can be lists, tuples, NumPy arrays, pandas Series or
+        Arrow arrays, or be read by name from table.
+
+        With columnar the columns are kept in a CanvasColumns used as the
+        items of the manifest, the canvases are serialized from the columns
+        and their objects are built only when they are accessed.
+
+        Args:
+            ids (list): The IDs of the canvases.
+            heights (list): The heights of the canvases.
+            widths (list): The widths of the canvases.
+            labels (list, optional): The labels of the canvases, None for no
+                label. Defaults to None.
+            images (list): The IDs of the images.
+            services (list, optional): The IDs of the image services, None
+                for no service. Defaults to None.
+            annotationpage_ids (list, optional): The IDs of the annotation
+                pages. Defaults to the canvas ID + "/page".
+            annotation_ids (list, optional): The IDs of the annotations.
+                Defaults to the canvas ID + "/page/annotation".
+            image_heights (list, optional): The heights of the images.
+                Defaults to heights.
+            image_widths (list, optional): The widths of the images.
+                Defaults to widths.
+            table (optional): A dict of columns, a pandas DataFrame or an
+                Arrow table with columns named as the arguments above, used
+                for the arguments that are None. Defaults to None.
+            label_language (str, optional): The language of the labels.
+                Defaults to "none".
+            image_format (str, optional): The format of the images.
+                Defaults to "image/jpeg".
+            image_type (str, optional): The type of the images. Defaults to
+                "Image".
+            service_type (str, optional): The type of the services. Defaults
+                to "ImageService3".
+            service_profile (str, optional): The profile of the services.
+                Defaults to "level2".
+            columnar (bool, optional): Keep the columns instead of building
+                the objects, see CanvasColumns. Defaults to False.
+
+        Example:
+            >>> manifest.add_canvases_bulk(
+            ...     ids=["https://example.org/canvas/p1"],
+            ...     heights=[1800], widths=[1200], labels=["p. 1"],
+            ...     images=["https://example.org/p1/full/max/0/default.jpg"],
+            ...     services=["https://example.org/p1"])
+
+        Returns:
+            list: The Canvas objects (the CanvasColumns of the items if
+            columnar is True).
+        """
+        columns = {}
+        for name, values in (("ids", ids),
+                             ("heights", heights),
+                             ("widths", widths),
+                             ("labels", labels),
+                             ("images", images),
+                             ("services", services),
+                             ("annotationpage_ids", annotationpage_ids),
+                             ("annotation_ids", annotation_ids),
+                             ("image_heights", image_heights),
+                             ("image_widths", image_widths)):
+            values = _column(values)
+            if values is None:
+                values = _table_column(table, name)
+            columns[name] = values
+        for name in ("ids", "heights", "widths", "images"):
+            assert columns[name] is not None, "%s are required." % name
+        ids = columns["ids"]
+        n = len(ids)
+        for name, values in columns.items():
+            assert values is None or len(values) == n, \
+                "%s must have %s values like ids." % (name, n)
+        for name, fragment in (("ids", False),
+                               ("images", True),
+                               ("annotationpage_ids", True),
+                               ("annotation_ids", True)):
+            if columns[name] is None:
+                # the defaults are valid if the IDs of the canvases are
+                continue
+            assert _invalid_URI(columns[name], fragment) is None, \
+                "%s[%s] is not a valid URI." % (
+                    name, _invalid_URI(columns[name], fragment))
+        if columns["services"] is not None:
+            services = [s for s in columns["services"] if s is not None]
+            assert _invalid_URI(services) is None, \
+                "%s is not a valid service URI." % (
+                    services[_invalid_URI(services)])
+        for name in ("heights", "widths", "image_heights", "image_widths"):
+            if columns[name] is not None:
+                columns[name] = _positive_integers(columns[name], name)
+        if columns["labels"] is not None:
+            if label_language is None:
+                label_language = "none"
+            assert valid_language(label_language), \
+                "Language must be a valid BCP47 language tag or none."
+            assert set(map(type, columns["labels"])) <= {str, type(None)}, \
+                "labels must be strings or None."
+        # the message is computed again only if the check fails
+        assert check_mediatype(
+            image_format, _setting("MEDIATYPES")) is None, \
+            check_mediatype(image_format, _setting("MEDIATYPES"))
+        assert not image_type[0].isdigit(), \
+            "First letter should not be a digit"
+        options = (label_language, image_format, image_type, service_type,
+                   service_profile)
+
+        if columnar:
+            if not isinstance(self.items, CanvasColumns):
+                self.items = CanvasColumns(
+                    () if unused(self.items) else self.items)
+            self.items._add_columns(columns, options)
+            return self.items
+        canvases = [_bulk_canvas(options, *_bulk_row(columns, i))
+                    for i in range(n)]
+        if unused(self.items):
+            self.items = []
+        self.items.extend(canvases)
+        return canvases
+
 
 class refManifest(_CoreAttributes, _Thumbnail):
     """pseudo-IIIF resource
@@ -2547,11 +4630,14 @@ class refManifest(_CoreAttributes, _Thumbnail):
     the id, type and label properties. They should have the thumbnail property.
 
     """
+
+    __slots__ = ("thumbnail",)
+    _optional = ("navDate",)
+
     def __init__(self):
         super(refManifest, self).__init__()
         self.thumbnail = Recommended("A Manifest reference should have the thumbnail property with at least one item.")
         self.type = "Manifest"
-        self.navDate = None
 
 
 class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
@@ -2575,6 +4661,10 @@ class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
         >>> collection.add_manifest_to_items(manifest_1)
 
     """
+
+    __slots__ = ("services", "annotations", "items")
+    _optional = ("viewingDirection",)
+
     def __init__(self):
         super(Collection, self).__init__()
         self.services = None
@@ -2588,7 +4678,6 @@ class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
         self.items = Required(
             "A collection object must have at least one item!")
         self.metadata = Recommended("A Collection should have the metadata property with at least one item.")
-        self.viewingDirection = None
 
     def add_annotation(self, annotationobj):
         warnings.warn('Please use `add_annotationpage_to_annotations` instead.', DeprecationWarning)
@@ -2670,14 +4759,15 @@ class Range(_CMRCattributes, _ViewingDirection, _Start):
         >>> r1.add_label('gez',"Tabiba Tabiban [ጠቢበ ጠቢባን]")
 
     """
+
+    __slots__ = ("annotations", "items")
+    _optional = ("supplementary", "viewingDirection", "start")
+
     def __init__(self):
         super(Range, self).__init__()
         self.annotations = None
         self.items = Required("A range object must have at least one item!")
-        self.supplementary = None
         self.label = Recommended("A Range should have the label property with at least one entry")
-        self.viewingDirection = None
-        self.start = None
 
     def add_annotation(self, annotationobj=None):
         warnings.warn('Please use `add_annotationpage_to_annotations` instead.', DeprecationWarning)
@@ -2784,10 +4874,13 @@ class SpecificResource(_CommonAttributes):
 
     https://www.w3.org/TR/annotation-model/#specific-resources
     """
+
+    __slots__ = ()
+    _optional = ("source", "selector")
+
     def __init__(self):
         super(SpecificResource, self).__init__()
         self.id = Recommended("An ID is recommended.")
-        self.source = None
 
     def set_source(self, source, extendbase_url=None):
         """Set the source of the SpecificResource
@@ -2834,7 +4927,7 @@ class SpecificResource(_CommonAttributes):
         return ss
 
 
-class ImageApiSelector(_Format, _ImmutableType):
+class ImageApiSelector(_Format, _ImmutableType, _Cacheable):
     """IIIF Resource
 
     https://iiif.io/api/annex/openannotation/#iiif-image-api-selector
@@ -2848,6 +4941,10 @@ class ImageApiSelector(_Format, _ImmutableType):
     which must be put into the requested URI to obtain the appropriate
     representation.
     """
+
+    __slots__ = ("type", "region", "size", "rotation", "quality", "fromat",
+                 "format")
+
     def __init__(self):
         self.type = "ImageApiSelector"
         self.region = None
@@ -2855,6 +4952,7 @@ class ImageApiSelector(_Format, _ImmutableType):
         self.rotation = None
         self.quality = None
         self.fromat = None
+        self._fragments = None
 
     def set_region(self, region):
         """Set the region of the image API selector.
@@ -2889,7 +4987,7 @@ class ImageApiSelector(_Format, _ImmutableType):
         self.size = size
 
 
-class PointSelector(_ImmutableType):
+class PointSelector(_ImmutableType, _Cacheable):
     """
 
     https://iiif.io/api/annex/openannotation/#point-selector
@@ -2918,11 +5016,14 @@ class PointSelector(_ImmutableType):
         relative to the duration of the target resource
     """
 
+    __slots__ = ("type", "x", "y", "t")
+
     def __init__(self):
         self.type = "PointSelector"
         self.x = None
         self.y = None
         self.t = None
+        self._fragments = None
 
     def set_x(self, x):
         """Set the x coordinate.
@@ -2949,7 +5050,7 @@ class PointSelector(_ImmutableType):
         self.t = t
 
 
-class FragmentSelector(_ImmutableType):
+class FragmentSelector(_ImmutableType, _Cacheable):
     """
     W3C: As the most well understood mechanism for selecting a Segment is to
     use the fragment part of an IRI defined by the representation's media type,
@@ -2958,9 +5059,13 @@ class FragmentSelector(_ImmutableType):
     https://www.w3.org/TR/annotation-model/#fragment-selector
 
     """
+
+    __slots__ = ("type", "value")
+
     def __init__(self):
         self.type = "FragmentSelector"
         self.value = Required("A fragment selector must have a value!")
+        self._fragments = None
 
     def set_value(self, value):
         """Set the value of the FragmentSelector
@@ -2982,13 +5087,17 @@ class FragmentSelector(_ImmutableType):
         self.value = "xywh=%i,%i,%i,%i" % (x, y, w, h)
 
 
-class SvgSelector(_ImmutableType):
+class SvgSelector(_ImmutableType, _Cacheable):
     """The SvgSelector is used to select a non rectangualar region of an image.
     https://www.w3.org/TR/annotation-model/#svg-selector
     """
+
+    __slots__ = ("type", "value")
+
     def __init__(self):
         self.type = "SvgSelector"
         self.value = None
+        self._fragments = None
 
     def set_value(self, value):
         """Set the value of the SVG Selector
@@ -0,0 +1,509 @@
+"""Registries of the accepted values used for validating IIIF objects.
+
+The registries behave like the plain lists and dicts they replace (they can be
+iterated, indexed and extended by the user) but keep an index that makes the
+membership test used by the ``set_`` and ``add_`` methods fast.
+
+The IANA tables are shipped as packed string tables in ``IIIFpres/data`` and
+are loaded on first use. A table is memory mapped and searched with a binary
+search, hence the thousands of tags are not turned into Python objects and
+the pages of the file are shared by all the processes using pyIIIFpres.
+
+Example:
+    >>> from IIIFpres import iiifpapi3
+    >>> "it" in iiifpapi3.LANGUAGES
+    True
+    >>> iiifpapi3.LANGUAGES.append("de-DE-u-co-phonebk")
+    >>> iiifpapi3.MEDIATYPES.is_registered("image/jpeg")
+    True
+"""
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping, MutableSequence, Sequence
+import array
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# the number of unknown tags memoized by a LanguageRegistry, as the cache of
+# BCP47_parser.parse_tag
+MISSING_CACHE_SIZE = 1024
+
+_MAGIC = b"IIIFSTR1"
+# magic number and number of strings
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+
+
+def write_string_table(path, strings):
+    """Write a packed string table that can be read with StringTable.
+
+    The file contains a header, the offsets of the strings and the UTF-8
+    encoded strings sorted and without duplicates.
+
+    Example:
+        >>> from IIIFpres import registries
+        >>> tags = list(registries.load_language_tags()) + ["tlh"]
+        >>> registries.write_string_table("languages.bin", tags)
+
+    Args:
+        path (str): The path of the file.
+        strings (iterable of str): The strings of the table.
+    """
+    encoded = sorted(set(s.encode("utf-8") for s in strings))
+    offsets = [0]
+    for string in encoded:
+        offsets.append(offsets[-1] + len(string))
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(encoded)))
+        f.write(struct.pack("<%sI" % len(offsets), *offsets))
+        f.write(b"".join(encoded))
+
+
+class StringTable(Sequence):
+    """A read-only sorted sequence of strings backed by a packed file.
+
+    The file is memory mapped and the strings are decoded only when they are
+    accessed. Membership is tested with a binary search.
+
+    Args:
+        path (str): The path of a file written by write_string_table.
+
+    Raises:
+        ValueError: If the file is not a packed string table.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._length = _HEADER.unpack_from(self._buffer)
+        if magic != _MAGIC:
+            raise ValueError("%s is not a packed string table." % path)
+        self._strings = _HEADER.size + _OFFSET.size * (self._length + 1)
+        # the offsets are read in place, they are stored as little endian
+        self._offsets = memoryview(self._buffer)[
+            _HEADER.size:self._strings].cast("I")
+        if sys.byteorder != "little":
+            self._offsets = array.array("I", self._offsets)
+            self._offsets.byteswap()
+
+    def _bytes(self, position):
+        strings = self._strings
+        return self._buffer[strings + self._offsets[position]:
+                            strings + self._offsets[position + 1]]
+
+    def _bisect(self, key):
+        buffer, offsets, strings = self._buffer, self._offsets, self._strings
+        lo, hi = 0, self._length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if buffer[strings + offsets[mid]:strings + offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._length))]
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("StringTable index out of range")
+        return self._bytes(position).decode("utf-8")
+
+    def __contains__(self, string):
+        if not isinstance(string, str):
+            return False
+        key = string.encode("utf-8")
+        position = self._bisect(key)
+        return position < self._length and self._bytes(position) == key
+
+    def __repr__(self):
+        return "StringTable(%s strings)" % self._length
+
+    def bounds(self, prefix):
+        """Return the range of the positions of the strings with a prefix.
+
+        Args:
+            prefix (str): The prefix e.g. image/.
+
+        Returns:
+            tuple: The first position and the position after the last one.
+        """
+        key = prefix.encode("utf-8")
+        # 0xff never occurs in UTF-8 hence it sorts after every continuation
+        return self._bisect(key), self._bisect(key + b"\xff")
+
+
+def load_language_tags():
+    """Load the IANA language subtags.
+
+    Returns:
+        StringTable: The sorted language subtags e.g. ['aa', 'aaa', ...].
+    """
+    return StringTable(os.path.join(DATA_DIR, "languages.bin"))
+
+
+def load_media_types():
+    """Load the IANA media types.
+
+    Returns:
+        StringTable: The sorted media types e.g. ['application/1d-...', ...].
+    """
+    return StringTable(os.path.join(DATA_DIR, "mediatypes.bin"))
+
+
+class LanguageRegistry(MutableSequence):
+    """A list of BCP47 language tags with a hash index for membership tests.
+
+    The registry keeps the order of the tags as a list does, so that the
+    documented ``iiifpapi3.LANGUAGES.append("de-DE-u-co-phonebk")`` keeps
+    working, while ``tag in registry`` is answered by a set lookup instead of a
+    scan of the ~8000 IANA subtags.
+
+    If a loader is passed it is called on first use and the sorted table it
+    returns is searched with a binary search. The result of the search is
+    memoized (the last MISSING_CACHE_SIZE unknown tags, hence validating user
+    input does not grow the registry) and the appended tags are stored next
+    to the table, the table is copied to a list only if the tags are modified
+    by position.
+
+    Args:
+        tags (iterable of str, optional): The initial tags. Defaults to None.
+        loader (callable, optional): A function returning a sorted sequence
+            of tags, called on first use. Defaults to None.
+    """
+
+    def __init__(self, tags=None, loader=None):
+        self._loader = loader
+        self._table = None
+        self._tags = [] if tags is None else list(tags)
+        self._index = set(self._tags)
+        # the tags searched in the table and not found, least recent first
+        self._missing = OrderedDict()
+
+    def _load(self):
+        loader, self._loader = self._loader, None
+        self._table = loader()
+
+    def _materialize(self):
+        if self._loader is not None:
+            self._load()
+        if self._table is not None:
+            self._tags = list(self._table) + self._tags
+            self._index = set(self._tags)
+            self._table = None
+
+    @property
+    def loaded(self):
+        """bool: False until the loader of the registry has been called."""
+        return self._loader is None
+
+    def __contains__(self, tag):
+        if tag in self._index:
+            return True
+        if self._loader is not None:
+            self._load()
+        if self._table is None:
+            return False
+        missing = self._missing
+        if tag in missing:
+            missing.move_to_end(tag)
+            return False
+        if tag in self._table:
+            self._index.add(tag)
+            return True
+        missing[tag] = None
+        if len(missing) > MISSING_CACHE_SIZE:
+            missing.popitem(last=False)
+        return False
+
+    def __getitem__(self, position):
+        self._materialize()
+        return self._tags[position]
+
+    def __setitem__(self, position, tag):
+        self._materialize()
+        self._tags[position] = tag
+        # a slice or a duplicated tag can remove more than one entry
+        self._index = set(self._tags)
+
+    def __delitem__(self, position):
+        self._materialize()
+        del self._tags[position]
+        self._index = set(self._tags)
+
+    def __len__(self):
+        if self._loader is not None:
+            self._load()
+        if self._table is None:
+            return len(self._tags)
+        return len(self._table) + len(self._tags)
+
+    def __iter__(self):
+        if self._loader is not None:
+            self._load()
+        if self._table is None:
+            return iter(self._tags)
+        return itertools.chain(self._table, self._tags)
+
+    def __eq__(self, other):
+        if isinstance(other, LanguageRegistry):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self):
+        if self._loader is not None:
+            return "LanguageRegistry(not loaded)"
+        return "LanguageRegistry(%s tags)" % len(self)
+
+    def insert(self, position, tag):
+        self._materialize()
+        self._tags.insert(position, tag)
+        self._index.add(tag)
+
+    def append(self, tag):
+        self._tags.append(tag)
+        self._index.add(tag)
+        self._missing.pop(tag, None)
+
+    def extend(self, tags):
+        tags = list(tags)
+        self._tags.extend(tags)
+        self._index.update(tags)
+        for tag in tags:
+            self._missing.pop(tag, None)
+
+
+class _MediaTypeList(list):
+    """HELPER CLASS
+
+    A list of media types of a top-level type (e.g. image) that invalidates the
+    index of its MediaTypeRegistry when it is modified.
+    """
+
+    def __init__(self, registry, mediatypes=()):
+        super(_MediaTypeList, self).__init__(mediatypes)
+        self._registry = registry
+
+    def _modified(self):
+        self._registry._invalidate()
+
+    def __setitem__(self, position, mediatype):
+        super(_MediaTypeList, self).__setitem__(position, mediatype)
+        self._modified()
+
+    def __delitem__(self, position):
+        super(_MediaTypeList, self).__delitem__(position)
+        self._modified()
+
+    def __iadd__(self, mediatypes):
+        result = super(_MediaTypeList, self).__iadd__(mediatypes)
+        self._modified()
+        return result
+
+    def append(self, mediatype):
+        super(_MediaTypeList, self).append(mediatype)
+        self._modified()
+
+    def extend(self, mediatypes):
+        super(_MediaTypeList, self).extend(mediatypes)
+        self._modified()
+
+    def insert(self, position, mediatype):
+        super(_MediaTypeList, self).insert(position, mediatype)
+        self._modified()
+
+    def remove(self, mediatype):
+        super(_MediaTypeList, self).remove(mediatype)
+        self._modified()
+
+    def pop(self, position=-1):
+        mediatype = super(_MediaTypeList, self).pop(position)
+        self._modified()
+        return mediatype
+
+    def clear(self):
+        super(_MediaTypeList, self).clear()
+        self._modified()
+
+
+class MediaTypeRegistry(MutableMapping):
+    """The IANA media types grouped by top-level type with a set index.
+
+    The registry can be used as the ``dict`` of lists it replaces, e.g.
+    ``MEDIATYPES['image'].append('image/myformat')``. Every change to the
+    registry invalidates the index, which is rebuilt on the next lookup.
+
+    The formats that pass :meth:`check` are memoized, hence setting the same
+    format on thousands of resources costs a single set lookup.
+
+    If a loader is passed it is called on first use. The loader can return
+    a dict or a sorted table of media types (see StringTable), in the latter
+    case the list of a top-level type is built only when it is accessed.
+
+    Args:
+        mediatypes (dict, optional): A dict mapping the top-level types to
+            the list of their media types. Defaults to None.
+        loader (callable, optional): A function returning the initial dict
+            or table, called on first use. Defaults to None.
+    """
+
+    def __init__(self, mediatypes=None, loader=None):
+        self._loader = loader
+        self._table = None
+        # the top-level types still in the table are mapped to None
+        self._types = {}
+        self._index = None
+        self._valid = set()
+        if mediatypes is not None:
+            self.update(mediatypes)
+
+    def _load(self):
+        loader, self._loader = self._loader, None
+        mediatypes = loader()
+        if isinstance(mediatypes, Mapping):
+            self.update(mediatypes)
+            return
+        self._table = mediatypes
+        position = 0
+        while position < len(mediatypes):
+            toplevel = mediatypes[position].partition("/")[0]
+            self._types.setdefault(toplevel, None)
+            position = mediatypes.bounds(toplevel + "/")[1]
+
+    @property
+    def loaded(self):
+        """bool: False until the loader of the registry has been called."""
+        return self._loader is None
+
+    def _invalidate(self):
+        self._index = None
+        self._valid.clear()
+
+    def __getitem__(self, toplevel):
+        if self._loader is not None:
+            self._load()
+        mediatypes = self._types[toplevel]
+        if mediatypes is None:
+            lo, hi = self._table.bounds(toplevel + "/")
+            mediatypes = _MediaTypeList(self, self._table[lo:hi])
+            self._types[toplevel] = mediatypes
+            self._index = None
+        return mediatypes
+
+    def __setitem__(self, toplevel, mediatypes):
+        if self._loader is not None:
+            self._load()
+        self._types[toplevel] = _MediaTypeList(self, mediatypes)
+        self._invalidate()
+
+    def __delitem__(self, toplevel):
+        if self._loader is not None:
+            self._load()
+        del self._types[toplevel]
+        self._invalidate()
+
+    def __iter__(self):
+        if self._loader is not None:
+            self._load()
+        return iter(self._types)
+
+    def __len__(self):
+        if self._loader is not None:
+            self._load()
+        return len(self._types)
+
+    def __repr__(self):
+        if self._loader is not None:
+            return "MediaTypeRegistry(not loaded)"
+        counts = []
+        for toplevel, mediatypes in self._types.items():
+            if mediatypes is None:
+                lo, hi = self._table.bounds(toplevel + "/")
+                counts.append("%s: %s" % (toplevel, hi - lo))
+            else:
+                counts.append("%s: %s" % (toplevel, len(mediatypes)))
+        return "MediaTypeRegistry(%s)" % ", ".join(counts)
+
+    def is_registered(self, mediatype):
+        """Check if the media type is in one of the lists of the registry.
+
+        Args:
+            mediatype (str): The media type e.g. image/jpeg.
+
+        Returns:
+            bool: True if the media type is registered.
+        """
+        if self._loader is not None:
+            self._load()
+        if self._index is None:
+            self._index = frozenset(
+                m for mediatypes in self._types.values()
+                if mediatypes is not None for m in mediatypes)
+        if mediatype in self._index:
+            return True
+        toplevel = mediatype.partition("/")[0]
+        return (toplevel in self._types and self._types[toplevel] is None
+                and mediatype in self._table)
+
+    def check(self, mediatype):
+        """Check that the media type is valid for the format property.
+
+        Args:
+            mediatype (str): The media type e.g. image/jpeg.
+
+        Returns:
+            str: None if the media type is valid otherwise the reason why it
+            is not.
+        """
+        if mediatype in self._valid:
+            return None
+        error = _mediatype_form(mediatype)
+        if error is not None:
+            return error
+        if not self.is_registered(mediatype):
+            return "Not a IANA valid media type."
+        self._valid.add(mediatype)
+        return None
+
+
+def _mediatype_form(mediatype):
+    """Return why the media type is malformed, None if it is not."""
+    toplevel, slash, _ = mediatype.partition("/")
+    if not slash or not toplevel.isalpha():
+        return "Format should be in the form type/format e.g. image/jpeg"
+    if mediatype == 'image/jpg':
+        return "Correct media type for jpeg should be image/jpeg not image/jpg"
+    if mediatype == 'image/tif':
+        return "Correct media type  for tiff should be image/tiff"
+    return None
+
+
+def check_mediatype(mediatype, mediatypes):
+    """Check a media type against a registry or a plain dict of lists.
+
+    iiifpapi3.MEDIATYPES can be reassigned to a plain dict (e.g.
+    ``{"image": ["image/jpeg"]}``), in that case its lists are scanned.
+
+    Args:
+        mediatype (str): The media type e.g. image/jpeg.
+        mediatypes (MediaTypeRegistry,dict): The accepted media types.
+
+    Returns:
+        str: None if the media type is valid otherwise the reason why it
+        is not.
+    """
+    if isinstance(mediatypes, MediaTypeRegistry):
+        return mediatypes.check(mediatype)
+    error = _mediatype_form(mediatype)
+    if error is None and not any(
+            mediatype in sl for sl in mediatypes.values()):
+        return "Not a IANA valid media type."
+    return error
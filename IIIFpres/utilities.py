@@ -1,7 +1,27 @@
 from . import iiifpapi3
+from collections.abc import MutableSequence
 import json
 
 
+def _is_iiif_object(obj):
+    if isinstance(obj, MutableSequence):
+        # e.g. the CanvasColumns of Manifest.items
+        return False
+    return bool(iiifpapi3.propertynames(obj.__class__)) or hasattr(obj, "__dict__")
+
+
+def _indexed_items(obj, id):
+    """Return the (index, item) pairs of a list walked looking for id, the
+    last first so that the items can be deleted while walking.
+
+    The rows of a CanvasColumns (see Manifest.add_canvases_bulk) are built
+    only if they contain id.
+    """
+    if isinstance(obj, iiifpapi3.CanvasColumns):
+        return reversed(obj._with_id(id))
+    return reversed(list(enumerate(obj)))
+
+
 def modify_API3_json(path):
     """Modify an IIIF json file complaint with API 3.0
     This method parse only the frist level of the IIIF object. All the nested
@@ -18,12 +38,15 @@ def modify_API3_json(path):
     with open(path) as f:
         t = json.load(f)
     t.pop('@context')
-    entitydict = {'Manifest': iiifpapi3.Manifest(),
-                  'Collection': iiifpapi3.Collection()}
+    entitydict = {'Manifest': iiifpapi3.Manifest,
+                  'Collection': iiifpapi3.Collection}
     assert t['type'] in entitydict.keys(), "%s not a valid IIF object" % t['type']
-    newobj = entitydict[t['type']]
-    # TODO: find better solution .update will cause height and width to be set R.
-    newobj.__dict__ = t
+    newobj = entitydict[t['type']]()
+    # the object must have only the properties of the JSON
+    for key in iiifpapi3.attributes(newobj):
+        delattr(newobj, key)
+    for key, value in t.items():
+        setattr(newobj, key, value)
     return newobj
 
 
@@ -77,8 +100,8 @@ def read_API3_json_dict(jsondict, extensions=None, save_context=False):
         else:
             newobj = entitydict[obj['type']]()
         # TODO: find better solution .update will cause height and width to be set R.
-        # newobj.__dict__ = newobj works apparently with no problem
-        newobj.__dict__.update(obj)
+        for key, value in obj.items():
+            setattr(newobj, key, value)
         # Specific cases
         if obj['type'] == 'Canvas':
             if newobj.duration is not None:
@@ -132,17 +155,17 @@ def delete_object_byID(obj, id):
     Returns:
         True: if the ID was found.
     """
-    if hasattr(obj, "__dict__"):
-        obj = obj.__dict__
+    if _is_iiif_object(obj):
+        obj = iiifpapi3.attributes(obj)
     if isinstance(obj, dict):
         for key, value in obj.items():
             if key == 'id' and value == id:
                 return True
             delete_object_byID(value, id)
-    if isinstance(obj, list):
-        for item in obj:
+    if isinstance(obj, MutableSequence):
+        for index, item in _indexed_items(obj, id):
             if delete_object_byID(item, id):
-                obj.remove(item)
+                del obj[index]
     else:
         pass
 
@@ -161,18 +184,18 @@ def remove_and_insert_new(obj, id, newobj):
     """
     def remove_and_insert_new_rec(obj, id, newobj):
         nonlocal counter
-        if hasattr(obj, "__dict__"):
-            obj = obj.__dict__
+        if _is_iiif_object(obj):
+            obj = iiifpapi3.attributes(obj)
         if isinstance(obj, dict):
             for key, value in obj.items():
                 if key == 'id' and value == id:
                     counter += 1
                     return True
                 remove_and_insert_new_rec(value, id, newobj)
-        if isinstance(obj, list):
-            for item in obj:
+        if isinstance(obj, MutableSequence):
+            for index, item in _indexed_items(obj, id):
                 if remove_and_insert_new_rec(item, id, newobj):
-                    obj.remove(item)
+                    del obj[index]
                     obj.append(newobj)
         else:
             pass
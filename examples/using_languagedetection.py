@@ -30,7 +30,7 @@ def check_languages(IIIFObj):
             obj (dict): Language map dict
         """
         if isinstance(obj,iiifpapi3.languagemap):
-            obj = obj.__dict__
+            obj = iiifpapi3.attributes(obj)
 
         for lang in obj['label']:
             for value in obj['label'][lang]:
@@ -13,6 +13,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/giacomomarchioro/pyIIIFpres",
     packages=setuptools.find_packages(),
+    package_data={"IIIFpres": ["data/*.bin"]},
     license="MIT",
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,34 @@
+# Measure the time needed by each installed backend of IIIFpres.backends for
+# serializing the manifests built by the benchmark scripts of this folder.
+# Run from the root of the repository:
+# python tests/performance/backends_time.py
+import os
+import sys
+from subprocess import run
+
+folder = os.path.dirname(os.path.abspath(__file__))
+scripts = ["2000_canvas_2000_annotations.py",
+           "4000_canvas_40000_annotations.py"]
+
+backends_code = """
+import runpy
+import timeit
+from IIIFpres import backends
+repeat = 5
+manifest = runpy.run_path(%r, run_name="benchmark")["manifest"]
+print(%r)
+for name in backends.BACKENDS:
+    if not backends.BACKENDS[name].available():
+        print("  %%s: not installed" %% name)
+        continue
+    for compact in (False, True):
+        best = min(timeit.repeat(
+            lambda: manifest.dumps(backend=name, compact=compact),
+            number=1, repeat=repeat))
+        print("  %%s%%s: %%.3f s (best of %%s)" %% (
+            name, " compact" if compact else "", best, repeat))
+"""
+
+for script in scripts:
+    path = os.path.join(folder, script)
+    run([sys.executable, "-c", backends_code % (path, script)], check=True)
@@ -0,0 +1,51 @@
+# Measure the time needed by batch.build_all for saving a manifest per
+# record, in this process and in a pool of processes.
+# Run from the root of the repository:
+# python tests/performance/batch_time.py
+import os
+import tempfile
+import time
+from IIIFpres import batch, iiifpapi3
+
+records = [(n, 200) for n in range(400)]
+settings = {"base_url": "https://example.org/iiif/"}
+
+
+def build(record):
+    n, pages = record
+    manifest = iiifpapi3.Manifest()
+    manifest.set_id(extendbase_url="book%s/manifest" % n)
+    manifest.add_label("it", "Manoscritto %s" % n)
+    for idx in range(1, pages + 1):
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id(extendbase_url="book%s/canvas/p%s" % (n, idx))
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id(extendbase_url="book%s/page/p%s/1" % (n, idx))
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id(extendbase_url="book%s/annotation/p%s" % (n, idx))
+        annotation.set_motivation("painting")
+        annotation.body.set_id(
+            "https://example.org/iiif/book%s/page%s.jpg" % (n, idx))
+        annotation.body.set_type("Image")
+        annotation.body.set_format("image/jpeg")
+    return manifest
+
+
+if __name__ == "__main__":
+    print("%s manifests of %s canvases, %s CPUs" % (
+        len(records), records[0][1], os.cpu_count()))
+    for workers in (0, None):
+        with tempfile.TemporaryDirectory() as out_dir:
+            t0 = time.perf_counter()
+            reports = batch.build_all(records, build, out_dir,
+                                      workers=workers, chunk_size=16,
+                                      settings=settings,
+                                      save_options={"compact": True})
+            elapsed = time.perf_counter() - t0
+        assert not [report for report in reports if report.error]
+        print("workers=%s: %.2f s (build %.2f s, save %.2f s)" % (
+            workers, elapsed,
+            sum(report.build_seconds for report in reports),
+            sum(report.save_seconds for report in reports)))
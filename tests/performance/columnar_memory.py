@@ -0,0 +1,46 @@
+# Measure the memory used by a manifest of 40000 canvases built by
+# add_canvases_bulk with and without columnar, and the time needed for
+# building and serializing it.
+# Run from the root of the repository:
+# python tests/performance/columnar_memory.py
+import sys
+from subprocess import PIPE, run
+
+build_code = """
+import sys
+import time
+import tracemalloc
+from IIIFpres import iiifpapi3
+iiifpapi3.valid_language("en")
+iiifpapi3.MEDIATYPES.check("image/jpeg")
+n = 40000
+base = "https://example.org/iiif/book1/"
+columns = {
+    "ids": [base + "canvas/p%s" % i for i in range(n)],
+    "heights": [2000] * n,
+    "widths": [1500] * n,
+    "labels": ["p. %s" % i for i in range(n)],
+    "images": [base + "p%s/full/max/0/default.jpg" % i for i in range(n)],
+    "services": [base + "p%s" % i for i in range(n)],
+}
+tracemalloc.start()
+t0 = time.perf_counter()
+manifest = iiifpapi3.Manifest()
+manifest.set_id(base + "manifest")
+manifest.add_label("en", "Book 1")
+manifest.add_canvases_bulk(columnar=sys.argv[1] == "True", **columns)
+t1 = time.perf_counter()
+current = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+t2 = time.perf_counter()
+manifest.json_dumps()
+t3 = time.perf_counter()
+print(current / 2**20, t1 - t0, t3 - t2)
+"""
+
+for columnar in (False, True):
+    result = run([sys.executable, "-c", build_code, str(columnar)],
+                 stdout=PIPE, universal_newlines=True, check=True)
+    memory, build, dumps = map(float, result.stdout.split())
+    print("columnar=%s: %.1f MB, built in %.2f s, json_dumps in %.2f s" % (
+        columnar, memory, build, dumps))
@@ -0,0 +1,35 @@
+# Measure the time needed for importing iiifpapi3 in a fresh interpreter and
+# the time needed for the first language and format check (which loads the
+# IANA tables).
+# Run from the root of the repository:
+# python tests/performance/import_time.py
+import statistics
+import sys
+from subprocess import PIPE, run
+
+repeat = 20
+
+import_code = """
+import time
+t0 = time.perf_counter()
+from IIIFpres import iiifpapi3
+t1 = time.perf_counter()
+iiifpapi3.valid_language("it")
+iiifpapi3.MEDIATYPES.check("image/jpeg")
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+imports = []
+first_uses = []
+for i in range(repeat):
+    result = run([sys.executable, "-c", import_code], stdout=PIPE,
+                 universal_newlines=True, check=True)
+    import_time, first_use = result.stdout.split()
+    imports.append(float(import_time))
+    first_uses.append(float(first_use))
+
+print("import IIIFpres.iiifpapi3: %.1f ms (median of %s)" % (
+    statistics.median(imports) * 1000, repeat))
+print("first language and format check: %.1f ms (median of %s)" % (
+    statistics.median(first_uses) * 1000, repeat))
@@ -0,0 +1,40 @@
+# Measure the memory used by the manifest built by
+# 4000_canvas_40000_annotations.py and the time needed for building it.
+# Run from the root of the repository:
+# python tests/performance/memory_usage.py
+import os
+import sys
+from subprocess import PIPE, run
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "4000_canvas_40000_annotations.py")
+
+build_code = """
+import runpy
+import sys
+import time
+import tracemalloc
+from IIIFpres import iiifpapi3
+iiifpapi3.valid_language("en")
+iiifpapi3.MEDIATYPES.check("image/jpeg")
+trace = len(sys.argv) > 1
+if trace:
+    tracemalloc.start()
+t0 = time.perf_counter()
+namespace = runpy.run_path(%r, run_name="benchmark")
+t1 = time.perf_counter()
+if trace:
+    current, peak = tracemalloc.get_traced_memory()
+    print(current / 2**20, peak / 2**20)
+else:
+    print(t1 - t0)
+""" % script
+
+result = run([sys.executable, "-c", build_code], stdout=PIPE,
+             universal_newlines=True, check=True)
+print("build time: %.2f s" % float(result.stdout))
+result = run([sys.executable, "-c", build_code, "trace"], stdout=PIPE,
+             universal_newlines=True, check=True)
+current, peak = result.stdout.split()
+print("memory of the manifest: %.1f MB (peak %.1f MB)" % (float(current),
+                                                         float(peak)))
@@ -0,0 +1,38 @@
+# Measure the time and the peak memory needed for serializing the manifest
+# built by 4000_canvas_40000_annotations.py with json_dumps and orjson_dumps.
+# Run from the root of the repository:
+# python tests/performance/serialization_time.py
+import os
+import sys
+from subprocess import run
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "4000_canvas_40000_annotations.py")
+
+dumps_code = """
+import runpy
+import timeit
+import tracemalloc
+repeat = 5
+manifest = runpy.run_path(%r, run_name="benchmark")["manifest"]
+tests = [("json_dumps", manifest.json_dumps),
+         ("json_dumps(dumps_errors=True)",
+          lambda: manifest.json_dumps(dumps_errors=True))]
+try:
+    import orjson
+    tests.append(("orjson_dumps", manifest.orjson_dumps))
+    tests.append(("orjson_dumps(as_bytes=True)",
+                  lambda: manifest.orjson_dumps(as_bytes=True)))
+except ImportError:
+    pass
+for name, function in tests:
+    best = min(timeit.repeat(function, number=1, repeat=repeat))
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%%s: %%.3f s (best of %%s), peak memory %%.1f MB" %% (
+        name, best, repeat, peak / 2**20))
+""" % script
+
+run([sys.executable, "-c", dumps_code], check=True)
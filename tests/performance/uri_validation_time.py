@@ -0,0 +1,40 @@
+# Measure the time needed for validating IDs of typical length with
+# check_valid_URI and set_id, compared with the per character loop used
+# before the compiled regular expression.
+# Run from the root of the repository:
+# python tests/performance/uri_validation_time.py
+import timeit
+from IIIFpres import iiifpapi3
+
+repeat = 5
+number = 20000
+
+ids = {
+    "short": "https://example.org/iiif/1",
+    "typical": "https://example.org/iiif/book1/canvas/p1234",
+    "image": "https://iiif.example.org/iiif/3/book1%2Fpage1234.jp2"
+             "/full/max/0/default.jpg",
+    "long": "https://example.org/iiif/" + "/".join(["segment"] * 30),
+}
+
+
+def per_character(URI):
+    URI = URI.replace("https:/", "", 1)
+    URI = URI.replace("http:/", "", 1)
+    isvalid = True
+    for carat in URI:
+        if carat in iiifpapi3.INVALID_URI_CHARACTERS:
+            isvalid = False
+    return isvalid
+
+
+canvas = iiifpapi3.Canvas()
+for name, uri in ids.items():
+    results = []
+    for function in (per_character, iiifpapi3.check_valid_URI,
+                     canvas.set_id):
+        seconds = min(timeit.repeat(lambda: function(uri), repeat=repeat,
+                                    number=number))
+        results.append(seconds / number * 1e6)
+    print("%-8s %3s chars: per character %.2f us, check_valid_URI %.2f us, "
+          "set_id %.2f us" % ((name, len(uri)) + tuple(results)))
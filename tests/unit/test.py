@@ -1,11 +1,26 @@
 import unittest
 import json
-from IIIFpres import iiifpapi3
+from IIIFpres import iiifpapi3, extensions
 from IIIFpres.iiifpapi3 import Required, Recommended
+from IIIFpres.registries import LanguageRegistry, MediaTypeRegistry
+from IIIFpres import registries
+from IIIFpres import BCP47_parser
+from IIIFpres import backends
+from IIIFpres import compressors
+from IIIFpres import batch
+from IIIFpres import utilities
 
 # for print statements
 import io
 import unittest.mock
+import os
+import tempfile
+import copy
+import functools
+import pickle
+import warnings
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestEmptyManifest(unittest.TestCase):
@@ -102,7 +117,8 @@ class TestEmptyManifest(unittest.TestCase):
         with unittest.mock.patch("IIIFpres.iiifpapi3.open", open_mock, create=True):
             self.manifest.orjson_save("errortest.json", save_errors=True)
         data = '{\n  "@context": "http://iiif.io/api/presentation/3/context.json",\n  "id": {\n    "Required": "A Manifest must have the ID property."\n  },\n  "type": "Manifest",\n  "label": {\n    "Required": "A Manifest must have the label property with at least one entry."\n  },\n  "metadata": {\n    "Recommended": "A Manifest should have the metadata property with at least one item."\n  },\n  "summary": {\n    "Recommended": "A Manifest should have the summary property with at least one entry."\n  },\n  "thumbnail": {\n    "Recommended": "A Manifest should have the thumbnail property with at least one item."\n  },\n  "provider": {\n    "Recommended": "A Manifest should have the provider property with at least one item."\n  },\n  "items": {\n    "Required": "The Manifest must have an items property with at least one item"\n  }\n}'
-        open_mock.return_value.write.assert_called_once_with(data)
+        open_mock.return_value.write.assert_called_once_with(
+            data.encode("utf-8"))
 
     def test_type_is_immutable(self):
         """Test that we can not change the type of a IIIF object with immutable
@@ -975,7 +991,8 @@ class Test_repr_and_print(unittest.TestCase):
 
     def test_check_invalid_URI(self):
         """Check that a space is detected."""
-        self.assertFalse(iiifpapi3.check_valid_URI("https:/test "))
+        with self.assertWarns(UserWarning):
+            self.assertFalse(iiifpapi3.check_valid_URI("https:/test "))
 
     def test_recommended(self):
         t = "teststring12312=)123123'''òò"
@@ -989,20 +1006,1660 @@ class Test_repr_and_print(unittest.TestCase):
 
     def test_check_invalid_URI(self):
         """Check that a space is detected."""
-        self.assertFalse(iiifpapi3.check_valid_URI("https:/test "))
+        with self.assertWarns(UserWarning):
+            self.assertFalse(iiifpapi3.check_valid_URI("https:/test "))
 
     @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
-    def assert_stdout(self, n, expected_output, mock_stdout):
-        iiifpapi3.check_valid_URI(n)
-        self.assertEqual(mock_stdout.getvalue(), expected_output)
+    def assert_warning(self, n, expected_output, mock_stdout):
+        with self.assertWarns(UserWarning) as warning:
+            iiifpapi3.check_valid_URI(n)
+        self.assertEqual(str(warning.warning), expected_output)
+        self.assertEqual(mock_stdout.getvalue(), "")
 
     def test_only_numbers(self):
-        correct = "I found: a space here. \ntest \n    ^\n"
-        self.assert_stdout("https:/test ", correct)
+        correct = "I found: a space here.\ntest \n    ^"
+        self.assert_warning("https:/test ", correct)
+
+    def test_several_characters(self):
+        correct = "I found: <, >, a space here.\n/example.org/<p1> a\n" \
+                  "             ^  ^^"
+        self.assert_warning("https://example.org/<p1> a", correct)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertTrue(iiifpapi3.check_valid_URI(
+                "https://example.org/iiif/book1/canvas/p1"))
+
+    def test_check_ID_message(self):
+        canvas = iiifpapi3.Canvas()
+        with self.assertRaisesRegex(AssertionError, "a space"):
+            canvas.set_id("https://example.org/canvas p1")
+
+    def test_modified_invalid_characters(self):
+        characters = iiifpapi3.INVALID_URI_CHARACTERS
+        try:
+            iiifpapi3.INVALID_URI_CHARACTERS = characters.replace("(", "")
+            self.assertIsNone(iiifpapi3._URI_error("https://example.org/("))
+            iiifpapi3.INVALID_URI_CHARACTERS = ""
+            self.assertIsNone(iiifpapi3._URI_error("https://example.org/ "))
+        finally:
+            iiifpapi3.INVALID_URI_CHARACTERS = characters
+        self.assertIsNotNone(iiifpapi3._URI_error("https://example.org/("))
 
     def test_repr_missing_type_and_id(self):
         self.assertEqual(repr(self.seeAlso), "Type Missing id:Missing")
 
 
+class TestLanguageRegistry(unittest.TestCase):
+    def setUp(self):
+        self.languages = iiifpapi3.LANGUAGES
+
+    def tearDown(self):
+        iiifpapi3.LANGUAGES = self.languages
+
+    def test_membership(self):
+        self.assertIn("it", iiifpapi3.LANGUAGES)
+        self.assertNotIn("de-DE-u-co-phonebk", iiifpapi3.LANGUAGES)
+
+    def test_append(self):
+        iiifpapi3.LANGUAGES = LanguageRegistry(["en"])
+        manifest = iiifpapi3.Manifest()
+        with self.assertRaises(AssertionError):
+            manifest.add_label("de-DE-u-co-phonebk", "Telefonbuch")
+        iiifpapi3.LANGUAGES.append("de-DE-u-co-phonebk")
+        manifest.add_label("de-DE-u-co-phonebk", "Telefonbuch")
+        self.assertEqual(list(iiifpapi3.LANGUAGES), ["en", "de-DE-u-co-phonebk"])
+
+    def test_remove(self):
+        registry = LanguageRegistry(["en", "it", "en"])
+        registry.remove("en")
+        self.assertIn("en", registry)
+        del registry[-1]
+        self.assertNotIn("en", registry)
+
+    def test_loader(self):
+        registry = LanguageRegistry(loader=lambda: ["en", "it"])
+        self.assertFalse(registry.loaded)
+        self.assertIn("it", registry)
+        self.assertTrue(registry.loaded)
+        registry = LanguageRegistry(loader=lambda: ["en"])
+        registry.append("it")
+        self.assertEqual(list(registry), ["en", "it"])
+
+    def test_unknown_tags_bounded(self):
+        registry = LanguageRegistry(loader=lambda: ["en", "it"])
+        for i in range(registries.MISSING_CACHE_SIZE + 10):
+            self.assertNotIn("x-%d" % i, registry)
+        self.assertEqual(len(registry._missing), registries.MISSING_CACHE_SIZE)
+        self.assertNotIn("x-0", registry)
+        registry.append("x-0")
+        self.assertIn("x-0", registry)
+        self.assertIn("it", registry)
+
+    def test_reassign_plain_list(self):
+        iiifpapi3.LANGUAGES = ["en"]
+        self.assertTrue(iiifpapi3.valid_language("none"))
+        self.assertFalse(iiifpapi3.valid_language("it"))
+        feature = extensions.NavPlace.Feature()
+        with self.assertRaises(AssertionError):
+            feature.set_label("it", "Verona")
+
+
+class TestMediaTypeRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MediaTypeRegistry({"image": ["image/jpeg", "image/png"],
+                                           "text": ["text/html"]})
+
+    def test_check(self):
+        self.assertIsNone(self.registry.check("image/jpeg"))
+        self.assertEqual(self.registry.check("image/jpg"),
+                         "Correct media type for jpeg should be image/jpeg not image/jpg")
+        self.assertEqual(self.registry.check("jpeg"),
+                         "Format should be in the form type/format e.g. image/jpeg")
+        self.assertEqual(self.registry.check("image/webp"), "Not a IANA valid media type.")
+
+    def test_append_invalidates_index(self):
+        self.assertFalse(self.registry.is_registered("image/webp"))
+        self.registry["image"].append("image/webp")
+        self.assertTrue(self.registry.is_registered("image/webp"))
+        self.assertIsNone(self.registry.check("image/webp"))
+        self.registry["image"].remove("image/webp")
+        self.assertIsNotNone(self.registry.check("image/webp"))
+        self.registry["model"] = ["model/gltf+json"]
+        self.assertIsNone(self.registry.check("model/gltf+json"))
+
+    def test_loader(self):
+        registry = MediaTypeRegistry(loader=lambda: {"text": ["text/html"]})
+        self.assertFalse(registry.loaded)
+        self.assertIsNone(registry.check("text/html"))
+        self.assertTrue(registry.loaded)
+        registry = MediaTypeRegistry(loader=lambda: {"text": ["text/html"]})
+        registry["text"].append("text/plain")
+        self.assertIsNone(registry.check("text/plain"))
+        self.assertIsNone(registry.check("text/html"))
+
+    def test_jpg_is_refused_even_if_registered(self):
+        self.registry["image"].append("image/jpg")
+        self.assertIsNotNone(self.registry.check("image/jpg"))
+
+    def test_set_format(self):
+        body = iiifpapi3.bodypainting()
+        body.set_format("image/jpeg")
+        self.assertEqual(body.format, "image/jpeg")
+        with self.assertRaises(AssertionError):
+            body.set_format("image/tif")
+        self.assertIsInstance(iiifpapi3.MEDIATYPES["image"], list)
+
+    def test_plain_dict(self):
+        mediatypes = {"image": ["image/jpeg"], "text": ["text/plain"]}
+        body = iiifpapi3.bodypainting()
+        with unittest.mock.patch.object(iiifpapi3, "MEDIATYPES", mediatypes):
+            body.set_format("image/jpeg")
+            with self.assertRaises(AssertionError) as cm:
+                body.set_format("image/png")
+            self.assertIn("Not a IANA valid media type.", str(cm.exception))
+            with self.assertRaises(AssertionError):
+                body.set_format("image/jpg")
+        with iiifpapi3.config(mediatypes=mediatypes):
+            body.set_format("image/jpeg")
+            with self.assertRaises(AssertionError):
+                body.set_format("image/png")
+            manifest = iiifpapi3.Manifest()
+            manifest.add_canvases_bulk(
+                ids=["https://example.org/canvas/1"], heights=[10],
+                widths=[10],
+                images=["https://example.org/image/1.jpg"],
+                image_format="image/jpeg")
+            with self.assertRaises(AssertionError):
+                manifest.add_canvases_bulk(
+                    ids=["https://example.org/canvas/2"], heights=[10],
+                    widths=[10],
+                    images=["https://example.org/image/2.png"],
+                    image_format="image/png")
+        self.assertEqual(body.format, "image/jpeg")
+
+
+class TestBCP47Parser(unittest.TestCase):
+    def setUp(self):
+        self.languages = iiifpapi3.LANGUAGES
+
+    def tearDown(self):
+        iiifpapi3.LANGUAGES = self.languages
+
+    def test_parse_tag(self):
+        tag = BCP47_parser.parse_tag("zh-Hant-TW")
+        self.assertEqual(tag.language, "zh")
+        self.assertEqual(tag.script, "hant")
+        self.assertEqual(tag.region, "tw")
+        tag = BCP47_parser.parse_tag("de-DE-u-co-phonebk")
+        self.assertEqual(tag.region, "de")
+        self.assertEqual(tag.extensions, (("u", ("co", "phonebk")),))
+        tag = BCP47_parser.parse_tag("sl-rozaj-biske-x-mine")
+        self.assertEqual(tag.variants, ("rozaj", "biske"))
+        self.assertEqual(tag.privateuse, ("mine",))
+        self.assertEqual(BCP47_parser.parse_tag("zh-yue-HK").extlang, ("yue",))
+        self.assertEqual(BCP47_parser.parse_tag("es-419").region, "419")
+
+    def test_invalid_grammar(self):
+        for tag in ["", "e", "en--GB", "de-419-DE", "sl-rozaj-rozaj",
+                    "en-a-bbb-a-ccc", "en-u", "en-x", "en_GB", None]:
+            with self.assertRaises(ValueError, msg=tag):
+                BCP47_parser.parse_tag(tag)
+
+    def test_is_valid_tag(self):
+        self.assertTrue(BCP47_parser.is_valid_tag("sr-Latn"))
+        self.assertTrue(BCP47_parser.is_valid_tag("i-klingon"))
+        self.assertTrue(BCP47_parser.is_valid_tag("qab-GB"))
+        self.assertFalse(BCP47_parser.is_valid_tag("xq-GB"))
+        self.assertFalse(BCP47_parser.is_valid_tag("en-GB", ["it"]))
+
+    def test_add_label(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.add_label("sr-Latn", "Beograd")
+        manifest.add_label("zh-Hant-TW", "臺北")
+        self.assertEqual(manifest.label["sr-Latn"], ["Beograd"])
+        iiifpapi3.LANGUAGES = ["en"]
+        manifest.add_label("en-GB", "London")
+        with self.assertRaises(AssertionError):
+            manifest.add_label("sr-Latn", "Beograd")
+
+    def test_cache(self):
+        BCP47_parser.parse_tag("it-IT")
+        hits = BCP47_parser.parse_tag.cache_info().hits
+        BCP47_parser.parse_tag("it-IT")
+        self.assertEqual(BCP47_parser.parse_tag.cache_info().hits, hits + 1)
+
+
+class TestStringTable(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        registries.write_string_table(self.path, ["it", "en", "de", "en"])
+        self.table = registries.StringTable(self.path)
+
+    def tearDown(self):
+        del self.table
+        os.remove(self.path)
+
+    def test_sorted(self):
+        self.assertEqual(list(self.table), ["de", "en", "it"])
+        self.assertEqual(self.table[-1], "it")
+        self.assertEqual(len(self.table), 3)
+
+    def test_contains(self):
+        self.assertIn("en", self.table)
+        self.assertNotIn("e", self.table)
+        self.assertNotIn("zz", self.table)
+        self.assertNotIn(None, self.table)
+
+    def test_bounds(self):
+        table = registries.load_media_types()
+        lo, hi = table.bounds("font/")
+        self.assertIn("font/ttf", table[lo:hi])
+        self.assertTrue(all(m.startswith("font/") for m in table[lo:hi]))
+
+    def test_registries(self):
+        languages = LanguageRegistry(loader=registries.load_language_tags)
+        self.assertIn("it", languages)
+        self.assertNotIn("de-DE-u-co-phonebk", languages)
+        languages.append("de-DE-u-co-phonebk")
+        self.assertIn("de-DE-u-co-phonebk", languages)
+        self.assertEqual(languages[-1], "de-DE-u-co-phonebk")
+        mediatypes = MediaTypeRegistry(loader=registries.load_media_types)
+        self.assertIn("image", mediatypes)
+        self.assertIsNone(mediatypes.check("image/jpeg"))
+        del mediatypes["image"]
+        self.assertIsNotNone(mediatypes.check("image/png"))
+
+
+class TestSlots(unittest.TestCase):
+    def test_properties_in_slots(self):
+        for cls in (iiifpapi3.Canvas, iiifpapi3.Annotation,
+                    iiifpapi3.AnnotationPage, iiifpapi3.bodypainting,
+                    iiifpapi3.service, iiifpapi3.Manifest):
+            # the declared properties are not in the __dict__
+            self.assertEqual(cls().__dict__, {}, cls.__name__)
+
+    def test_undeclared_properties(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/canvas/1")
+        canvas.set_height(10)
+        canvas.set_width(10)
+        canvas.myproperty = "myvalue"
+        self.assertEqual(canvas.__dict__, {"myproperty": "myvalue"})
+        self.assertEqual(iiifpapi3.attributes(canvas)["myproperty"],
+                         "myvalue")
+        self.assertEqual(json.loads(canvas.json_dumps())["myproperty"],
+                         "myvalue")
+        self.assertEqual(canvas.to_dict()["myproperty"], "myvalue")
+        label = iiifpapi3.languagemap()
+        label.label = {"en": ["Author"]}
+        self.assertEqual(iiifpapi3.attributes(label)["label"],
+                         {"en": ["Author"]})
+
+    def test_attributes(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/canvas/1")
+        attrs = iiifpapi3.attributes(canvas)
+        self.assertEqual(list(attrs)[:3], ["id", "type", "label"])
+        self.assertEqual(attrs["id"], "https://example.org/canvas/1")
+        self.assertNotIn("navPlace", attrs)
+        placeholder = iiifpapi3.Manifest().set_placeholderCanvas()
+        self.assertNotIn("placeholderCanvas", iiifpapi3.attributes(placeholder))
+
+    def test_subclass_with_extra_properties(self):
+        class MyCanvas(iiifpapi3.Canvas):
+            pass
+        canvas = MyCanvas()
+        canvas.set_id("https://example.org/canvas/1")
+        canvas.set_height(10)
+        canvas.set_width(10)
+        canvas.myproperty = "myvalue"
+        self.assertEqual(json.loads(canvas.json_dumps())["myproperty"],
+                         "myvalue")
+
+    def test_copy(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/canvas/1")
+        canvas.add_label("en", "Page 1")
+        self.assertEqual(copy.deepcopy(canvas).json_dumps(dumps_errors=True),
+                         canvas.json_dumps(dumps_errors=True))
+
+
+class TestPlaceholders(unittest.TestCase):
+    def test_shared_instances(self):
+        self.assertIs(iiifpapi3.Canvas().id, iiifpapi3.Canvas().id)
+        self.assertIs(iiifpapi3.Canvas().label, iiifpapi3.Canvas().label)
+        self.assertIsNot(Required("msg"), Recommended("msg"))
+
+    def test_user_descriptions(self):
+        # only the descriptions of the package are interned
+        size = len(Required._instances), len(Recommended._instances)
+        self.assertIsNot(Required("msg"), Required("msg"))
+        self.assertIsNot(Recommended("msg"), Recommended("msg"))
+        self.assertEqual((len(Required._instances),
+                          len(Recommended._instances)), size)
+
+    def test_subclass_pickle(self):
+        class MyRequired(Required):
+            __slots__ = ()
+
+        for placeholder in (MyRequired("msg"), Required("msg"),
+                            Recommended("msg")):
+            copied = copy.copy(placeholder)
+            self.assertIs(type(copied), type(placeholder))
+            self.assertEqual(repr(copied), repr(placeholder))
+        self.assertIs(type(MyRequired(iiifpapi3.Canvas().id.Required)),
+                      MyRequired)
+        canvas = pickle.loads(pickle.dumps(iiifpapi3.Canvas()))
+        self.assertIs(canvas.id, iiifpapi3.Canvas().id)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            Required("msg").Required = "other"
+        with self.assertRaises(AttributeError):
+            Recommended("msg").Recommended = "other"
+
+    def test_messages(self):
+        self.assertEqual(iiifpapi3.Canvas().id.Required,
+                         "A Canvas must have the ID property.")
+        self.assertEqual(iiifpapi3.Range().id.Required,
+                         "A Range must have the ID property.")
+        dump = json.loads(iiifpapi3.AnnotationPage().json_dumps(
+            dumps_errors=True))
+        self.assertEqual(dump["id"], {
+            "Required": "A AnnotationPage must have the ID property."})
+
+    def test_copy(self):
+        manifest = iiifpapi3.Manifest()
+        self.assertIs(copy.deepcopy(manifest).label, manifest.label)
+
+
+class TestOptionalProperties(unittest.TestCase):
+    def test_unset(self):
+        canvas = iiifpapi3.Canvas()
+        self.assertIsNone(canvas.rights)
+        self.assertIsNone(canvas.navDate)
+        self.assertIsNone(canvas._optionalvalues)
+        self.assertNotIn("rights", iiifpapi3.attributes(canvas))
+
+    def test_set_and_remove(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_rights("http://creativecommons.org/licenses/by/4.0/")
+        self.assertEqual(canvas.rights,
+                         "http://creativecommons.org/licenses/by/4.0/")
+        self.assertIn("rights", iiifpapi3.attributes(canvas))
+        canvas.rights = None
+        self.assertEqual(canvas._optionalvalues, {})
+        canvas.set_navDate("1856-01-01T00:00:00Z")
+        del canvas.navDate
+        self.assertIsNone(canvas.navDate)
+
+    def test_order(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_navDate("1856-01-01T00:00:00Z")
+        manifest.set_rights("http://creativecommons.org/licenses/by/4.0/")
+        manifest.add_summary("en", "A summary")
+        names = list(iiifpapi3.attributes(manifest))
+        expected = [n for n in iiifpapi3.propertynames(iiifpapi3.Manifest)
+                    if n in names]
+        self.assertEqual(names, expected)
+        self.assertLess(names.index("summary"), names.index("navDate"))
+
+    def test_copy(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_rights("http://creativecommons.org/licenses/by/4.0/")
+        canvascopy = copy.copy(canvas)
+        canvascopy.set_rights("http://rightsstatements.org/vocab/InC/1.0/")
+        self.assertEqual(canvas.rights,
+                         "http://creativecommons.org/licenses/by/4.0/")
+
+
+class TestCompiledSerializer(unittest.TestCase):
+    def setUp(self):
+        self.canvas = iiifpapi3.Canvas()
+        self.canvas.set_id("https://example.org/canvas/1")
+        self.canvas.set_height(10)
+        self.canvas.set_width(10)
+        self.canvas.add_label("en", "Page 1")
+        self.canvas.set_rights("http://creativecommons.org/licenses/by/4.0/")
+
+    def test_same_as_generic(self):
+        placeholder = iiifpapi3.Manifest().set_placeholderCanvas()
+        for obj in (self.canvas, iiifpapi3.Canvas(), iiifpapi3.Manifest(),
+                    iiifpapi3.Annotation(), iiifpapi3.languagemap(),
+                    placeholder):
+            todict = iiifpapi3._compile_todict(obj.__class__, True)
+            self.assertEqual(
+                list(todict(obj).items()),
+                list(iiifpapi3._todict_generic(obj, True).items()))
+        todict = iiifpapi3._compile_todict(iiifpapi3.Canvas)
+        self.assertEqual(list(todict(self.canvas).items()),
+                         list(iiifpapi3._todict_generic(self.canvas).items()))
+
+    def test_placeholders(self):
+        todict = iiifpapi3._compile_todict(iiifpapi3.Canvas)
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/canvas/1")
+        with self.assertRaises(ValueError):
+            todict(canvas)
+        canvas.set_height(10)
+        canvas.set_width(10)
+        self.assertNotIn("label", todict(canvas))
+
+    def test_instance_dict(self):
+        class MyCanvas(iiifpapi3.Canvas):
+            pass
+        canvas = MyCanvas()
+        canvas.myproperty = "myvalue"
+        canvas.myunset = None
+        todict = iiifpapi3._compile_todict(MyCanvas, True)
+        self.assertEqual(todict(canvas)["myproperty"], "myvalue")
+        self.assertNotIn("myunset", todict(canvas))
+
+
+class TestToDict(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Book 1")
+        self.manifest.add_metadata("Author", "Anne Author", "en", "en")
+        self.manifest.add_behavior("paged")
+        self.manifest.set_navDate("1856-01-01T00:00:00Z")
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/canvas/p1")
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        canvas.add_label(None, "p. 1")
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id("https://example.org/page/p1/1")
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id("https://example.org/annotation/p1")
+        annotation.set_motivation("painting")
+        annotation.body.set_id("https://example.org/image.jpg")
+        annotation.body.set_type("Image")
+
+    def test_same_as_json(self):
+        for dumps_errors in (False, True):
+            for sort_keys in (False, True):
+                ref = json.loads(self.manifest.json_dumps(
+                    dumps_errors=dumps_errors, sort_keys=sort_keys))
+                res = self.manifest.to_dict(
+                    dumps_errors=dumps_errors, sort_keys=sort_keys)
+                self.assertEqual(json.dumps(res), json.dumps(ref))
+        self.assertEqual(self.manifest.to_json(), self.manifest.to_dict())
+
+    def test_context(self):
+        res = self.manifest.to_dict(context=["https://example.org/context",
+                                             iiifpapi3.CONTEXT])
+        self.assertEqual(list(res)[0], "@context")
+        self.assertEqual(res["@context"][1], iiifpapi3.CONTEXT)
+
+    def test_plain_types(self):
+        self.manifest.items[0].label = {"none": ("p. 1",), 1: ["one"]}
+        res = self.manifest.to_dict()
+        self.assertEqual(res["items"][0]["label"],
+                         {"none": ["p. 1"], "1": ["one"]})
+
+    def test_required(self):
+        with self.assertRaises(ValueError):
+            iiifpapi3.Canvas().to_dict()
+
+
+class TestJSONStream(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Bücher")
+        for idx in range(1, 4):
+            canvas = self.manifest.add_canvas_to_items()
+            canvas.set_id("https://example.org/canvas/p%s" % idx)
+            canvas.set_height(1000)
+            canvas.set_width(750)
+
+    def test_same_as_json_dumps(self):
+        for kwargs in ({}, {"dumps_errors": True}, {"sort_keys": True},
+                       {"ensure_ascii": True}, {"chunk_size": 1},
+                       {"context": ["https://example.org/context",
+                                    iiifpapi3.CONTEXT]}):
+            stream = io.StringIO()
+            self.manifest.json_stream(stream, **kwargs)
+            kwargs.pop("chunk_size", None)
+            self.assertEqual(stream.getvalue(),
+                             self.manifest.json_dumps(**kwargs))
+
+    def test_context_list(self):
+        context = ["http://iiif.io/api/extension/navPlace-context/context.json",
+                   iiifpapi3.CONTEXT]
+        res = self.manifest.json_dumps(context=context)
+        self.assertTrue(res.startswith(
+            '{\n  "@context": [\n    "http://iiif.io/api/extension/'))
+        self.assertEqual(json.loads(res)["@context"], context)
+
+    def test_orjson_bytes(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        res = self.manifest.orjson_dumps(as_bytes=True)
+        self.assertIsInstance(res, bytes)
+        self.assertEqual(res.decode("utf-8"), self.manifest.orjson_dumps())
+        self.assertEqual(json.loads(res), json.loads(
+            self.manifest.json_dumps()))
+
+    def test_json_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.json")
+            self.manifest.json_save(filename)
+            with open(filename) as f:
+                self.assertEqual(f.read(), self.manifest.json_dumps())
+
+
+class TestCompact(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Bücher")
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/canvas/p1")
+        canvas.set_height(1000)
+        canvas.set_width(750)
+
+    def tearDown(self):
+        iiifpapi3.COMPACT = False
+
+    def test_compact(self):
+        res = self.manifest.json_dumps(compact=True)
+        self.assertNotIn("\n", res)
+        self.assertTrue(res.startswith('{"@context":"http'))
+        self.assertEqual(json.loads(res),
+                         json.loads(self.manifest.json_dumps()))
+        stream = io.StringIO()
+        self.manifest.json_stream(stream, compact=True)
+        self.assertEqual(stream.getvalue(), res)
+
+    def test_global(self):
+        iiifpapi3.COMPACT = True
+        self.assertEqual(self.manifest.json_dumps(),
+                         self.manifest.json_dumps(compact=True))
+        self.assertIn("\n", self.manifest.json_dumps(compact=False))
+
+    def test_orjson(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(self.manifest.orjson_dumps(compact=True),
+                         self.manifest.json_dumps(compact=True))
+        iiifpapi3.COMPACT = True
+        self.assertEqual(self.manifest.orjson_dumps(),
+                         self.manifest.json_dumps())
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.json")
+            self.manifest.json_save(filename, compact=True)
+            with open(filename) as f:
+                self.assertEqual(f.read(),
+                                 self.manifest.json_dumps(compact=True))
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Bücher")
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/canvas/p1")
+        canvas.set_height(1000)
+        canvas.set_width(750)
+
+    def test_get_backend(self):
+        self.assertEqual(backends.get_backend("json").name, "json")
+        self.assertTrue(backends.get_backend("auto").available())
+        self.assertTrue(
+            backends.get_backend("auto", ensure_ascii=True)
+            .supports_ensure_ascii)
+        with self.assertRaises(ValueError):
+            backends.get_backend("yaml")
+
+    def test_same_output(self):
+        reference = self.manifest.json_dumps()
+        for name, backend in backends.BACKENDS.items():
+            if not backend.available():
+                continue
+            with self.subTest(backend=name):
+                res = self.manifest.dumps(backend=name)
+                self.assertIsInstance(res, str)
+                self.assertEqual(json.loads(res), json.loads(reference))
+                res = self.manifest.dumps(backend=name, as_bytes=True)
+                self.assertIsInstance(res, bytes)
+                self.assertEqual(json.loads(res), json.loads(reference))
+        self.assertEqual(self.manifest.dumps(backend="json"), reference)
+
+    def check_same_as_json(self, name):
+        canvas = self.manifest.items[0]
+        canvas.set_duration(12.5)
+        for compact in (False, True):
+            reference = self.manifest.dumps(backend="json", compact=compact)
+            # no float in exponent form, hence the same text
+            self.assertEqual(
+                self.manifest.dumps(backend=name, compact=compact), reference)
+            self.assertEqual(
+                self.manifest.dumps(backend=name, compact=compact,
+                                    as_bytes=True),
+                reference.encode("utf-8"))
+            self.assertEqual(
+                self.manifest.dumps(backend=name, compact=compact,
+                                    cache=True), reference)
+        canvas.set_duration(1e-07)
+        self.assertEqual(json.loads(self.manifest.dumps(backend=name)),
+                         json.loads(self.manifest.dumps(backend="json")))
+        canvas.set_duration(12.5)
+
+    @unittest.skipUnless(backends.BACKENDS["ujson"].available(),
+                         "ujson is not installed")
+    def test_ujson(self):
+        self.check_same_as_json("ujson")
+        self.assertEqual(
+            self.manifest.dumps(backend="ujson", ensure_ascii=True),
+            self.manifest.dumps(backend="json", ensure_ascii=True))
+        with self.assertRaises(ValueError):
+            self.manifest.dumps(backend="ujson", sort_keys=True)
+
+    @unittest.skipUnless(backends.BACKENDS["msgspec"].available(),
+                         "msgspec is not installed")
+    def test_msgspec(self):
+        self.check_same_as_json("msgspec")
+        self.assertEqual(
+            self.manifest.dumps(backend="msgspec", sort_keys=True),
+            self.manifest.dumps(backend="json", sort_keys=True))
+        with self.assertRaises(ValueError):
+            self.manifest.dumps(backend="msgspec", ensure_ascii=True)
+
+    def test_required_error(self):
+        # the error raised by default reaches the caller of every backend
+        self.manifest.add_canvas_to_items()
+        for name, backend in backends.BACKENDS.items():
+            if not backend.available():
+                continue
+            for cache in (False, True):
+                with self.subTest(backend=name, cache=cache):
+                    with self.assertRaisesRegex(
+                            ValueError, "A Canvas must have the ID"):
+                        self.manifest.dumps(backend=name, cache=cache)
+
+    def test_unsupported_option(self):
+        if not backends.BACKENDS["orjson"].available():
+            self.skipTest("orjson is not installed")
+        with self.assertRaises(ValueError):
+            self.manifest.dumps(backend="orjson", ensure_ascii=True)
+        self.assertIn("\\u00fc", self.manifest.dumps(ensure_ascii=True))
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.json")
+            self.manifest.save(filename, compact=True)
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(json.loads(f.read()),
+                                 json.loads(self.manifest.json_dumps()))
+
+    @unittest.skipUnless(backends.BACKENDS["orjson"].available(),
+                         "orjson is not installed")
+    def test_orjson_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.json")
+            self.manifest.orjson_save(filename)
+            with open(filename, "rb") as f:
+                self.assertEqual(f.read(), self.manifest.dumps(
+                    backend="orjson", as_bytes=True))
+
+    def test_register_backend(self):
+        class ReprBackend(backends.Backend):
+            name = "repr"
+            module_name = "json"
+
+            def _encode(self, document, default, compact, sort_keys,
+                        ensure_ascii):
+                return repr(sorted(document))
+
+        backends.register_backend(ReprBackend())
+        self.addCleanup(backends.BACKENDS.pop, "repr")
+        self.assertEqual(self.manifest.dumps(backend="repr"),
+                         repr(sorted(["@context", "id", "type", "label",
+                                      "items"])))
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Bücher")
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/canvas/p1")
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.filename = os.path.join(self.tmp.name, "manifest.json")
+
+    def read(self, filename):
+        with open(filename, "rb") as f:
+            return f.read()
+
+    def test_gzip(self):
+        import gzip
+        for backend in ("json", "auto"):
+            with self.subTest(backend=backend):
+                self.manifest.save(self.filename + ".gz", backend=backend,
+                                   compression="gzip")
+                self.assertFalse(os.path.exists(self.filename))
+                self.assertEqual(
+                    json.loads(gzip.decompress(self.read(
+                        self.filename + ".gz"))),
+                    json.loads(self.manifest.json_dumps()))
+
+    def test_sidecars(self):
+        import gzip
+        self.manifest.save(self.filename, backend="json", compression="gzip",
+                           sidecars=True)
+        raw = self.read(self.filename)
+        self.assertEqual(raw, self.manifest.json_dumps().encode("utf-8"))
+        self.assertEqual(gzip.decompress(self.read(self.filename + ".gz")),
+                         raw)
+
+    def test_optional_compressors(self):
+        available = [name for name in ("zstd", "br")
+                     if compressors.COMPRESSORS[name].available()]
+        if not available:
+            self.skipTest("zstandard and brotli are not installed")
+        self.manifest.save(self.filename, compression=available,
+                           sidecars=True)
+        for name in available:
+            suffix = compressors.COMPRESSORS[name].suffix
+            self.assertTrue(os.path.exists(self.filename + suffix))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.manifest.save(self.filename, compression="lzma")
+        with self.assertRaises(ValueError):
+            self.manifest.save(self.filename, compression=["gzip", "gzip"])
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_failure_removes_the_files(self):
+        with self.assertRaises(RuntimeError):
+            with compressors.Writer(self.filename, "gzip",
+                                    sidecars=True) as f:
+                f.write(b'{"type": ')
+                raise RuntimeError("encoding failed")
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertFalse(os.path.exists(self.filename + ".gz"))
+        with unittest.mock.patch.object(
+                iiifpapi3._CoreAttributes, "json_stream",
+                side_effect=ValueError("Required attribute")):
+            with self.assertRaises(ValueError):
+                self.manifest.save(self.filename, backend="json",
+                                   compression="gzip")
+        self.assertFalse(os.path.exists(self.filename))
+        # the files written before are kept
+        self.manifest.save(self.filename, compression="gzip")
+        with self.assertRaises(RuntimeError):
+            with compressors.Writer(self.filename + ".tmp", "gzip"):
+                raise RuntimeError
+        self.assertTrue(os.path.exists(self.filename))
+
+    def test_failed_stream_removes_the_file(self):
+        # the second canvas fails once the first one is written
+        self.manifest.add_canvas_to_items()
+        for save in (self.manifest.json_save,
+                     functools.partial(self.manifest.save, backend="json")):
+            with self.assertRaises(ValueError):
+                save(self.filename)
+            self.assertFalse(os.path.exists(self.filename))
+
+    def test_stream_is_utf8(self):
+        open_mock = unittest.mock.mock_open()
+        with unittest.mock.patch("IIIFpres.iiifpapi3.open", open_mock,
+                                 create=True):
+            self.manifest.json_save(self.filename)
+        self.assertEqual(open_mock.call_args.kwargs.get("encoding"), "utf-8")
+        self.manifest.json_save(self.filename)
+        self.assertEqual(self.read(self.filename).decode("utf-8"),
+                         self.manifest.json_dumps())
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/manifest")
+        self.manifest.add_label("en", "Bücher")
+        self.canvases = []
+        for i in range(3):
+            canvas = self.manifest.add_canvas_to_items()
+            canvas.set_id("https://example.org/canvas/p%s" % i)
+            canvas.set_height(1000)
+            canvas.set_width(750)
+            annopage = canvas.add_annotationpage_to_items()
+            annopage.set_id("https://example.org/page/p%s" % i)
+            annotation = annopage.add_annotation_to_items(target=canvas.id)
+            annotation.set_id("https://example.org/annotation/p%s" % i)
+            annotation.set_motivation("painting")
+            annotation.body.set_id("https://example.org/p%s.jpg" % i)
+            annotation.body.set_format("image/jpeg")
+            annotation.body.set_type("Image")
+            self.canvases.append(canvas)
+
+    def tearDown(self):
+        iiifpapi3.CACHE = False
+
+    def assertCached(self, **kwargs):
+        for i in range(2):
+            self.assertEqual(self.manifest.dumps(cache=True, **kwargs),
+                             self.manifest.dumps(cache=False, **kwargs))
+
+    def test_same_json(self):
+        for compact in (False, True):
+            for sort_keys in (False, True):
+                with self.subTest(compact=compact, sort_keys=sort_keys):
+                    self.assertCached(backend="json", compact=compact,
+                                      sort_keys=sort_keys)
+                    self.assertCached(compact=compact)
+        self.assertCached(dumps_errors=True)
+
+    def test_mutators(self):
+        self.manifest.dumps(cache=True)
+        self.canvases[1].add_label("it", "Libri")
+        self.assertIn("Libri", self.manifest.dumps(cache=True))
+        self.assertCached()
+        body = self.canvases[2].items[0].items[0].body
+        body.set_format("image/png")
+        self.assertIn("image/png", self.manifest.dumps(cache=True))
+        self.assertCached()
+
+    def test_only_changed_objects(self):
+        self.manifest.dumps(cache=True)
+        self.canvases[0].set_height(600)
+        encoder = iiifpapi3._FragmentEncoder
+        with unittest.mock.patch.object(
+                encoder, "pieces", autospec=True,
+                side_effect=encoder.pieces) as pieces:
+            self.manifest.dumps(cache=True)
+        # the manifest and the canvas
+        self.assertEqual(pieces.call_count, 2)
+        self.assertCached()
+
+    def test_invalidate(self):
+        self.manifest.dumps(cache=True)
+        self.canvases[0].height = 600
+        self.assertNotIn('"height": 600', self.manifest.dumps(cache=True))
+        self.canvases[0].invalidate()
+        self.assertIn('"height": 600', self.manifest.dumps(cache=True))
+
+    def test_global(self):
+        iiifpapi3.CACHE = True
+        self.assertEqual(self.manifest.json_dumps(),
+                         self.manifest.dumps(backend="json", cache=False))
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "manifest.json")
+            self.manifest.save(filename, backend="json")
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), self.manifest.json_dumps())
+
+    def test_copy(self):
+        self.manifest.dumps(cache=True)
+        canvas = copy.deepcopy(self.canvases[0])
+        self.assertIsNone(canvas._fragments)
+
+    def test_copy_helpers(self):
+        entry = self.manifest.add_metadata()
+        entry.label = {"en": ["date"]}
+        entry.value = {"en": ["1834"]}
+        navplace = extensions.NavPlace.navPlace()
+        feature = navplace.add_feature()
+        feature.set_id("https://example.org/feature/1")
+        feature.set_geometry_as_point(8.5, 47.4)
+        self.manifest.navPlace = navplace
+        self.manifest.dumps(cache=True)
+        for obj in (entry, navplace, feature):
+            with self.subTest(obj=type(obj).__name__):
+                self.assertIsNotNone(obj._fragments)
+                for duplicate in (copy.copy(obj), copy.deepcopy(obj),
+                                  pickle.loads(pickle.dumps(obj))):
+                    self.assertIsNone(duplicate._fragments)
+                    self.assertEqual(list(iiifpapi3.attributes(duplicate)),
+                                     list(iiifpapi3.attributes(obj)))
+
+
+class TestContentHash(unittest.TestCase):
+    def build(self, height=1000):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/manifest")
+        manifest.add_label("en", "Bücher")
+        for i in range(3):
+            canvas = manifest.add_canvas_to_items()
+            canvas.set_id("https://example.org/canvas/p%s" % i)
+            canvas.set_height(height)
+            canvas.set_width(750)
+            annopage = canvas.add_annotationpage_to_items()
+            annopage.set_id("https://example.org/page/p%s" % i)
+        return manifest
+
+    def test_same_content(self):
+        manifest = self.build()
+        digest = manifest.content_hash()
+        self.assertEqual(len(digest), 64)
+        self.assertEqual(digest, self.build().content_hash())
+        self.assertEqual(manifest.etag(), 'W/"%s"' % digest)
+        self.assertNotEqual(digest, self.build(height=600).content_hash())
+        self.assertNotEqual(digest,
+                            manifest.content_hash(dumps_errors=True))
+
+    def test_mutators(self):
+        manifest = self.build()
+        digest = manifest.content_hash()
+        manifest.items[1].set_height(600)
+        other = self.build()
+        other.items[1].set_height(600)
+        self.assertEqual(manifest.content_hash(), other.content_hash())
+        self.assertNotEqual(manifest.content_hash(), digest)
+        manifest.items[1].set_height(1000)
+        self.assertEqual(manifest.content_hash(), digest)
+        manifest.items[2].items[0].add_label("en", "page")
+        self.assertNotEqual(manifest.content_hash(), digest)
+
+    def test_only_changed_objects(self):
+        manifest = self.build()
+        manifest.content_hash()
+        manifest.dumps(cache=True)
+        manifest.items[0].set_height(600)
+        with unittest.mock.patch.object(
+                iiifpapi3.hashlib, "sha256",
+                side_effect=iiifpapi3.hashlib.sha256) as sha256:
+            manifest.content_hash()
+        # the manifest and the canvas
+        self.assertEqual(sha256.call_count, 2)
+        self.assertEqual(manifest.dumps(cache=True),
+                         manifest.dumps(cache=False))
+
+    def test_invalidate(self):
+        manifest = self.build()
+        digest = manifest.content_hash()
+        manifest.items[0].height = 600
+        self.assertEqual(manifest.content_hash(), digest)
+        manifest.items[0].invalidate()
+        self.assertNotEqual(manifest.content_hash(), digest)
+
+
+class TestBulkCanvases(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def columns(self, n=3):
+        base = self.base
+        return {
+            "ids": [base + "canvas/p%s" % i for i in range(n)],
+            "heights": [1000] * n,
+            "widths": [750] * n,
+            "labels": ["p. %s" % i for i in range(n)],
+            "images": [base + "p%s/full/max/0/default.jpg" % i
+                       for i in range(n)],
+            "services": [base + "p%s" % i for i in range(n)],
+        }
+
+    def loop(self, columns):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(self.base + "manifest")
+        manifest.add_label("en", "Book 1")
+        for i, canvas_id in enumerate(columns["ids"]):
+            canvas = manifest.add_canvas_to_items()
+            canvas.set_id(canvas_id)
+            canvas.set_height(columns["heights"][i])
+            canvas.set_width(columns["widths"][i])
+            if columns["labels"][i] is not None:
+                canvas.add_label("none", columns["labels"][i])
+            annopage = canvas.add_annotationpage_to_items()
+            annopage.set_id(canvas_id + "/page")
+            annotation = annopage.add_annotation_to_items(target=canvas.id)
+            annotation.set_id(canvas_id + "/page/annotation")
+            annotation.set_motivation("painting")
+            annotation.body.set_id(columns["images"][i])
+            annotation.body.set_type("Image")
+            annotation.body.set_format("image/jpeg")
+            annotation.body.set_height(columns["heights"][i])
+            annotation.body.set_width(columns["widths"][i])
+            service = annotation.body.add_service()
+            service.set_id(columns["services"][i])
+            service.set_type("ImageService3")
+            service.set_profile("level2")
+        return manifest
+
+    def bulk(self, **kwargs):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(self.base + "manifest")
+        manifest.add_label("en", "Book 1")
+        canvases = manifest.add_canvases_bulk(**kwargs)
+        return manifest, canvases
+
+    def test_same_as_setters(self):
+        columns = self.columns()
+        columns["labels"][1] = None
+        manifest, canvases = self.bulk(**columns)
+        self.assertEqual(len(canvases), 3)
+        self.assertIs(canvases[2], manifest.items[2])
+        self.assertEqual(manifest.json_dumps(),
+                         self.loop(columns).json_dumps())
+
+    def test_table(self):
+        columns = self.columns()
+        manifest, _ = self.bulk(table=columns)
+        self.assertEqual(manifest.json_dumps(),
+                         self.loop(columns).json_dumps())
+        # the arguments take precedence over the table
+        ids = [self.base + "c%s" % i for i in range(3)]
+        manifest, canvases = self.bulk(ids=ids, table=columns)
+        self.assertEqual(canvases[1].id, ids[1])
+        self.assertEqual(canvases[1].items[0].id, ids[1] + "/page")
+
+    def test_invalid_columns(self):
+        for name, value in (("ids", "https://example.org/canvas p1"),
+                            ("ids", "https://example.org/canvas#p1"),
+                            ("images", "example.org/p1.jpg"),
+                            ("services", "https://example.org/p1<"),
+                            ("heights", 0),
+                            ("widths", "750px")):
+            columns = self.columns()
+            columns[name][1] = value
+            with self.assertRaises(AssertionError):
+                self.bulk(**columns)
+        columns = self.columns()
+        columns["widths"] = columns["widths"][:2]
+        with self.assertRaises(AssertionError):
+            self.bulk(**columns)
+        del columns["images"]
+        with self.assertRaises(AssertionError):
+            self.bulk(**columns)
+
+
+class TestCanvasColumns(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def build(self, columnar, n=4):
+        base = self.base
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(base + "manifest")
+        manifest.add_label("en", "Book 1")
+        manifest.add_canvases_bulk(
+            ids=[base + "canvas/p%s" % i for i in range(n)],
+            heights=[1000] * n,
+            widths=[750] * n,
+            labels=["p. %s" % i if i % 2 else None for i in range(n)],
+            images=[base + "p%s/full/max/0/default.jpg" % i
+                    for i in range(n)],
+            services=[base + "p%s" % i if i % 3 else None
+                      for i in range(n)],
+            columnar=columnar)
+        return manifest
+
+    def test_same_json(self):
+        manifest = self.build(False)
+        columnar = self.build(True)
+        self.assertIsInstance(columnar.items, iiifpapi3.CanvasColumns)
+        self.assertEqual(len(columnar.items), 4)
+        for dumps_errors in (False, True):
+            self.assertEqual(
+                columnar.dumps(backend="json", dumps_errors=dumps_errors),
+                manifest.dumps(backend="json", dumps_errors=dumps_errors))
+        self.assertEqual(columnar.to_dict(), manifest.to_dict())
+        self.assertEqual(columnar.dumps(backend="json", cache=True),
+                         manifest.json_dumps())
+
+    def test_materialization(self):
+        manifest = self.build(False)
+        columnar = self.build(True)
+        canvas = columnar.items[1]
+        self.assertIsInstance(canvas, iiifpapi3.Canvas)
+        self.assertIs(columnar.items[1], canvas)
+        self.assertEqual(canvas.items[0].id, canvas.id + "/page")
+        self.assertEqual(
+            canvas.items[0].items[0].body.service[0].profile, "level2")
+        cached = columnar.dumps(backend="json", cache=True)
+        canvas.set_height(600)
+        manifest.items[1].set_height(600)
+        self.assertNotEqual(columnar.dumps(backend="json", cache=True),
+                            cached)
+        self.assertEqual(columnar.dumps(backend="json", cache=True),
+                         manifest.json_dumps())
+
+    def test_list_methods(self):
+        manifest = self.build(False)
+        columnar = self.build(True)
+        for items in (manifest.items, columnar.items):
+            del items[0]
+            items.insert(1, items.pop())
+        manifest.add_canvas_to_items().set_id(self.base + "canvas/last")
+        columnar.add_canvas_to_items().set_id(self.base + "canvas/last")
+        self.assertEqual(len(columnar.items), 4)
+        self.assertEqual(columnar.json_dumps(dumps_errors=True),
+                         manifest.json_dumps(dumps_errors=True))
+        self.assertEqual([c.id for c in columnar.items],
+                         [c.id for c in manifest.items])
+
+    def test_etag(self):
+        manifest = self.build(False)
+        columnar = self.build(True)
+        etag = manifest.etag()
+        self.assertEqual(columnar.etag(), etag)
+        self.assertEqual(columnar.content_hash(dumps_errors=True),
+                         manifest.content_hash(dumps_errors=True))
+        # accessing the rows does not change the ETag
+        columnar.items[0]
+        columnar.items[2]
+        self.assertEqual(columnar.etag(), etag)
+        columnar.items[3].set_height(600)
+        manifest.items[3].set_height(600)
+        self.assertNotEqual(columnar.etag(), etag)
+        self.assertEqual(columnar.etag(), manifest.etag())
+        del columnar.items[1]
+        del manifest.items[1]
+        # the changes of a plain list are not tracked
+        manifest.invalidate()
+        self.assertEqual(columnar.etag(), manifest.etag())
+
+    def test_utilities(self):
+        manifest = self.build(False)
+        columnar = self.build(True)
+        for obj in (manifest, columnar):
+            utilities.delete_object_byID(obj, self.base + "canvas/p1")
+        self.assertEqual(len(columnar.items), 3)
+        self.assertEqual(columnar.json_dumps(), manifest.json_dumps())
+        # the other rows are not built
+        self.assertEqual(columnar.items._rows, [0, 2, 3])
+        for obj in (manifest, columnar):
+            utilities.delete_object_byID(
+                obj, self.base + "canvas/p2/page/annotation")
+        self.assertEqual(columnar.json_dumps(dumps_errors=True),
+                         manifest.json_dumps(dumps_errors=True))
+        self.assertEqual(columnar.items._rows[0], 0)
+        new = iiifpapi3.Canvas()
+        new.set_id(self.base + "canvas/new")
+        self.assertEqual(utilities.remove_and_insert_new(
+            columnar, self.base + "canvas/p3", new), 1)
+        self.assertEqual([c.id for c in columnar.items][1:],
+                         [self.base + "canvas/p2", new.id])
+
+    def test_copy(self):
+        columnar = self.build(True)
+        columnar.items[0]
+        for other in (copy.deepcopy(columnar),
+                      pickle.loads(pickle.dumps(columnar))):
+            self.assertEqual(other.json_dumps(), columnar.json_dumps())
+
+
+class TestCanvasTemplate(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def add_canvas(self, manifest, idx):
+        base = self.base
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id(base + "canvas/p%s" % idx)
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        canvas.add_label("none", "p. %s" % idx)
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id(base + "canvas/p%s/page" % idx)
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id(base + "canvas/p%s/page/annotation" % idx)
+        annotation.set_motivation("painting")
+        annotation.body.set_id(base + "p%s/full/max/0/default.jpg" % idx)
+        annotation.body.set_type("Image")
+        annotation.body.set_format("image/jpeg")
+        annotation.body.set_width(1500)
+        annotation.body.set_height(2000)
+        s = annotation.body.add_service()
+        s.set_id(base + "p%s" % idx)
+        s.set_type("ImageService3")
+        s.set_profile("level2")
+        s.add_service({"@id": "https://example.org/iiif/auth/login",
+                       "@type": "AuthCookieService1"})
+        return canvas
+
+    def build(self, template):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(self.base + "manifest")
+        manifest.add_label("en", "Book 1")
+        prototype = self.add_canvas(manifest, 1)
+        stamp = iiifpapi3.CanvasTemplate(prototype)
+        for idx in range(2, 5):
+            if template:
+                manifest.add_canvas_to_items(stamp.new(
+                    self.base + "canvas/p%s" % idx,
+                    label="p. %s" % idx,
+                    image_id=self.base + "p%s/full/max/0/default.jpg" % idx,
+                    service_id=self.base + "p%s" % idx))
+            else:
+                self.add_canvas(manifest, idx)
+        return manifest, stamp
+
+    def test_ids_not_substituted(self):
+        manifest = iiifpapi3.Manifest()
+        canvas = self.add_canvas(manifest, 1)
+        page = canvas.add_annotationpage_to_annotations()
+        page.set_id(self.base + "canvas/p1/comments")
+        with self.assertRaises(AssertionError) as cm:
+            iiifpapi3.CanvasTemplate(canvas)
+        self.assertIn("annotations", str(cm.exception))
+        canvas = self.add_canvas(manifest, 2)
+        canvas.add_annotationpage_to_items().set_id(
+            self.base + "canvas/p2/page2")
+        with self.assertRaises(AssertionError) as cm:
+            iiifpapi3.CanvasTemplate(canvas)
+        self.assertIn("at most one annotation page", str(cm.exception))
+        canvas = self.add_canvas(manifest, 3)
+        canvas.items[0].add_annotation_to_items(target=canvas.id)
+        with self.assertRaises(AssertionError) as cm:
+            iiifpapi3.CanvasTemplate(canvas)
+        self.assertIn("at most one annotation in", str(cm.exception))
+
+    def test_same_json(self):
+        manifest, _ = self.build(False)
+        stamped, _ = self.build(True)
+        for dumps_errors in (False, True):
+            self.assertEqual(stamped.json_dumps(dumps_errors=dumps_errors),
+                             manifest.json_dumps(dumps_errors=dumps_errors))
+        self.assertEqual(stamped.content_hash(), manifest.content_hash())
+
+    def test_independent_objects(self):
+        manifest, stamp = self.build(True)
+        first, second = manifest.items[1], manifest.items[2]
+        self.assertIsNot(first.items[0], second.items[0])
+        second.set_height(600)
+        second.add_label("none", "recto")
+        self.assertEqual(first.height, 1000)
+        self.assertEqual(first.label, {"none": ["p. 2"]})
+        self.assertEqual(stamp.prototype.label, {"none": ["p. 1"]})
+        service = second.items[0].items[0].body.service[0]
+        self.assertIs(service.service[0],
+                      first.items[0].items[0].body.service[0].service[0])
+        canvas = stamp.new(self.base + "canvas/p9", height="800",
+                           label="p. 9", image_id=self.base + "p9.jpg",
+                           image_width=900, service_id=self.base + "p9")
+        self.assertEqual(canvas.height, 800)
+        self.assertEqual(canvas.width, 750)
+        self.assertEqual(canvas.items[0].items[0].target, canvas.id)
+        self.assertEqual(canvas.items[0].items[0].body.width, 900)
+
+    def test_checks(self):
+        _, stamp = self.build(True)
+        with self.assertRaises(AssertionError):
+            stamp.new(self.base + "canvas/p9#xywh=0,0,10,10")
+        with self.assertRaises(AssertionError):
+            stamp.new(self.base + "canvas/p9", image_id="p9.jpg")
+        with self.assertRaises(AssertionError):
+            stamp.new(self.base + "canvas/p9", height=0)
+        with self.assertRaises(AssertionError):
+            iiifpapi3.CanvasTemplate(iiifpapi3.Canvas())
+        prototype = iiifpapi3.Canvas()
+        prototype.set_id(self.base + "canvas/p1")
+        stamp = iiifpapi3.CanvasTemplate(prototype)
+        with self.assertRaises(AssertionError):
+            stamp.new(self.base + "canvas/p9", service_id=self.base + "p9")
+
+    def test_required_values(self):
+        # the IDs of the prototype are never copied to the new canvases
+        _, stamp = self.build(True)
+        values = {"label": "p. 9", "image_id": self.base + "p9.jpg",
+                  "service_id": self.base + "p9"}
+        for name in values:
+            with self.subTest(name=name):
+                kwargs = dict(values)
+                del kwargs[name]
+                with self.assertRaises(ValueError) as cm:
+                    stamp.new(self.base + "canvas/p9", **kwargs)
+                self.assertIn(name, str(cm.exception))
+        prototype = iiifpapi3.Canvas()
+        prototype.set_id(self.base + "canvas/p1")
+        canvas = iiifpapi3.CanvasTemplate(prototype).new(
+            self.base + "canvas/p9")
+        self.assertEqual(canvas.id, self.base + "canvas/p9")
+
+
+class TestIdFactory(unittest.TestCase):
+    def setUp(self):
+        self.base_url = iiifpapi3.BASE_URL
+
+    def tearDown(self):
+        iiifpapi3.BASE_URL = self.base_url
+
+    def test_ids(self):
+        ids = iiifpapi3.IdFactory("https://example.org/iiif/book1/")
+        self.assertEqual(ids("canvas/p1"),
+                         "https://example.org/iiif/book1/canvas/p1")
+        self.assertEqual(
+            ids.sequence("page/p{n}/1", range(1, 3)),
+            ["https://example.org/iiif/book1/page/p1/1",
+             "https://example.org/iiif/book1/page/p2/1"])
+        self.assertEqual(
+            ids.sequence("annotation/p{n:04d}-image", [7]),
+            ["https://example.org/iiif/book1/annotation/p0007-image"])
+        self.assertEqual(ids.sequence("canvas/p{n}", []), [])
+        iiifpapi3.BASE_URL = "https://example.org/iiif/book1/"
+        self.assertEqual(iiifpapi3.IdFactory().base_url, iiifpapi3.BASE_URL)
+
+    def test_checks(self):
+        with self.assertRaises(AssertionError):
+            iiifpapi3.IdFactory("example.org/")
+        with self.assertRaises(AssertionError):
+            iiifpapi3.IdFactory("https://example.org/my book/")
+        ids = iiifpapi3.IdFactory("https://example.org/iiif")
+        with self.assertRaises(AssertionError):
+            ids("canvas/p1")
+        self.assertEqual(ids("/canvas/p1"),
+                         "https://example.org/iiif/canvas/p1")
+        with self.assertRaisesRegex(AssertionError, "a space"):
+            ids("/canvas/p 1")
+        with self.assertRaises(AssertionError):
+            ids.sequence("/canvas/p{n:3d}", range(1, 1000))
+
+    def test_sequence_checks_every_value(self):
+        ids = iiifpapi3.IdFactory("https://e.org/")
+        self.assertEqual(ids.sequence("canvas/{n}", ["a", "b", "c"]),
+                         ["https://e.org/canvas/a", "https://e.org/canvas/b",
+                          "https://e.org/canvas/c"])
+        with self.assertRaisesRegex(AssertionError, "canvas/b c"):
+            ids.sequence("canvas/{n}", ["a", "b c", "d"])
+        with self.assertRaisesRegex(AssertionError, "a space"):
+            ids.sequence("canvas/{n:>3}", ["a", "bc", "def"])
+        ids = iiifpapi3.IdFactory("https://e.org")
+        with self.assertRaises(AssertionError):
+            ids.sequence("{n}", ["/a", "b"])
+        self.assertEqual(ids.sequence("{n}", ["/a", "/b"]),
+                         ["https://e.org/a", "https://e.org/b"])
+
+    def test_set_id_follows_BASE_URL(self):
+        canvas = iiifpapi3.Canvas()
+        iiifpapi3.BASE_URL = "https://example.org/a/"
+        canvas.set_id(extendbase_url="canvas/p1")
+        self.assertEqual(canvas.id, "https://example.org/a/canvas/p1")
+        iiifpapi3.BASE_URL = "https://example.org/b/"
+        canvas.set_id(extendbase_url="canvas/p1")
+        self.assertEqual(canvas.id, "https://example.org/b/canvas/p1")
+        iiifpapi3.BASE_URL = "example.org/"
+        with self.assertRaises(AssertionError):
+            canvas.set_id(extendbase_url="canvas/p1")
+
+
+class TestConfig(unittest.TestCase):
+    def build(self, base_url):
+        with iiifpapi3.config(base_url=base_url, compact=True):
+            manifest = iiifpapi3.Manifest()
+            manifest.set_id(extendbase_url="manifest")
+            manifest.add_label("en", "Book")
+            for idx in range(50):
+                canvas = manifest.add_canvas_to_items()
+                canvas.set_id(extendbase_url="canvas/p%s" % idx)
+                canvas.set_height(10)
+                canvas.set_width(10)
+            return manifest.json_dumps()
+
+    def test_scope(self):
+        base_url = iiifpapi3.BASE_URL
+        with iiifpapi3.config(base_url="https://example.org/a/",
+                              context="https://example.org/context.json"):
+            canvas = iiifpapi3.Canvas()
+            canvas.set_id(extendbase_url="canvas/p1")
+            self.assertEqual(canvas.id, "https://example.org/a/canvas/p1")
+            manifest = iiifpapi3.Manifest()
+            with iiifpapi3.config(behaviours=["paged"]):
+                manifest.add_behavior("paged")
+                with self.assertRaises(AssertionError):
+                    manifest.add_behavior("repeat")
+                canvas.set_id(extendbase_url="canvas/p2")
+                self.assertEqual(canvas.id,
+                                 "https://example.org/a/canvas/p2")
+            manifest.add_behavior("repeat")
+            self.assertEqual(
+                canvas.to_dict(dumps_errors=True)["@context"],
+                "https://example.org/context.json")
+        self.assertEqual(iiifpapi3.BASE_URL, base_url)
+        self.assertEqual(canvas.to_dict(dumps_errors=True)["@context"],
+                         iiifpapi3.CONTEXT)
+        with self.assertRaises(TypeError):
+            with iiifpapi3.config(base="https://example.org/"):
+                pass
+
+    def test_validators(self):
+        with iiifpapi3.config(languages=["en"],
+                              invalid_uri_characters=" "):
+            self.assertFalse(iiifpapi3.valid_language("it"))
+            canvas = iiifpapi3.Canvas()
+            canvas.set_id("https://example.org/canvas(1)")
+        self.assertTrue(iiifpapi3.valid_language("it"))
+        with self.assertRaises(AssertionError):
+            canvas.set_id("https://example.org/canvas(1)")
+
+    def test_threads_and_tasks(self):
+        bases = ["https://example.org/%s/" % i for i in range(8)]
+        expected = [self.build(base) for base in bases]
+        with ThreadPoolExecutor(4) as executor:
+            self.assertEqual(list(executor.map(self.build, bases)), expected)
+
+        async def build(base_url):
+            with iiifpapi3.config(base_url=base_url):
+                await asyncio.sleep(0)
+                canvas = iiifpapi3.Canvas()
+                canvas.set_id(extendbase_url="canvas/p1")
+                await asyncio.sleep(0)
+                return canvas.id
+
+        async def main():
+            return await asyncio.gather(*map(build, bases))
+
+        self.assertEqual(asyncio.run(main()),
+                         [base + "canvas/p1" for base in bases])
+
+
+def build_batch_canvas(record):
+    # top level for pickling it to the worker processes of build_all
+    if record is None:
+        raise ValueError("missing record")
+    canvas = iiifpapi3.Canvas()
+    canvas.set_id(extendbase_url="canvas/%s" % record)
+    canvas.set_height(10)
+    canvas.set_width(20)
+    return canvas
+
+
+def crash_batch_canvas(record):
+    # the worker process dies as if killed by the OS
+    if record == "crash":
+        os._exit(1)
+    return build_batch_canvas(record)
+
+
+def batch_filename(record):
+    return os.path.join("canvases", "%s.json" % record)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings = {"base_url": "https://example.org/batch/"}
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def expected(self, record):
+        with iiifpapi3.config(**self.settings):
+            return build_batch_canvas(record).dumps()
+
+    def test_in_process(self):
+        records = ["p%s" % i for i in range(5)]
+        reports = batch.build_all(records, build_batch_canvas, self.tmp.name,
+                                  workers=0, chunk_size=2,
+                                  settings=self.settings)
+        self.assertEqual([r.index for r in reports], list(range(5)))
+        for report, record in zip(reports, records):
+            self.assertIsNone(report.error)
+            self.assertEqual(report.filename, os.path.join(
+                self.tmp.name, "%s.json" % report.index))
+            self.assertGreaterEqual(report.build_seconds, 0)
+            self.assertGreaterEqual(report.save_seconds, 0)
+            self.assertEqual(self.read(report.filename),
+                             self.expected(record))
+
+    def test_workers(self):
+        records = ["p%s" % i for i in range(7)]
+        reports = batch.build_all(records, build_batch_canvas, self.tmp.name,
+                                  filename=batch_filename, workers=2,
+                                  chunk_size=1, settings=self.settings,
+                                  save_options={"compact": True})
+        self.assertEqual([r.index for r in reports], list(range(7)))
+        for report, record in zip(reports, records):
+            self.assertIsNone(report.error)
+            self.assertEqual(report.filename, os.path.join(
+                self.tmp.name, "canvases", "%s.json" % record))
+            with iiifpapi3.config(**self.settings):
+                expected = build_batch_canvas(record).dumps(compact=True)
+            self.assertEqual(self.read(report.filename), expected)
+
+    def test_errors(self):
+        records = ["p1", None, "p3"]
+        for workers in (0, 1):
+            reports = batch.build_all(records, build_batch_canvas,
+                                      self.tmp.name, workers=workers,
+                                      settings=self.settings)
+            self.assertIsNone(reports[0].error)
+            self.assertIsNone(reports[2].error)
+            self.assertIsNone(reports[1].filename)
+            self.assertIn("ValueError: missing record", reports[1].error)
+            self.assertFalse(os.path.exists(
+                os.path.join(self.tmp.name, "1.json")))
+        # set_id fails without a base url
+        with iiifpapi3.config(base_url=None):
+            report, = batch.build_all(["p1"], build_batch_canvas,
+                                      self.tmp.name, workers=0)
+        self.assertIsNone(report.filename)
+        self.assertIn("set_id", report.error)
+
+    def test_failed_save_removes_the_file(self):
+        def save(obj, path, **kwargs):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"id": ')
+            raise OSError("disk full")
+
+        with unittest.mock.patch.object(iiifpapi3._CoreAttributes, "save",
+                                        autospec=True, side_effect=save):
+            report, = batch.build_all(["p1"], build_batch_canvas,
+                                      self.tmp.name, workers=0,
+                                      settings=self.settings)
+        self.assertIn("OSError: disk full", report.error)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.tmp.name, "0.json")))
+
+    def test_broken_pool(self):
+        records = ["p1", "crash", "p3", "p4"]
+        reports = batch.build_all(records, crash_batch_canvas, self.tmp.name,
+                                  workers=1, chunk_size=1,
+                                  settings=self.settings)
+        self.assertEqual([r.index for r in reports], list(range(4)))
+        self.assertIn("BrokenProcessPool", reports[1].error)
+        self.assertIsNone(reports[1].filename)
+        for report in reports:
+            self.assertNotEqual(report.error is None,
+                                report.filename is None)
+
+    def test_empty(self):
+        self.assertEqual(batch.build_all([], build_batch_canvas,
+                                         self.tmp.name, workers=1), [])
+
+
+class TestAsyncSave(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.canvas = build_batch_canvas("p1")
+
+    def test_adumps(self):
+        async def main():
+            return (await self.canvas.adumps(),
+                    await self.canvas.adumps(compact=True, as_bytes=True))
+
+        text, data = asyncio.run(main())
+        self.assertEqual(text, self.canvas.dumps())
+        self.assertEqual(data, self.canvas.dumps(compact=True, as_bytes=True))
+
+    def test_config_of_the_task(self):
+        context = "http://example.org/context.json"
+
+        async def main():
+            with iiifpapi3.config(context=context, compact=True):
+                with ThreadPoolExecutor(1) as executor:
+                    return await self.canvas.adumps(executor=executor)
+
+        with iiifpapi3.config(context=context, compact=True):
+            expected = self.canvas.dumps()
+        self.assertEqual(asyncio.run(main()), expected)
+
+    def test_asave(self):
+        path = os.path.join(self.tmp.name, "canvas.json")
+        expected = os.path.join(self.tmp.name, "expected.json")
+        asyncio.run(self.canvas.asave(path, compression="gzip"))
+        self.canvas.save(expected, compression="gzip")
+        with open(path, "rb") as f, open(expected, "rb") as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_asave_many(self):
+        items = [(build_batch_canvas("p%s" % i),
+                  os.path.join(self.tmp.name, "%s.json" % i))
+                 for i in range(10)]
+        filenames = asyncio.run(batch.asave_many(
+            iter(items), concurrency=3, compact=True))
+        self.assertEqual(filenames, [filename for _, filename in items])
+        for canvas, filename in items:
+            with open(filename, encoding="utf-8") as f:
+                self.assertEqual(f.read(), canvas.dumps(compact=True))
+
+    def test_concurrency(self):
+        running = []
+        peak = []
+
+        class Slow(object):
+            async def asave(self, filename, executor=None):
+                running.append(filename)
+                peak.append(len(running))
+                await asyncio.sleep(0.001)
+                running.remove(filename)
+
+        items = [(Slow(), str(i)) for i in range(20)]
+        asyncio.run(batch.asave_many(items, concurrency=4))
+        self.assertEqual(max(peak), 4)
+
+    def test_errors(self):
+        items = [(self.canvas, os.path.join(self.tmp.name, "1.json")),
+                 (self.canvas, os.path.join(self.tmp.name, "missing", "2")),
+                 (self.canvas, os.path.join(self.tmp.name, "3.json"))]
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(batch.asave_many(items, concurrency=1))
+        self.assertFalse(os.path.exists(items[2][1]))
+        results = asyncio.run(batch.asave_many(items, return_exceptions=True))
+        self.assertEqual(results[0], items[0][1])
+        self.assertIsInstance(results[1], FileNotFoundError)
+        self.assertEqual(results[2], items[2][1])
+
+    def test_process_executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(1) as executor:
+            with self.assertRaisesRegex(ValueError, "ThreadPoolExecutor"):
+                asyncio.run(self.canvas.adumps(executor=executor))
+            with self.assertRaisesRegex(ValueError, "ThreadPoolExecutor"):
+                asyncio.run(self.canvas.asave(
+                    os.path.join(self.tmp.name, "1.json"),
+                    executor=executor))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name,
+                                                     "1.json")))
+
+
 if __name__ == "__main__":
     unittest.main()